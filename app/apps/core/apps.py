@@ -3,4 +3,16 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.core' 
\ No newline at end of file
+    name = 'apps.core' 
+
+    def ready(self):
+        from django.conf import settings
+
+        from .metrics import REGISTRY
+
+        REGISTRY.configure(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+        if settings.LOG_QUEUE_ENABLED:
+            from .logging_utils import start_queue_logging
+
+            start_queue_logging(settings.LOGGING.get('loggers', {}), maxsize=settings.LOG_QUEUE_MAXSIZE)
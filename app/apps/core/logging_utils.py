@@ -1,34 +1,67 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
+import time
+from datetime import datetime, timezone as dt_timezone
 from functools import wraps
+from django.conf import settings
 from django.http import HttpRequest
 from django.utils import timezone
 import json
 
+from apps.core.metrics import OPERATION_DURATION
+
 # Get loggers for different modules
 logger = logging.getLogger('apps.core')
 pauta_logger = logging.getLogger('apps.pauta')
 auth_logger = logging.getLogger('apps.authentication')
 security_logger = logging.getLogger('django.security')
 
+class LazyJson:
+    """Serializes `data` only when the record is formatted (in the queue listener thread)"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        data = dict(self.data)
+        created = data.pop('created', None)
+        if created is not None:
+            data['timestamp'] = datetime.fromtimestamp(created, dt_timezone.utc).isoformat()
+        return json.dumps(data)
+
 def log_api_request(request: HttpRequest, response=None, duration=None):
     """Log API request details"""
     log_data = {
         'method': request.method,
         'path': request.path,
-        'user': getattr(request.user, 'username', 'anonymous'),
+        'user': getattr(getattr(request, 'user', None), 'username', 'anonymous'),
         'ip': get_client_ip(request),
         'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-        'timestamp': timezone.now().isoformat(),
+        'created': time.time(),
     }
     
-    if response:
+    if response is not None:
         log_data['status_code'] = response.status_code
-        log_data['response_size'] = len(response.content) if hasattr(response, 'content') else 0
+        # Size from the header only: reading `content` would copy the body and
+        # materialize streaming responses (None when there is no header)
+        content_length = response.get('Content-Length')
+        log_data['response_size'] = int(content_length) if content_length else None
     
     if duration:
         log_data['duration_ms'] = round(duration * 1000, 2)
     
-    pauta_logger.info(f"API Request: {json.dumps(log_data)}")
+    # Set by sql_instrumentation_middleware when enabled
+    query_stats = getattr(request, 'query_stats', None)
+    if query_stats is not None:
+        log_data.update(query_stats.as_log_fields(settings.SQL_N_PLUS_ONE_THRESHOLD))
+    
+    # Formatted lazily: with queue logging the JSON is built off the request path
+    pauta_logger.info("API Request: %s", LazyJson(log_data))
 
 def get_client_ip(request: HttpRequest) -> str:
     """Extract client IP from request"""
@@ -100,27 +133,99 @@ def log_performance(operation, duration, details=None):
         log_data['details'] = details
     
     logger.info(f"Performance: {json.dumps(log_data)}")
+    OPERATION_DURATION.observe(duration, operation=operation)
+
+def should_log_request(response) -> bool:
+    """Sampling: errors (4xx/5xx) are always logged, other requests with API_LOG_SAMPLE_RATE"""
+    if response.status_code >= 400:
+        return True
+    rate = settings.API_LOG_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
 
 def api_logging_middleware(get_response):
-    """Django middleware for automatic API logging"""
+    """
+    Django middleware for automatic API logging.
+
+    One record per request, emitted after the response (with status, duration
+    and size). Must sit above CommonMiddleware so `Content-Length` is already set.
+    """
     def middleware(request):
-        start_time = timezone.now()
-        
-        # Log request
-        log_api_request(request)
+        start_time = time.perf_counter()
         
         response = get_response(request)
         
-        # Calculate duration
-        duration = (timezone.now() - start_time).total_seconds()
-        
-        # Log response
-        log_api_request(request, response, duration)
+        duration = time.perf_counter() - start_time
+        if should_log_request(response):
+            log_api_request(request, response, duration)
         
         return response
     
     return middleware
 
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are queued as-is and formatted by the listener's handlers, in the
+    listener thread (the stock `prepare()` formats in the caller). The queue
+    is in-process, so nothing is pickled; callers must not mutate log args
+    after logging. When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_queue_listeners = []
+
+def start_queue_logging(logger_names, maxsize=10000):
+    """
+    Move the handlers of the given loggers (and root) behind queues.
+
+    Each distinct handler set gets one bounded queue and a QueueListener
+    thread that does the formatting and the (file) I/O; the loggers keep
+    only a DroppingQueueHandler, so logging calls return without touching
+    disk. Listeners are stopped (and drained) at exit. Idempotent.
+    """
+    if _queue_listeners:
+        return [listener for listener, _members in _queue_listeners]
+
+    loggers = [logging.getLogger(name) for name in logger_names] + [logging.getLogger()]
+    groups = {}
+    for target in loggers:
+        handlers = tuple(target.handlers)
+        if handlers:
+            groups.setdefault(handlers, []).append(target)
+
+    for handlers, members in groups.items():
+        log_queue = queue.Queue(maxsize)
+        queue_handler = DroppingQueueHandler(log_queue)
+        for target in members:
+            target.handlers = [queue_handler]
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _queue_listeners.append((listener, members))
+
+    atexit.register(stop_queue_logging)
+    return [listener for listener, _members in _queue_listeners]
+
+def stop_queue_logging():
+    """Flush the queues, stop the listener threads and give the loggers their handlers back"""
+    while _queue_listeners:
+        listener, members = _queue_listeners.pop()
+        listener.stop()
+        for target in members:
+            target.handlers = list(listener.handlers)
+
 def log_function_call(func_name, args=None, kwargs=None, result=None, duration=None):
     """Log function calls for debugging"""
     log_data = {
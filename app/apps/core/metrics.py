@@ -0,0 +1,364 @@
+"""
+In-process metrics registry (counters, gauges, histograms) exposed in the
+Prometheus text format at /metrics.
+
+Recording a sample only takes a lock and updates a dict. With
+METRICS_MULTIPROC_DIR set, every process (e.g. each gunicorn worker)
+writes a snapshot of its values to `<dir>/metrics-<pid>.json` from a
+background thread; /metrics, served by any worker, merges the snapshots:
+counters and histograms are summed (including those of exited workers,
+so totals stay monotonic), gauges only count live processes. Clear the
+directory when the service (re)starts.
+"""
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from math import inf
+
+from apps.core.sql_instrumentation import capture_queries
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Metric:
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry if registry is not None else REGISTRY
+        self.registry.register(self)
+
+    def _key(self, labels):
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            pass
+        raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+    def merge(self, total, value, live):
+        """Combine one process' value into the running total (multi-process mode)"""
+        return value if total is None else total + value
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self.registry.lock:
+            values = self.registry.values_for(self)
+            values[key] = values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    Gauge; `multiprocess_mode` says how live processes are combined
+    ('sum' or 'max'). Values of exited processes are dropped.
+    """
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, multiprocess_mode='sum'):
+        if multiprocess_mode not in ('sum', 'max'):
+            raise ValueError(f"Unknown multiprocess_mode: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+        super().__init__(name, documentation, labelnames, registry)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.registry.values_for(self)[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            values = self.registry.values_for(self)
+            values[key] = values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def merge(self, total, value, live):
+        if not live:
+            return total
+        if total is None:
+            return value
+        return max(total, value) if self.multiprocess_mode == 'max' else total + value
+
+
+class Histogram(Metric):
+    """Histogram; each value is [count per bucket..., count above the last bucket, sum]"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self.registry.lock:
+            values = self.registry.values_for(self)
+            counts = values.get(key)
+            if counts is None:
+                counts = values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def merge(self, total, value, live):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self._values = {}
+        self.directory = None
+        self.flush_interval = 5.0
+        self._flusher = None
+        self._pid = os.getpid()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self.metrics[metric.name] = metric
+        self._values[metric.name] = {}
+
+    def values_for(self, metric):
+        """Value dict of `metric` (call with `lock` held); starts the flusher when needed"""
+        if self.directory and self._flusher is None:
+            self._start_flusher()
+        return self._values[metric.name]
+
+    def configure(self, directory=None, flush_interval=5.0):
+        """Enable multi-process mode: snapshots are written to and merged from `directory`"""
+        self.directory = directory or None
+        self.flush_interval = flush_interval
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            atexit.register(self.flush)
+
+    def _after_fork(self):
+        # A forked worker starts from zero and needs its own flusher thread
+        self.lock = threading.Lock()
+        self._values = {name: {} for name in self.metrics}
+        self._flusher = None
+        self._pid = os.getpid()
+
+    def _start_flusher(self):
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name='metrics-flusher', daemon=True)
+        self._flusher.start()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {key: list(value) if isinstance(value, list) else value for key, value in values.items()}
+                for name, values in self._values.items()
+            }
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'metrics-{pid}.json')
+
+    def flush(self):
+        """Write this process' values to its snapshot file (atomically)"""
+        if not self.directory:
+            return
+        data = {name: [[list(key), value] for key, value in values.items()] for name, values in self.snapshot().items()}
+        path = self._path(self._pid)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+
+    def _read_other_processes(self):
+        for filename in os.listdir(self.directory):
+            match = re.fullmatch(r'metrics-(\d+)\.json', filename)
+            if not match or int(match.group(1)) == self._pid:
+                continue
+            pid = int(match.group(1))
+            try:
+                with open(os.path.join(self.directory, filename)) as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError):
+                continue
+            yield _pid_alive(pid), {
+                name: {tuple(key): value for key, value in entries} for name, entries in data.items()
+            }
+
+    def collect(self):
+        """Values of every metric: this process' merged with the other processes' snapshots"""
+        sources = [(True, self.snapshot())]
+        if self.directory:
+            sources += list(self._read_other_processes())
+
+        merged = {name: {} for name in self.metrics}
+        for live, values in sources:
+            for name, samples in values.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged[name]
+                for key, value in samples.items():
+                    total = metric.merge(target.get(key), value, live)
+                    if total is not None:
+                        target[key] = total
+        return merged
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for name, samples in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {_escape_help(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(samples.items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.type != 'histogram':
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (inf,), value[:-1]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + [("le", _number(bound))])} {_number(cumulative)}')
+                lines.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+                lines.append(f'{name}_count{_labels(labels)} {_number(cumulative)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _number(value):
+    if value == inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return f'{value:.1f}'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape_help(text):
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+
+REGISTRY = Registry()
+
+# HTTP (metrics_middleware)
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests by view, method and status code', ('view', 'method', 'status'))
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by view', ('view', 'method'))
+HTTP_RESPONSE_BYTES = Counter(
+    'http_response_bytes_total', 'Response bytes by view (from Content-Length)', ('view',))
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per HTTP request by view', ('view',), buckets=COUNT_BUCKETS)
+
+# Upstream APIs (HTTPSessionPool.fetch)
+UPSTREAM_REQUESTS = Counter(
+    'upstream_requests_total', 'Upstream API fetches by endpoint and status ("cache" for fresh cache hits)',
+    ('upstream', 'endpoint', 'status'))
+UPSTREAM_REQUEST_DURATION = Histogram(
+    'upstream_request_duration_seconds', 'Upstream API request latency by endpoint', ('upstream', 'endpoint'))
+UPSTREAM_RESPONSE_BYTES = Counter(
+    'upstream_response_bytes_total', 'Upstream API response bytes by endpoint', ('upstream', 'endpoint'))
+
+# Rate limiter (TokenBucket)
+RATE_LIMITER_WAIT = Histogram(
+    'rate_limiter_wait_seconds', 'Time spent waiting for a rate limiter token', ('bucket',))
+RATE_LIMITER_RATE = Gauge(
+    'rate_limiter_rate', 'Current adaptive rate of the bucket (requests/s)', ('bucket',), multiprocess_mode='max')
+
+# Sync pipeline and log_performance
+SYNC_STAGE_DURATION = Histogram(
+    'sync_stage_duration_seconds', 'Duration of each proposição sync stage', ('stage',))
+OPERATION_DURATION = Histogram(
+    'operation_duration_seconds', 'Durations reported through log_performance', ('operation',))
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else '<unresolved>'
+
+
+def metrics_middleware(get_response):
+    """
+    Django middleware recording latency, status, size and DB query count per
+    view. Labelled by URL name, never by raw path, to bound cardinality. Must
+    sit above CommonMiddleware so `Content-Length` is already set. Reuses the
+    query stats of sql_instrumentation_middleware when it runs outside this one.
+    """
+    def middleware(request):
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            stats = getattr(request, 'query_stats', None)
+            if stats is None:
+                stats = stack.enter_context(capture_queries())
+            response = get_response(request)
+        duration = time.perf_counter() - start
+
+        view = _view_name(request)
+        HTTP_REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        HTTP_REQUEST_DURATION.observe(duration, view=view, method=request.method)
+        HTTP_REQUEST_DB_QUERIES.observe(stats.count, view=view)
+        content_length = response.get('Content-Length')
+        if content_length:
+            HTTP_RESPONSE_BYTES.inc(int(content_length), view=view)
+        return response
+
+    return middleware
+
+
+def upstream_endpoint(url):
+    """Endpoint label for an upstream URL: path with numeric ids replaced by {id}"""
+    path = url.split('://', 1)[-1].split('?', 1)[0]
+    path = path.split('/', 1)[1] if '/' in path else ''
+    return '/' + re.sub(r'(?<=/)\d+(?=/|$)', '{id}', path)
@@ -0,0 +1,110 @@
+"""
+Per-request SQL instrumentation: query count, DB time and N+1 detection.
+
+`sql_instrumentation_middleware` wraps every DB connection with
+`execute_wrapper` for the duration of the request. SQL reaches the wrapper
+with placeholders, so identical statements run with different params share
+a "shape"; a shape repeated SQL_N_PLUS_ONE_THRESHOLD times in one request
+is reported as a likely N+1. Results go to the `Server-Timing` header, the
+API request log (`request.query_stats`) and a warning log. With
+SQL_INSTRUMENTATION_STRICT the middleware raises QueryBudgetExceeded
+instead, failing the test that made the request.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('apps.core')
+
+# "IN (%s, %s, %s)" and multi-row "VALUES (%s, %s), (%s, %s)" collapse to one shape
+_PLACEHOLDER_LIST_RE = re.compile(r'\((?:%s, )*%s\)(?:, \((?:%s, )*%s\))*')
+
+
+def sql_shape(sql):
+    return _PLACEHOLDER_LIST_RE.sub('(...)', sql)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode; an AssertionError so test runners report a failure"""
+
+
+class QueryStats:
+    """`execute_wrapper` that counts queries, DB time and SQL shapes"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        """Shapes executed at least `threshold` times, most repeated first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self, threshold):
+        timing = f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+        repeated = self.repeated(threshold)
+        if repeated:
+            timing += f', n-plus-one;desc="{len(repeated)} repeated shapes"'
+        return timing
+
+    def as_log_fields(self, threshold):
+        return {
+            'db_queries': self.count,
+            'db_time_ms': round(self.duration * 1000, 2),
+            'db_repeated_shapes': len(self.repeated(threshold)),
+        }
+
+
+@contextmanager
+def capture_queries():
+    """Collect QueryStats for every query run in the block, on all connections"""
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(stats))
+        yield stats
+
+
+def sql_instrumentation_middleware(get_response):
+    """Django middleware enabled by SQL_INSTRUMENTATION_ENABLED (see module docstring)"""
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        raise MiddlewareNotUsed()
+
+    def middleware(request):
+        with capture_queries() as stats:
+            request.query_stats = stats
+            response = get_response(request)
+
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        repeated = stats.repeated(threshold)
+        max_queries = settings.SQL_MAX_QUERIES_PER_REQUEST
+        over_budget = bool(max_queries) and stats.count > max_queries
+
+        if repeated or over_budget:
+            problems = [f"{count}x {shape}" for shape, count in repeated]
+            if over_budget:
+                problems.insert(0, f"{stats.count} queries (limit {max_queries})")
+            message = f"{request.method} {request.path}: " + '; '.join(problems)
+            if settings.SQL_INSTRUMENTATION_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"Query budget exceeded: {message}")
+
+        response['Server-Timing'] = stats.server_timing(threshold)
+        return response
+
+    return middleware
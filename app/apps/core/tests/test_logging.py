@@ -0,0 +1,78 @@
+import json
+import logging
+import logging.handlers
+import queue
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.logging_utils import (
+    DroppingQueueHandler, api_logging_middleware, start_queue_logging, stop_queue_logging,
+)
+
+
+class ApiLoggingMiddlewareTest(TestCase):
+    def test_one_record_with_size_from_header(self):
+        with self.assertLogs('apps.pauta', level='INFO') as logs:
+            resp = self.client.get('/health/', HTTP_USER_AGENT='teste')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+
+        data = json.loads(logs.records[0].getMessage().removeprefix('API Request: '))
+        self.assertEqual(data['path'], '/health/')
+        self.assertEqual(data['status_code'], 200)
+        self.assertEqual(data['response_size'], int(resp['Content-Length']))
+        self.assertEqual(data['user_agent'], 'teste')
+        self.assertIn('timestamp', data)
+        self.assertIn('duration_ms', data)
+
+    def test_streaming_response_is_not_consumed(self):
+        consumed = []
+
+        def body():
+            consumed.append(True)
+            yield b'x'
+
+        middleware = api_logging_middleware(lambda request: StreamingHttpResponse(body()))
+        with self.assertLogs('apps.pauta', level='INFO') as logs:
+            middleware(RequestFactory().get('/api/export/'))
+        self.assertEqual(consumed, [])
+        self.assertIsNone(json.loads(logs.records[0].getMessage().split(': ', 1)[1])['response_size'])
+
+    @override_settings(API_LOG_SAMPLE_RATE=0)
+    def test_sampling_keeps_errors(self):
+        with self.assertNoLogs('apps.pauta', level='INFO'):
+            self.client.get('/health/')
+        with self.assertLogs('apps.pauta', level='INFO') as logs:
+            self.client.get('/nao-existe/')
+        self.assertIn('"status_code": 404', logs.records[0].getMessage())
+
+
+class QueueLoggingTest(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger('apps.core.tests.queue')
+        self.logger.propagate = False
+        self.target = logging.handlers.BufferingHandler(capacity=100)
+        self.logger.handlers = [self.target]
+        self.addCleanup(setattr, self.logger, 'handlers', [])
+
+    def test_records_reach_handlers_through_listener(self):
+        root_handlers = logging.getLogger().handlers
+        start_queue_logging([self.logger.name])
+        try:
+            self.assertIsInstance(self.logger.handlers[0], DroppingQueueHandler)
+            self.logger.warning("valor %s", 42)
+        finally:
+            stop_queue_logging()
+
+        self.assertEqual([record.getMessage() for record in self.target.buffer], ["valor 42"])
+        self.assertEqual(self.logger.handlers, [self.target])
+        self.assertEqual(logging.getLogger().handlers, root_handlers)
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        self.logger.handlers = [handler]
+        self.logger.warning("primeiro")
+        self.logger.warning("segundo")
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 1)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.logging_utils import log_performance
+from apps.core.metrics import (
+    REGISTRY, Counter, Gauge, Histogram, Registry, upstream_endpoint,
+)
+
+DEAD_PID = 2 ** 22 + 1  # acima do pid_max padrão do Linux
+
+
+def _define(registry):
+    return (
+        Counter('jobs_total', 'Jobs', ('kind',), registry=registry),
+        Gauge('queue_size', 'Queue size', registry=registry),
+        Histogram('job_seconds', 'Job latency', registry=registry, buckets=(0.1, 1)),
+    )
+
+
+class RegistryTest(SimpleTestCase):
+    def test_render_text_format(self):
+        registry = Registry()
+        jobs, queue_size, latency = _define(registry)
+        jobs.inc(kind='a')
+        jobs.inc(2, kind='b "x"')
+        queue_size.set(3)
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(7)
+
+        text = registry.render()
+        self.assertIn('# TYPE jobs_total counter\n', text)
+        self.assertIn('jobs_total{kind="a"} 1\n', text)
+        self.assertIn('jobs_total{kind="b \\"x\\""} 2\n', text)
+        self.assertIn('queue_size 3\n', text)
+        self.assertIn('job_seconds_bucket{le="0.1"} 1\n', text)
+        self.assertIn('job_seconds_bucket{le="1"} 2\n', text)
+        self.assertIn('job_seconds_bucket{le="+Inf"} 3\n', text)
+        self.assertIn('job_seconds_sum 7.55\n', text)
+        self.assertIn('job_seconds_count 3\n', text)
+
+    def test_labels_are_validated(self):
+        jobs, _queue_size, _latency = _define(Registry())
+        with self.assertRaises(ValueError):
+            jobs.inc(tipo='a')
+        with self.assertRaises(ValueError):
+            jobs.inc(-1, kind='a')
+
+    def test_multiprocess_merge(self):
+        directory = tempfile.mkdtemp()
+        # worker atual, outro worker vivo (este processo) e um worker encerrado
+        current, alive, dead = Registry(), Registry(), Registry()
+        for registry, pid, amount in ((current, 1, 1), (alive, os.getpid(), 2), (dead, DEAD_PID, 4)):
+            registry.configure(directory)
+            registry._pid = pid
+            jobs, queue_size, latency = _define(registry)
+            jobs.inc(amount, kind='a')
+            queue_size.set(amount)
+            latency.observe(amount / 10)
+        alive.flush()
+        dead.flush()
+
+        merged = current.collect()
+        self.assertEqual(merged['jobs_total'], {('a',): 7})  # inclui o worker encerrado
+        self.assertEqual(merged['queue_size'], {(): 3})  # só workers vivos
+        self.assertEqual(merged['job_seconds'][()][:3], [1, 2, 0])
+
+
+class UpstreamEndpointTest(SimpleTestCase):
+    def test_ids_are_replaced(self):
+        self.assertEqual(
+            upstream_endpoint('https://dadosabertos.camara.leg.br/api/v2/proposicoes/2345/tramitacoes?x=1'),
+            '/api/v2/proposicoes/{id}/tramitacoes',
+        )
+        self.assertEqual(upstream_endpoint('https://legis.senado.leg.br/dadosabertos/processo'),
+                         '/dadosabertos/processo')
+
+
+class MetricsEndpointTest(TestCase):
+    @override_settings(METRICS_ALLOWED_IPS=['127.0.0.0/8'])
+    def test_requests_and_operations_are_exposed(self):
+        self.client.get('/health/')
+        log_performance('teste_metricas', 0.2)
+
+        resp = self.client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = resp.content.decode()
+        self.assertIn('http_requests_total{view="health_check",method="GET",status="200"}', text)
+        self.assertIn('http_request_db_queries_bucket{view="health_check",le="0"}', text)
+        self.assertIn('operation_duration_seconds_count{operation="teste_metricas"}', text)
+        self.assertIs(REGISTRY.metrics['http_requests_total'].registry, REGISTRY)
+
+    def test_denied_unless_configured(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(METRICS_BEARER_TOKEN='s3cret', METRICS_ALLOWED_IPS=['10.0.0.0/8', 'invalid'])
+    def test_bearer_token_or_allowed_ip(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)  # 127.0.0.1
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code, 200)
+        # X-Forwarded-For is client-controlled and is not trusted
+        self.assertEqual(self.client.get('/metrics', HTTP_X_FORWARDED_FOR='10.1.2.3').status_code, 403)
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.sql_instrumentation import (
+    QueryBudgetExceeded, capture_queries, sql_instrumentation_middleware, sql_shape,
+)
+
+
+def n_plus_one_view(request):
+    for pk in range(6):
+        User.objects.filter(pk=pk).first()
+    return HttpResponse('ok')
+
+
+class SqlInstrumentationTest(TestCase):
+    def test_server_timing_header(self):
+        resp = self.client.get('/health/')
+        self.assertEqual(resp['Server-Timing'], 'db;dur=0.00;desc="0 queries"')
+
+    def test_shapes_ignore_params_and_list_sizes(self):
+        self.assertEqual(sql_shape('SELECT 1 WHERE id IN (%s, %s, %s)'), 'SELECT 1 WHERE id IN (...)')
+        self.assertEqual(sql_shape('INSERT INTO t VALUES (%s, %s), (%s, %s)'), 'INSERT INTO t VALUES (...)')
+
+        with capture_queries() as stats:
+            list(User.objects.filter(pk__in=[1, 2]))
+            list(User.objects.filter(pk__in=[3]))
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(len(stats.shapes), 1)
+        self.assertGreater(stats.duration, 0)
+
+    @override_settings(SQL_INSTRUMENTATION_STRICT=True)
+    def test_strict_mode_raises_on_n_plus_one(self):
+        middleware = sql_instrumentation_middleware(n_plus_one_view)
+        with self.assertRaisesMessage(QueryBudgetExceeded, '6x SELECT'):
+            middleware(RequestFactory().get('/usuarios/'))
+
+    @override_settings(SQL_INSTRUMENTATION_STRICT=False, SQL_MAX_QUERIES_PER_REQUEST=3)
+    def test_warning_and_header_when_not_strict(self):
+        middleware = sql_instrumentation_middleware(n_plus_one_view)
+        request = RequestFactory().get('/usuarios/')
+        with self.assertLogs('apps.core', level='WARNING') as logs:
+            resp = middleware(request)
+        self.assertIn('6 queries (limit 3)', logs.output[0])
+        self.assertIn('n-plus-one;desc="1 repeated shapes"', resp['Server-Timing'])
+        self.assertEqual(request.query_stats.as_log_fields(5)['db_queries'], 6)
@@ -1,5 +1,41 @@
-from django.http import HttpResponse
+import hmac
+import ipaddress
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import CONTENT_TYPE, REGISTRY
+
+logger = logging.getLogger('apps.core')
 
 def health_check(request):
     """A simple view that returns a 200 OK response."""
-    return HttpResponse("OK")
\ No newline at end of file
+    return HttpResponse("OK")
+
+def _metrics_allowed(request):
+    """Bearer token or REMOTE_ADDR in METRICS_ALLOWED_IPS; denied when neither is configured."""
+    token = settings.METRICS_BEARER_TOKEN
+    if token:
+        scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip(), token):
+            return True
+
+    if settings.METRICS_ALLOWED_IPS:
+        try:
+            address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+        except ValueError:
+            return False
+        for network in settings.METRICS_ALLOWED_IPS:
+            try:
+                if address in ipaddress.ip_network(network, strict=False):
+                    return True
+            except ValueError:
+                logger.warning(f"Invalid METRICS_ALLOWED_IPS entry: {network}")
+    return False
+
+def metrics(request):
+    """Metrics of every process in the Prometheus text format (access: see `_metrics_allowed`)."""
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
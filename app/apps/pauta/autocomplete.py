@@ -0,0 +1,121 @@
+"""
+Sugestões para campos de busca: proposições pelo identificador
+("PL 4381/2023"), autores e temas.
+
+Cada tipo é uma consulta curta e indexada: o identificador vira filtros de
+igualdade/intervalo sobre (tipo, numero, ano), cobertos pelo índice único,
+e autores e temas usam `icontains`, coberto pelos índices de trigramas
+(pg_trgm) no PostgreSQL. Correspondências no início do texto vêm primeiro.
+
+Os trigramas só ajudam a partir de 3 caracteres: com menos, o `icontains`
+viraria varredura sequencial de autores e temas. Termos de 2 caracteres
+("PL") consultam apenas proposições, que usam o índice único.
+"""
+import re
+from typing import Dict, Iterable, List
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+KINDS = ('proposicoes', 'autores', 'temas')
+MIN_LENGTH = 2
+# Mínimo para autores e temas (`icontains` coberto pelos índices de trigramas)
+SUBSTRING_MIN_LENGTH = 3
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# "PL", "PL 43", "pl 4381/", "PL 4381/20", "PLP4381/2023"
+IDENTIFICADOR_RE = re.compile(r'^([A-Za-z]+)\.?\s*(\d*)\s*(?:/\s*(\d*))?$')
+MAX_NUMERO_DIGITS = 6
+ANO_DIGITS = 4
+
+
+def normalize(term: str) -> str:
+    """Forma canônica do termo (espaços colapsados, sem caixa), usada também no cache"""
+    return ' '.join(term.split()).casefold()
+
+
+def _prefix(field: str, digits: str, max_digits: int) -> Q:
+    """Inteiros cuja representação começa com `digits`, como intervalos indexáveis"""
+    if digits.startswith('0'):
+        return Q(pk__in=[])
+    value = int(digits)
+    condition = Q(**{field: value})
+    for extra in range(1, max_digits - len(digits) + 1):
+        low = value * 10 ** extra
+        condition |= Q(**{f'{field}__range': (low, low + 10 ** extra - 1)})
+    return condition
+
+
+def proposicoes(term: str, limit: int) -> List[Dict]:
+    from apps.pauta.models import Proposicao
+
+    match = IDENTIFICADOR_RE.match(term)
+    if not match:
+        return []
+    tipo, numero, ano = match.groups()
+
+    queryset = Proposicao.objects.filter(tipo=tipo.upper())
+    if numero:
+        queryset = queryset.filter(_prefix('numero', numero, MAX_NUMERO_DIGITS))
+    if ano:
+        queryset = queryset.filter(_prefix('ano', ano, ANO_DIGITS))
+
+    rows = queryset.order_by('numero', '-ano').values('id', 'tipo', 'numero', 'ano')[:limit]
+    return [
+        {'id': row['id'], 'identificador': f"{row['tipo']} {row['numero']}/{row['ano']}"}
+        for row in rows
+    ]
+
+
+def _prefix_first(field: str, term: str) -> Case:
+    return Case(
+        When(**{f'{field}__istartswith': term}, then=Value(0)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+
+
+def autores(term: str, limit: int) -> List[str]:
+    from apps.pauta.models import Proposicao
+
+    if len(term) < SUBSTRING_MIN_LENGTH:
+        return []
+    rows = (
+        Proposicao.objects
+        .filter(autor__icontains=term)
+        .annotate(prefixo=_prefix_first('autor', term))
+        .order_by('prefixo', 'autor')
+        .values_list('prefixo', 'autor')
+        .distinct()[:limit]
+    )
+    return [autor for _prefixo, autor in rows]
+
+
+def temas(term: str, limit: int) -> List[Dict]:
+    from apps.pauta.models import Tema
+
+    if len(term) < SUBSTRING_MIN_LENGTH:
+        return []
+    rows = (
+        Tema.objects
+        .filter(nome__icontains=term)
+        .annotate(prefixo=_prefix_first('nome', term))
+        .order_by('prefixo', 'nome')
+        .values('id', 'nome', 'eixo__nome')[:limit]
+    )
+    return [{'id': row['id'], 'nome': row['nome'], 'eixo_nome': row['eixo__nome']} for row in rows]
+
+
+SUGGESTERS = {
+    'proposicoes': proposicoes,
+    'autores': autores,
+    'temas': temas,
+}
+
+
+def suggest(term: str, kinds: Iterable[str] = KINDS, limit: int = DEFAULT_LIMIT) -> Dict[str, list]:
+    """Até `limit` sugestões de cada tipo pedido (listas vazias para termos curtos)"""
+    term = ' '.join(term.split())
+    if len(term) < MIN_LENGTH:
+        return {kind: [] for kind in kinds}
+    return {kind: SUGGESTERS[kind](term, limit) for kind in kinds}
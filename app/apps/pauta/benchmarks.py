@@ -0,0 +1,260 @@
+"""
+Benchmark de latência e vazão da API.
+
+Percorre os endpoints dos três routers (`/api/`, `/api/bi/`,
+`/api/atividades/`) e o autocomplete com combinações típicas de filtro,
+busca e ordenação, usando o `django.test.Client` em processo: a medida
+inclui middlewares, filtros, serialização e renderização, sem rede nem
+servidor WSGI. Para cada cenário registra latência (p50/p95/p99), vazão,
+queries por requisição, bytes da resposta e o pico de RSS do processo.
+
+Os resultados são gravados em JSON e podem ser comparados com uma baseline
+anterior (`compare`). Use sobre uma base gerada por `generate_synthetic_data`
+para que os números sejam comparáveis entre execuções.
+"""
+import json
+import math
+import platform
+import resource
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from apps.core.sql_instrumentation import capture_queries
+
+from .synthetic_data import EIXO_ID_START
+
+ITERATIONS = 30
+WARMUP = 3
+# Regressão: p95 acima de (1 + TOLERANCE) vezes a baseline e por mais de MIN_DELTA_MS
+TOLERANCE = 0.2
+MIN_DELTA_MS = 2.0
+BASELINE_VERSION = 1
+
+
+class BenchmarkError(Exception):
+    """Erro ao executar o benchmark (base vazia, resposta diferente de 200)"""
+
+
+@dataclass(frozen=True)
+class Cenario:
+    """Uma requisição GET; `{eixo}`, `{tema}` e `{proposicao}` são trocados por ids da base"""
+    nome: str
+    path: str
+    params: Dict[str, str] = field(default_factory=dict)
+
+
+CENARIOS = (
+    # /api/ (CRUD, sem paginação)
+    Cenario('api_eixos', '/api/eixos/'),
+    Cenario('api_eixos_busca_ordem', '/api/eixos/', {'search': 'Eixo', 'ordering': '-nome'}),
+    Cenario('api_temas', '/api/temas/'),
+    Cenario('api_proposicoes', '/api/proposicoes/'),
+    Cenario('api_proposicao_detalhe', '/api/proposicoes/{proposicao}/'),
+    # /api/bi/ (Power BI)
+    Cenario('bi_eixos', '/api/bi/eixos/'),
+    Cenario('bi_temas_por_eixo', '/api/bi/temas/', {'eixo__id': '{eixo}'}),
+    Cenario('bi_temas_busca', '/api/bi/temas/', {'search': 'saúde', 'ordering': 'nome'}),
+    Cenario('bi_proposicoes_tipo_ano', '/api/bi/proposicoes/', {'tipo': 'PL', 'ano': '2023'}),
+    Cenario('bi_proposicoes_por_tema', '/api/bi/proposicoes/', {'tema__id': '{tema}', 'ordering': '-numero'}),
+    Cenario('bi_proposicoes_busca', '/api/bi/proposicoes/', {'search': 'saúde pública', 'tema__eixo__id': '{eixo}'}),
+    Cenario('bi_proposicoes_ndjson', '/api/bi/proposicoes/', {'format': 'ndjson', 'tema__eixo__id': '{eixo}'}),
+    Cenario('bi_proposicao_detalhe', '/api/bi/proposicoes/{proposicao}/'),
+    Cenario('bi_exclusoes', '/api/bi/exclusoes/', {'ordering': '-deleted_at'}),
+    # /api/atividades/: primeira página por keyset; só o filtro por proposição traz tudo
+    Cenario('senado_pagina', '/api/atividades/senado/', {'pagination': 'cursor'}),
+    Cenario('senado_por_proposicao', '/api/atividades/senado/', {'proposicao': '{proposicao}'}),
+    Cenario('senado_colegiado', '/api/atividades/senado/', {'colegiado_sigla': 'CCJ', 'pagination': 'cursor'}),
+    Cenario('senado_busca', '/api/atividades/senado/', {'search': 'leitura', 'pagination': 'cursor'}),
+    Cenario('camara_pagina', '/api/atividades/camara/', {'pagination': 'cursor', 'page_size': '500'}),
+    Cenario('camara_por_proposicao', '/api/atividades/camara/', {'proposicao': '{proposicao}', 'ordering': 'sequencia'}),
+    Cenario('camara_orgao', '/api/atividades/camara/', {'sigla_orgao': 'CCJC', 'pagination': 'cursor'}),
+    Cenario('camara_busca', '/api/atividades/camara/', {'search': 'relator', 'pagination': 'cursor'}),
+    # Autocomplete
+    Cenario('autocomplete', '/api/autocomplete/', {'q': 'PL 10'}),
+)
+
+
+def select_cenarios(filtros: Optional[List[str]] = None) -> List[Cenario]:
+    """Cenários cujo nome contém algum dos filtros (todos, sem filtros)"""
+    if not filtros:
+        return list(CENARIOS)
+    cenarios = [c for c in CENARIOS if any(f in c.nome for f in filtros)]
+    if not cenarios:
+        raise BenchmarkError(f"Nenhum cenário corresponde a: {', '.join(filtros)}")
+    return cenarios
+
+
+def percentile(valores: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank (sem interpolação)"""
+    ordenados = sorted(valores)
+    posicao = math.ceil(len(ordenados) * p / 100)
+    return ordenados[min(max(posicao, 1), len(ordenados)) - 1]
+
+
+def peak_rss_kb() -> int:
+    """Pico de memória residente do processo até agora, em KiB"""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB; macOS, em bytes
+    return maxrss // 1024 if sys.platform == 'darwin' else maxrss
+
+
+def dataset_ids() -> Dict[str, int]:
+    """Ids usados nos cenários, de preferência dentro dos dados sintéticos"""
+    from apps.pauta.models import Eixo, Proposicao
+
+    eixos = Eixo.objects.filter(temas__proposicoes__isnull=False).order_by('id')
+    eixo = eixos.filter(id__gte=EIXO_ID_START).first() or eixos.first()
+    if eixo is None:
+        raise BenchmarkError("Base sem proposições: rode generate_synthetic_data antes do benchmark")
+    proposicao = (
+        Proposicao.objects.filter(tema__eixo=eixo).order_by('id').values('id', 'tema_id').first()
+    )
+    return {'eixo': eixo.id, 'tema': proposicao['tema_id'], 'proposicao': proposicao['id']}
+
+
+def dataset_counts() -> Dict[str, int]:
+    from apps.pauta.models import CamaraActivityHistory, Eixo, Proposicao, SenadoActivityHistory, Tema
+
+    return {
+        'eixos': Eixo.objects.count(),
+        'temas': Tema.objects.count(),
+        'proposicoes': Proposicao.objects.count(),
+        'atividades_senado': SenadoActivityHistory.objects.count(),
+        'atividades_camara': CamaraActivityHistory.objects.count(),
+    }
+
+
+def _get(client: Client, path: str, params: Dict[str, str]):
+    """Faz a requisição e consome o corpo (inclusive de respostas em streaming)"""
+    response = client.get(path, params)
+    if response.streaming:
+        corpo = b''.join(response.streaming_content)
+    else:
+        corpo = response.content
+    return response.status_code, len(corpo)
+
+
+def run_cenario(client: Client, cenario: Cenario, ids: Dict[str, int],
+                iterations: int = ITERATIONS, warmup: int = WARMUP) -> Dict:
+    path = cenario.path.format(**ids)
+    params = {chave: valor.format(**ids) for chave, valor in cenario.params.items()}
+
+    for _ in range(warmup):
+        _get(client, path, params)
+
+    latencias, queries = [], []
+    inicio = time.perf_counter()
+    for _ in range(iterations):
+        with capture_queries() as stats:
+            t0 = time.perf_counter()
+            status, tamanho = _get(client, path, params)
+            latencias.append((time.perf_counter() - t0) * 1000)
+        if status != 200:
+            raise BenchmarkError(f"{cenario.nome}: GET {path} retornou {status}")
+        queries.append(stats.count)
+    total = time.perf_counter() - inicio
+
+    return {
+        'path': path,
+        'params': params,
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencias, 50), 3),
+        'p95_ms': round(percentile(latencias, 95), 3),
+        'p99_ms': round(percentile(latencias, 99), 3),
+        'mean_ms': round(sum(latencias) / len(latencias), 3),
+        'max_ms': round(max(latencias), 3),
+        'rps': round(iterations / total, 2) if total else None,
+        'queries': max(queries),
+        'bytes': tamanho,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def run_benchmark(cenarios: Optional[List[Cenario]] = None, iterations: int = ITERATIONS,
+                  warmup: int = WARMUP, cache: bool = False,
+                  progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """
+    Executa os cenários e retorna o documento de resultados (o mesmo gravado como baseline).
+
+    Com `cache=False` (padrão) o cache de respostas fica desligado, para medir
+    o caminho completo até o banco; com `cache=True` vale a configuração atual.
+    """
+    if iterations < 1 or warmup < 0:
+        raise BenchmarkError("iterations deve ser >= 1 e warmup >= 0")
+    cenarios = list(CENARIOS) if cenarios is None else cenarios
+    ids = dataset_ids()
+
+    overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+    if not cache:
+        overrides['API_RESPONSE_CACHE_ENABLED'] = False
+
+    resultados = {}
+    with override_settings(**overrides):
+        client = Client()
+        for cenario in cenarios:
+            resultados[cenario.nome] = run_cenario(client, cenario, ids, iterations, warmup)
+            if progress:
+                progress(cenario.nome, resultados[cenario.nome])
+
+    return {
+        'version': BASELINE_VERSION,
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'cache': cache and settings.API_RESPONSE_CACHE_ENABLED,
+            'dataset': dataset_counts(),
+        },
+        'cenarios': resultados,
+    }
+
+
+def save(resultado: Dict, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def load(path: str) -> Dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BenchmarkError(f"Baseline inválida ({path}): {e}")
+    if baseline.get('version') != BASELINE_VERSION:
+        raise BenchmarkError(f"Baseline {path} tem versão {baseline.get('version')}, esperada {BASELINE_VERSION}")
+    return baseline
+
+
+def compare(atual: Dict, baseline: Dict, tolerance: float = TOLERANCE,
+            min_delta_ms: float = MIN_DELTA_MS) -> List[str]:
+    """
+    Regressões do resultado `atual` em relação à `baseline`.
+
+    Latência regride quando o p95 passa de `(1 + tolerance)` vezes o da
+    baseline e a diferença supera `min_delta_ms` (ruído em endpoints rápidos).
+    Queries por requisição regridem com qualquer aumento. Cenários ausentes
+    em um dos lados são ignorados.
+    """
+    regressoes = []
+    for nome, resultado in atual['cenarios'].items():
+        base = baseline['cenarios'].get(nome)
+        if base is None:
+            continue
+        limite = base['p95_ms'] * (1 + tolerance)
+        if resultado['p95_ms'] > limite and resultado['p95_ms'] - base['p95_ms'] > min_delta_ms:
+            regressoes.append(
+                f"{nome}: p95 {resultado['p95_ms']:.1f} ms (baseline {base['p95_ms']:.1f} ms, limite {limite:.1f} ms)"
+            )
+        if resultado['queries'] > base['queries']:
+            regressoes.append(f"{nome}: {resultado['queries']} queries (baseline {base['queries']})")
+    return regressoes
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponseMixin:
+    """
+    Cache de respostas e GET condicional dos endpoints read-only (Power BI e
+    atividades), ambos baseados na versão global dos dados.
+
+    Cada GET lê a versão atual (uma consulta pela chave primária) e:
+
+    - responde 304 se `If-None-Match` / `If-Modified-Since` indicarem que o
+      cliente já tem essa versão, antes de qualquer consulta ou serialização;
+    - senão, devolve a resposta renderizada guardada no cache do Django
+      (`API_RESPONSE_CACHE_ALIAS`), com chave formada pela versão, o caminho,
+      os parâmetros de consulta normalizados e o `Accept`;
+    - senão, processa normalmente e guarda o resultado.
+
+    As respostas levam `ETag` (forte: versão + representação) e
+    `Last-Modified` (hora da última alteração dos dados). Como qualquer
+    alteração incrementa a versão (ver `apps.pauta.data_version`), as
+    entradas antigas deixam de ser usadas e expiram sozinhas. Respostas em
+    streaming e com erro não são guardadas.
+
+    Só deve ser usado em views públicas (AllowAny): a resposta guardada é
+    servida antes da autenticação.
+    """
+
+    cache_key_prefix = 'api-response'
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        version = get_data_version()
+        digest = self.get_representation_digest(request)
+        etag = f'"v{version.number}-{digest[:32]}"'
+        last_modified = int(version.updated_at.timestamp()) if version.updated_at else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self._add_validators(not_modified, etag, last_modified)
+
+        cache = None
+        key = f'{self.cache_key_prefix}:v{version.number}:{digest}'
+        if request.method == 'GET' and settings.API_RESPONSE_CACHE_ENABLED:
+            cache = caches[settings.API_RESPONSE_CACHE_ALIAS]
+            try:
+                cached = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Erro ao ler resposta do cache: {e}")
+                cached = None
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return self._add_validators(response, etag, last_modified)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        self._add_validators(response, etag, last_modified)
+        if cache is not None and not response.streaming:
+            response['X-Cache'] = 'MISS'
+            if hasattr(response, 'add_post_render_callback'):
+                response.add_post_render_callback(lambda rendered: self._store(cache, key, rendered))
+            else:
+                self._store(cache, key, response)
+        return response
+
+    def get_representation_digest(self, request) -> str:
+        """Identifica a representação: caminho, parâmetros (ordenados) e `Accept`"""
+        params = sorted(
+            (name, value)
+            for name in request.GET
+            for value in request.GET.getlist(name)
+        )
+        raw = '|'.join([
+            request.path,
+            '&'.join(f'{name}={value}' for name, value in params),
+            request.META.get('HTTP_ACCEPT', ''),
+        ])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _add_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # O cliente pode guardar a resposta, mas deve revalidar a cada uso
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    @staticmethod
+    def _store(cache, key, response):
+        try:
+            cache.set(key, (response.content, response['Content-Type']), settings.API_RESPONSE_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar resposta no cache: {e}")
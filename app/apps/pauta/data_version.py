@@ -0,0 +1,78 @@
+"""
+Versão global dos dados servidos pela API (eixos, temas, proposições e
+históricos de atividade).
+
+Toda alteração incrementa o contador em `DataVersion` (linha única), seja
+pelos sinais `post_save`/`post_delete` dos modelos, seja explicitamente pelos
+caminhos em lote dos serviços de sincronização (`bulk_create`, `bulk_update`
+e `update` não disparam sinais). O cache de respostas usa a versão na chave:
+um incremento invalida todas as respostas de uma vez, sem varrer o cache.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_batch = threading.local()
+
+SINGLETON_ID = 1
+
+
+class Version(NamedTuple):
+    number: int
+    updated_at: Optional[datetime]
+
+
+def get_data_version() -> Version:
+    """Versão atual dos dados (uma consulta pela chave primária)"""
+    from apps.pauta.models import DataVersion
+
+    row = DataVersion.objects.filter(pk=SINGLETON_ID).values_list('version', 'updated_at').first()
+    if row is None:
+        return Version(0, None)
+    return Version(*row)
+
+
+def _increment() -> None:
+    from apps.pauta.models import DataVersion
+
+    updated = DataVersion.objects.filter(pk=SINGLETON_ID).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        DataVersion.objects.get_or_create(pk=SINGLETON_ID, defaults={'version': 1})
+
+
+def bump_data_version() -> None:
+    """Incrementa a versão agora ou, dentro de `batched_data_version`, ao final do bloco"""
+    if getattr(_batch, 'depth', 0):
+        _batch.pending = True
+        return
+    try:
+        _increment()
+    except Exception as e:
+        logger.error(f"Erro ao incrementar a versão dos dados: {e}")
+
+
+@contextmanager
+def batched_data_version():
+    """
+    Agrupa os incrementos de versão do bloco em um único UPDATE ao sair.
+
+    Vale para a thread atual; blocos aninhados são absorvidos pelo mais
+    externo.
+    """
+    _batch.depth = getattr(_batch, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _batch.depth -= 1
+        if not _batch.depth and getattr(_batch, 'pending', False):
+            _batch.pending = False
+            bump_data_version()
@@ -0,0 +1,237 @@
+"""
+Exportação colunar (CSV / Parquet) das tabelas usadas pelo Power BI.
+
+As linhas saem direto de `values_list` (sem instanciar modelos nem
+serializers), em blocos lidos com `.iterator()`, e são escritas de forma
+incremental: CSV comprimido com gzip ou Parquet (requer `pyarrow`,
+em requirements.txt). Usado pelo endpoint `/api/export/` e pelo comando
+`export_dataset`.
+"""
+import csv
+import io
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Tuple
+
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende do ambiente
+    pa = None
+    pq = None
+
+CHUNK_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Tabela exportável: nome, colunas (nome, lookup) e queryset base"""
+
+    name: str
+    columns: Tuple[Tuple[str, str], ...]
+    queryset: Callable
+
+    @property
+    def headers(self) -> List[str]:
+        return [name for name, _lookup in self.columns]
+
+    def rows(self, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+        lookups = [lookup for _name, lookup in self.columns]
+        return self.queryset().values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def _proposicoes():
+    from apps.pauta.models import Proposicao
+    return Proposicao.objects.annotate(
+        export_identificador=Concat(
+            'tipo', Value(' '), Cast('numero', CharField()), Value('/'), Cast('ano', CharField()),
+            output_field=CharField(),
+        )
+    ).order_by('id')
+
+
+def _atividades_senado():
+    from apps.pauta.models import SenadoActivityHistory
+    return SenadoActivityHistory.objects.order_by('id')
+
+
+def _atividades_camara():
+    from apps.pauta.models import CamaraActivityHistory
+    return CamaraActivityHistory.objects.order_by('id')
+
+
+def _same(*names):
+    return tuple((name, name) for name in names)
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in [
+        # Mesmas colunas de `ProposicaoReadOnlySerializer`
+        Dataset('proposicoes', (
+            *_same('id', 'tipo', 'numero', 'ano'),
+            ('identificador_completo', 'export_identificador'),
+            *_same('sf_id', 'cd_id', 'autor', 'data_apresentacao', 'iniciadora', 'revisora', 'ementa',
+                   'current_house', 'ultima_sincronizacao', 'erro_sincronizacao'),
+            ('tema_id', 'tema_id'),
+            ('tema_nome', 'tema__nome'),
+            ('eixo_id', 'tema__eixo_id'),
+            ('eixo_nome', 'tema__eixo__nome'),
+            *_same('created_at', 'updated_at'),
+        ), _proposicoes),
+        Dataset('atividades_senado', (
+            *_same('id'),
+            ('proposicao', 'proposicao_id'),
+            *_same('id_informe', 'data', 'descricao',
+                   'colegiado_codigo', 'colegiado_casa', 'colegiado_sigla', 'colegiado_nome',
+                   'ente_administrativo_id', 'ente_administrativo_casa', 'ente_administrativo_sigla',
+                   'ente_administrativo_nome', 'id_situacao_iniciada', 'sigla_situacao_iniciada',
+                   'created_at', 'updated_at'),
+        ), _atividades_senado),
+        Dataset('atividades_camara', (
+            *_same('id'),
+            ('proposicao', 'proposicao_id'),
+            *_same('data_hora', 'sequencia', 'sigla_orgao', 'uri_orgao', 'uri_ultimo_relator', 'regime',
+                   'descricao_tramitacao', 'cod_tipo_tramitacao', 'descricao_situacao', 'cod_situacao',
+                   'despacho', 'url', 'ambito', 'apreciacao', 'created_at', 'updated_at'),
+        ), _atividades_camara),
+    ]
+}
+
+FORMATS = {
+    # formato: (extensão, content type)
+    'csv': ('csv.gz', 'application/gzip'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+class ExportError(Exception):
+    """Formato indisponível ou dataset desconhecido"""
+
+
+def get_dataset(name: str) -> Dataset:
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ExportError(f"Dataset desconhecido: {name} (opções: {', '.join(DATASETS)})")
+
+
+def export_chunks(dataset: Dataset, formato: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Gera o arquivo exportado em blocos de bytes"""
+    if formato == 'csv':
+        return _csv_gzip_chunks(dataset, chunk_size)
+    if formato == 'parquet':
+        if pa is None:
+            raise ExportError("Exportação Parquet requer o pacote 'pyarrow' (ver requirements.txt)")
+        return _parquet_chunks(dataset, chunk_size)
+    raise ExportError(f"Formato desconhecido: {formato} (opções: {', '.join(FORMATS)})")
+
+
+def filename(dataset: Dataset, formato: str) -> str:
+    return f"{dataset.name}.{FORMATS[formato][0]}"
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_gzip_chunks(dataset: Dataset, chunk_size: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(dataset.headers)
+
+    for i, row in enumerate(dataset.rows(chunk_size), 1):
+        writer.writerow([_csv_value(value) for value in row])
+        if i % chunk_size == 0:
+            data = compressor.compress(buffer.getvalue().encode('utf-8'))
+            buffer.seek(0)
+            buffer.truncate()
+            if data:
+                yield data
+
+    yield compressor.compress(buffer.getvalue().encode('utf-8')) + compressor.flush()
+
+
+class _DrainSink(io.RawIOBase):
+    """Destino de escrita não posicionável cujo conteúdo é drenado a cada row group"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(model, lookup: str):
+    """Tipo Arrow da coluna, a partir do campo do modelo (anotações viram texto)"""
+    from django.core.exceptions import FieldDoesNotExist
+
+    parts = lookup.split('__')
+    try:
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        field = model._meta.get_field(parts[-1])
+    except FieldDoesNotExist:
+        return pa.string()
+
+    internal_type = field.get_internal_type()
+    if field.is_relation:
+        internal_type = field.target_field.get_internal_type()
+    if internal_type in ('AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField',
+                         'SmallIntegerField', 'PositiveIntegerField'):
+        return pa.int64()
+    if internal_type == 'BooleanField':
+        return pa.bool_()
+    if internal_type == 'DateField':
+        return pa.date32()
+    if internal_type == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    return pa.string()
+
+
+def _parquet_chunks(dataset: Dataset, chunk_size: int) -> Iterator[bytes]:
+    model = dataset.queryset().model
+    schema = pa.schema([
+        (name, _arrow_type(model, lookup)) for name, lookup in dataset.columns
+    ])
+    sink = _DrainSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+
+    batch = []
+    for row in dataset.rows(chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            # Um row group por bloco: o arquivo é enviado à medida que é escrito
+            writer.write_table(pa.Table.from_pylist([dict(zip(dataset.headers, r)) for r in batch], schema=schema))
+            batch = []
+            yield sink.drain()
+
+    if batch:
+        writer.write_table(pa.Table.from_pylist([dict(zip(dataset.headers, r)) for r in batch], schema=schema))
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,130 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from apps.pauta import benchmarks
+from apps.pauta.benchmarks import BenchmarkError
+from apps.pauta.models import Proposicao
+import logging
+from apps.core.logging_utils import log_performance, log_error
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Mede latência, vazão, queries e memória dos endpoints da API e compara com uma baseline JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=benchmarks.ITERATIONS,
+            help='Requisições medidas por cenário',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=benchmarks.WARMUP,
+            help='Requisições descartadas por cenário antes da medição',
+        )
+        parser.add_argument(
+            '--only',
+            action='append',
+            help='Roda apenas os cenários cujo nome contém este texto (pode repetir)',
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Mantém o cache de respostas conforme a configuração (padrão: desligado)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Grava os resultados neste arquivo JSON (nova baseline)',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            help='Compara com esta baseline JSON e falha se houver regressão',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=benchmarks.TOLERANCE,
+            help='Aumento relativo de p95 tolerado em relação à baseline (0.2 = 20%%)',
+        )
+        parser.add_argument(
+            '--generate-scale',
+            type=float,
+            help='Se a base estiver vazia, roda generate_synthetic_data --scale com este valor antes',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='Lista os cenários e sai',
+        )
+
+    def handle(self, *args, **options):
+        import time
+        start_time = time.time()
+
+        try:
+            cenarios = benchmarks.select_cenarios(options['only'])
+            if options['list']:
+                for cenario in cenarios:
+                    self.stdout.write(f"{cenario.nome}: {cenario.path} {cenario.params or ''}")
+                return
+
+            baseline = benchmarks.load(options['baseline']) if options['baseline'] else None
+
+            if options['generate_scale'] and not Proposicao.objects.exists():
+                call_command('generate_synthetic_data', scale=options['generate_scale'], stdout=self.stdout)
+
+            self.stdout.write(f"{'cenário':<26} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'queries':>7} {'bytes':>10}")
+            resultado = benchmarks.run_benchmark(
+                cenarios,
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                cache=options['cache'],
+                progress=self._progress,
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        except Exception as e:
+            log_error(e, {
+                'command': 'benchmark_api',
+                'only': options['only'],
+                'iterations': options['iterations'],
+            })
+            raise
+
+        self.stdout.write(f"Pico de RSS: {benchmarks.peak_rss_kb() / 1024:.1f} MiB")
+        if options['output']:
+            benchmarks.save(resultado, options['output'])
+            self.stdout.write(f"Resultados gravados em {options['output']}")
+
+        duration = time.time() - start_time
+        log_performance('benchmark_api_command', duration, {
+            'cenarios': len(cenarios),
+            'iterations': options['iterations'],
+            'dataset': resultado['meta']['dataset'],
+        })
+
+        if baseline is None:
+            self.stdout.write(self.style.SUCCESS(f"Benchmark concluído: {len(cenarios)} cenário(s) em {duration:.2f} segundos"))
+            return
+
+        if baseline['meta']['dataset'] != resultado['meta']['dataset']:
+            self.stdout.write(self.style.WARNING(
+                f"Base diferente da baseline: {baseline['meta']['dataset']} -> {resultado['meta']['dataset']}"
+            ))
+        regressoes = benchmarks.compare(resultado, baseline, tolerance=options['tolerance'])
+        if regressoes:
+            for regressao in regressoes:
+                self.stdout.write(self.style.ERROR(regressao))
+            raise CommandError(f"{len(regressoes)} regressão(ões) em relação a {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS(f"Sem regressões em relação a {options['baseline']}"))
+
+    def _progress(self, nome, resultado):
+        self.stdout.write(
+            f"{nome:<26} {resultado['p50_ms']:>8.2f} {resultado['p95_ms']:>8.2f} {resultado['p99_ms']:>8.2f} "
+            f"{resultado['rps'] or 0:>8.1f} {resultado['queries']:>7} {resultado['bytes']:>10}"
+        )
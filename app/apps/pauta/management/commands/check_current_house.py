@@ -87,11 +87,12 @@ class Command(BaseCommand):
                 except Proposicao.DoesNotExist:
                     raise CommandError(f"Proposição com ID {options['proposicao_id']} não encontrada")
             else:
-                # Verificar todas as proposições
-                queryset = Proposicao.objects.all().order_by('id')
+                # Verificar todas as proposições em lote (consulta única + bulk_update)
+                queryset = Proposicao.objects.all()
                 
                 if options['limit']:
-                    queryset = queryset[:options['limit']]
+                    ids = list(queryset.order_by('id').values_list('id', flat=True)[:options['limit']])
+                    queryset = queryset.filter(id__in=ids)
                 
                 total_count = queryset.count()
                 self.stdout.write(f"Total de proposições a processar: {total_count}")
@@ -102,88 +103,39 @@ class Command(BaseCommand):
                 
                 if options['dry_run']:
                     self.stdout.write("Modo dry-run: não serão feitas alterações no banco")
-                    limit_show = min(5, total_count)
-                    self.stdout.write(f"Mostrando status de {limit_show} proposições:")
-                    
-                    for proposicao in queryset[:limit_show]:
-                        self._show_proposicao_status(proposicao)
-                else:
-                    # Processar proposições
-                    self.stdout.write("Processando proposições...")
-                    
-                    for i, proposicao in enumerate(queryset, 1):
-                        current_house_before = proposicao.current_house
-                        
-                        success = service.update_derived_fields(proposicao)
-                        
-                        if success:
-                            total_processed += 1
-                            proposicao.refresh_from_db()
-                            current_house_after = proposicao.current_house
-                            
-                            if current_house_before != current_house_after:
-                                updates_made += 1
-                                
-                                if options['show_details']:
-                                    self.stdout.write(
-                                        self.style.SUCCESS(
-                                            f"[{i}/{total_count}] {proposicao.identificador_completo}: "
-                                            f"current_house: '{current_house_before}' → '{current_house_after}'"
-                                        )
-                                    )
-                            elif options['show_details']:
-                                self.stdout.write(
-                                    f"[{i}/{total_count}] {proposicao.identificador_completo}: "
-                                    f"current_house mantido: '{current_house_after}'"
-                                )
-                        else:
-                            if options['show_details']:
-                                self.stdout.write(
-                                    self.style.ERROR(
-                                        f"[{i}/{total_count}] Erro ao processar {proposicao.identificador_completo}"
-                                    )
-                                )
-                        
-                        # Progress indicator for large batches
-                        if i % 100 == 0:
-                            self.stdout.write(f"Processadas {i}/{total_count} proposições...")
-                    
-                    # Summary with additional context
-                    from apps.pauta.models import SenadoActivityHistory, CamaraActivityHistory
-                    props_with_activities = 0
-                    props_without_activities = 0
-                    
-                    for prop in queryset:
-                        sf_count = SenadoActivityHistory.objects.filter(proposicao=prop).count()
-                        cd_count = CamaraActivityHistory.objects.filter(proposicao=prop).count()
-                        
-                        if sf_count > 0 or cd_count > 0:
-                            props_with_activities += 1
-                        else:
-                            props_without_activities += 1
-                    
-                    self.stdout.write("\n" + "="*60)
+                
+                stats = service.recompute_derived_fields(queryset, dry_run=options['dry_run'])
+                total_processed = stats['total']
+                updates_made = len(stats['alteracoes'])
+                props_with_activities = stats['com_atividades']
+                props_without_activities = total_processed - props_with_activities
+                
+                if options['dry_run'] or options['show_details']:
+                    for alteracao in stats['alteracoes']:
+                        self._show_diff(alteracao)
+                
+                self.stdout.write("\n" + "="*60)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{'Simulação concluída' if options['dry_run'] else 'Processamento concluído'}:\n"
+                        f"  - Total processadas: {total_processed}\n"
+                        f"  - {'Alterações pendentes' if options['dry_run'] else 'Atualizações realizadas'}: {updates_made}\n"
+                        f"  - Sem alteração: {total_processed - updates_made}\n"
+                        f"  - Com atividades: {props_with_activities}\n"
+                        f"  - Sem atividades: {props_without_activities}"
+                    )
+                )
+                
+                if updates_made == 0:
                     self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Processamento concluído:\n"
-                            f"  - Total processadas: {total_processed}\n"
-                            f"  - Atualizações realizadas: {updates_made}\n"
-                            f"  - Sem alteração: {total_processed - updates_made}\n"
-                            f"  - Com atividades: {props_with_activities}\n"
-                            f"  - Sem atividades: {props_without_activities}"
-                        )
+                        self.style.SUCCESS("✅ Todos os campos current_house estão corretos!")
                     )
                     
-                    if updates_made == 0:
-                        self.stdout.write(
-                            self.style.SUCCESS("✅ Todos os campos current_house estão corretos!")
-                        )
-                        
-                    if props_without_activities > 0:
-                        self.stdout.write(
-                            f"\nℹ️  {props_without_activities} proposições têm current_house=None porque não possuem histórico de atividades.\n"
-                            f"   Isso é o comportamento esperado - current_house só é definido quando há atividades registradas."
-                        )
+                if props_without_activities > 0:
+                    self.stdout.write(
+                        f"\nℹ️  {props_without_activities} proposições têm current_house=None porque não possuem histórico de atividades.\n"
+                        f"   Isso é o comportamento esperado - current_house só é definido quando há atividades registradas."
+                    )
             
             # Log performance metrics
             duration = time.time() - start_time
@@ -202,6 +154,15 @@ class Command(BaseCommand):
             })
             raise
 
+    def _show_diff(self, alteracao):
+        """Mostra as alterações calculadas para uma proposição."""
+        for campo in ('current_house', 'data_apresentacao'):
+            if campo in alteracao:
+                antes, depois = alteracao[campo]
+                self.stdout.write(
+                    f"{alteracao['identificador']} (id={alteracao['id']}): {campo}: '{antes}' → '{depois}'"
+                )
+
     def _show_proposicao_status(self, proposicao):
         """Mostra o status atual da proposição e suas atividades."""
         from apps.pauta.models import SenadoActivityHistory, CamaraActivityHistory
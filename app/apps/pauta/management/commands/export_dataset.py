@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.pauta import exports
+import logging
+import os
+from apps.core.logging_utils import log_performance, log_error
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Exporta proposições e históricos de atividades em CSV (gzip) ou Parquet para o Power BI'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            help=f"Datasets a exportar ({', '.join(exports.DATASETS)}); padrão: todos",
+        )
+        parser.add_argument(
+            '--format',
+            choices=list(exports.FORMATS),
+            default='csv',
+            help='Formato de saída: csv (gzip) ou parquet (requer pyarrow)',
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            default='.',
+            help='Diretório onde os arquivos serão gravados',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=exports.CHUNK_SIZE,
+            help='Linhas lidas do banco (e escritas) por bloco',
+        )
+
+    def handle(self, *args, **options):
+        import time
+        start_time = time.time()
+
+        formato = options['format']
+        output_dir = options['output_dir']
+        try:
+            datasets = [exports.get_dataset(name) for name in options['datasets'] or exports.DATASETS]
+        except exports.ExportError as e:
+            raise CommandError(str(e))
+
+        os.makedirs(output_dir, exist_ok=True)
+        arquivos = {}
+        try:
+            for dataset in datasets:
+                path = os.path.join(output_dir, exports.filename(dataset, formato))
+                try:
+                    chunks = exports.export_chunks(dataset, formato, options['chunk_size'])
+                except exports.ExportError as e:
+                    raise CommandError(str(e))
+
+                # Grava em arquivo temporário e renomeia: um erro no meio não deixa arquivo truncado
+                tmp_path = f'{path}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                os.replace(tmp_path, path)
+
+                arquivos[dataset.name] = os.path.getsize(path)
+                self.stdout.write(f"{dataset.name}: {path} ({arquivos[dataset.name]} bytes)")
+
+            duration = time.time() - start_time
+            self.stdout.write(self.style.SUCCESS(f"Exportação concluída: {len(arquivos)} arquivo(s) em {duration:.2f} segundos"))
+
+            log_performance('export_dataset_command', duration, {
+                'format': formato,
+                'files': arquivos,
+            })
+
+        except CommandError:
+            raise
+        except Exception as e:
+            log_error(e, {
+                'command': 'export_dataset',
+                'options': options
+            })
+            raise
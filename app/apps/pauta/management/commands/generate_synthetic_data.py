@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.pauta import synthetic_data
+from apps.pauta.synthetic_data import SyntheticDataError, SyntheticDataGenerator, Volumes
+import logging
+from apps.core.logging_utils import log_performance, log_error
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Gera dados sintéticos em volume (eixos, temas, proposições e atividades) para testes de carga'
+
+    def add_arguments(self, parser):
+        padrao = Volumes()
+        parser.add_argument('--eixos', type=int, default=padrao.eixos, help='Quantidade de eixos')
+        parser.add_argument('--temas', type=int, default=padrao.temas, help='Quantidade de temas')
+        parser.add_argument('--proposicoes', type=int, default=padrao.proposicoes, help='Quantidade de proposições')
+        parser.add_argument(
+            '--atividades',
+            type=int,
+            default=padrao.atividades,
+            help='Total de linhas de histórico de atividades (Senado + Câmara)',
+        )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiplica todos os volumes (ex.: 0.01 para uma base pequena)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Semente do gerador; a mesma semente gera os mesmos dados',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=synthetic_data.CHUNK_SIZE,
+            help='Linhas por bulk_create',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove os dados sintéticos existentes antes de gerar',
+        )
+        parser.add_argument(
+            '--clear-only',
+            action='store_true',
+            help='Apenas remove os dados sintéticos existentes',
+        )
+
+    def handle(self, *args, **options):
+        import time
+        start_time = time.time()
+        self.verbosity = options['verbosity']
+
+        volumes = Volumes(
+            options['eixos'], options['temas'], options['proposicoes'], options['atividades'],
+        ).scaled(options['scale'])
+
+        try:
+            if options['clear'] or options['clear_only']:
+                removidos = synthetic_data.clear_synthetic_data()
+                self.stdout.write(f"Dados sintéticos removidos: {removidos}")
+                if options['clear_only']:
+                    return
+
+            self.stdout.write(
+                f"Gerando {volumes.eixos} eixos, {volumes.temas} temas, {volumes.proposicoes} proposições "
+                f"e {volumes.atividades} atividades (seed={options['seed']})"
+            )
+            generator = SyntheticDataGenerator(
+                volumes, seed=options['seed'], chunk_size=options['chunk_size'], progress=self._progress,
+            )
+            totais = generator.generate()
+
+            duration = time.time() - start_time
+            self.stdout.write(self.style.SUCCESS(f"Dados sintéticos gerados em {duration:.2f} segundos: {totais}"))
+
+            log_performance('generate_synthetic_data_command', duration, {
+                'seed': options['seed'],
+                'totais': totais,
+            })
+
+        except SyntheticDataError as e:
+            raise CommandError(str(e))
+        except Exception as e:
+            log_error(e, {
+                'command': 'generate_synthetic_data',
+                'volumes': vars(volumes),
+                'seed': options['seed'],
+            })
+            raise
+
+    def _progress(self, model, count):
+        # Proposições são reportadas a cada bloco; só com -v 2
+        if model != 'proposicoes' or self.verbosity >= 2:
+            self.stdout.write(f"  {model}: {count}")
@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.pauta.services import APISyncService
+from apps.pauta.data_version import batched_data_version
+from apps.pauta.services_impl.payload_archive import PayloadArchive, get_payload_archive
+import logging
+from apps.core.logging_utils import log_performance, log_error
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Reprocessa proposições e históricos de atividades a partir dos payloads arquivados, sem acessar as APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Limite de proposições a processar',
+        )
+        parser.add_argument(
+            '--proposicao-id',
+            type=int,
+            help='ID específico de uma proposição para reprocessar',
+        )
+        parser.add_argument(
+            '--skip-activities',
+            action='store_true',
+            help='Reprocessa apenas os dados da proposição, sem o histórico de atividades',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            type=str,
+            help='Diretório do arquivo de payloads (padrão: API_PAYLOAD_ARCHIVE_DIR)',
+        )
+
+    def handle(self, *args, **options):
+        import time
+        start_time = time.time()
+
+        from apps.pauta.models import Proposicao
+
+        if options['archive_dir']:
+            archive = PayloadArchive(options['archive_dir'])
+        else:
+            archive = get_payload_archive()
+        if archive is None:
+            raise CommandError("Arquivo de payloads desativado (defina API_PAYLOAD_ARCHIVE_DIR)")
+
+        service = APISyncService()
+        orchestrator = service.orchestrator
+
+        try:
+            if options['proposicao_id']:
+                try:
+                    proposicoes = [Proposicao.objects.get(id=options['proposicao_id'])]
+                except Proposicao.DoesNotExist:
+                    raise CommandError(f"Proposição com ID {options['proposicao_id']} não encontrada")
+            else:
+                proposicoes = Proposicao.objects.select_related('tema').order_by('created_at')
+                if options['limit']:
+                    proposicoes = proposicoes[:options['limit']]
+
+            total = len(proposicoes)
+            self.stdout.write(f"Reprocessando {total} proposições a partir de {archive.directory}")
+
+            sucessos = 0
+            sem_dados = 0
+            with batched_data_version():
+                for proposicao in proposicoes:
+                    if orchestrator.reprocess_from_archive(
+                        proposicao, archive, activities=not options['skip_activities']
+                    ):
+                        sucessos += 1
+                    else:
+                        sem_dados += 1
+
+                if sucessos:
+                    service.atualizar_selecao_proposicoes()
+
+            duration = time.time() - start_time
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Reprocessamento concluído: {sucessos} reprocessadas, {sem_dados} sem dados arquivados"
+                )
+            )
+            self.stdout.write(f"Tempo total: {duration:.2f} segundos")
+
+            log_performance('reprocess_from_archive_command', duration, {
+                'total_processed': total,
+                'sucessos': sucessos,
+                'sem_dados': sem_dados,
+                'skip_activities': options['skip_activities'],
+            })
+
+        except CommandError:
+            raise
+        except Exception as e:
+            log_error(e, {
+                'command': 'reprocess_from_archive',
+                'options': options
+            })
+            raise
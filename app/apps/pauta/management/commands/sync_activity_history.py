@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from apps.pauta.services import APISyncService
+from apps.pauta.services_impl.data_processing_service import deferred_derived_fields
 from apps.pauta.models import Proposicao
 from apps.core.logging_utils import log_database_operation, log_error, log_performance
 import logging
@@ -80,31 +81,33 @@ class Command(BaseCommand):
                 self.stdout.write(f"[{i}/{total}] Processando {proposicao.identificador_completo}...")
                 
                 try:
-                    # Sincronizar atividades do Senado
-                    if not options['camara_only'] and proposicao.sf_id:
-                        if sync_service.sincronizar_atividades_senado(proposicao):
-                            sucessos_senado += 1
-                            self.stdout.write(
-                                self.style.SUCCESS(f"  ✓ Senado: OK")
-                            )
-                        else:
-                            erros += 1
-                            self.stdout.write(
-                                self.style.WARNING(f"  ✗ Senado: ERRO")
-                            )
+                    # Campos derivados recalculados uma vez por proposição
+                    with deferred_derived_fields():
+                        # Sincronizar atividades do Senado
+                        if not options['camara_only'] and proposicao.sf_id:
+                            if sync_service.sincronizar_atividades_senado(proposicao):
+                                sucessos_senado += 1
+                                self.stdout.write(
+                                    self.style.SUCCESS(f"  ✓ Senado: OK")
+                                )
+                            else:
+                                erros += 1
+                                self.stdout.write(
+                                    self.style.WARNING(f"  ✗ Senado: ERRO")
+                                )
                     
-                    # Sincronizar atividades da Câmara
-                    if not options['senado_only'] and proposicao.cd_id:
-                        if sync_service.sincronizar_atividades_camara(proposicao):
-                            sucessos_camara += 1
-                            self.stdout.write(
-                                self.style.SUCCESS(f"  ✓ Câmara: OK")
-                            )
-                        else:
-                            erros += 1
-                            self.stdout.write(
-                                self.style.WARNING(f"  ✗ Câmara: ERRO")
-                            )
+                        # Sincronizar atividades da Câmara
+                        if not options['senado_only'] and proposicao.cd_id:
+                            if sync_service.sincronizar_atividades_camara(proposicao):
+                                sucessos_camara += 1
+                                self.stdout.write(
+                                    self.style.SUCCESS(f"  ✓ Câmara: OK")
+                                )
+                            else:
+                                erros += 1
+                                self.stdout.write(
+                                    self.style.WARNING(f"  ✗ Câmara: ERRO")
+                                )
                     
                     # Log de operação
                     log_database_operation(
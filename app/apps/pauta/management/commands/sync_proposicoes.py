@@ -31,6 +31,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Executa sem salvar alterações no banco de dados',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Número de proposições sincronizadas em paralelo (padrão: SYNC_WORKERS)',
+        )
 
     def handle(self, *args, **options):
         import time
@@ -114,16 +120,22 @@ class Command(BaseCommand):
                     # Remove atomic block to avoid transaction management errors
                     stats = service.sincronizar_todas_proposicoes(
                         limit=options['limit'], 
-                        force=options['force']
+                        force=options['force'],
+                        workers=options['workers']
                     )
                     
                     total = stats.get('total', 0)  # Update total from stats
+                    duration = time.time() - start_time
+                    throughput = total / duration if duration > 0 else 0.0
                     
                     self.stdout.write(
                         self.style.SUCCESS(
                             f"Sincronização concluída: {stats['sucessos']} sucessos, {stats['erros']} erros"
                         )
                     )
+                    self.stdout.write(
+                        f"Tempo total: {duration:.2f} segundos ({throughput:.2f} proposições/s)"
+                    )
                     
                     if stats['erros'] > 0:
                         self.stdout.write(
@@ -138,7 +150,8 @@ class Command(BaseCommand):
                     'total_processed': total,
                     'force': options['force'],
                     'dry_run': options['dry_run'],
-                    'limit': options['limit']
+                    'limit': options['limit'],
+                    'workers': options['workers']
                 })
             
         except Exception as e:
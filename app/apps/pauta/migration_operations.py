@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class PostgresOnlyAddIndex(migrations.AddIndex):
+    """
+    `AddIndex` aplicado apenas no PostgreSQL.
+
+    Para índices que só existem lá (GIN de busca textual e de trigramas). O
+    estado das migrações é o mesmo em qualquer banco; no SQLite dos testes o
+    índice simplesmente não é criado.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f"{super().describe()} (PostgreSQL only)"
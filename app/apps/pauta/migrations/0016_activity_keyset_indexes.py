@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pauta', '0015_rename_casa_inicial_proposicao_iniciadora_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='camaraactivityhistory',
+            index=models.Index(fields=['-data_hora', '-sequencia', '-id'], name='camara_act_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='senadoactivityhistory',
+            index=models.Index(fields=['-data', '-id_informe', '-id'], name='senado_act_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:13
+
+from django.db import migrations, models
+
+
+def create_singleton(apps, schema_editor):
+    DataVersion = apps.get_model('pauta', 'DataVersion')
+    DataVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pauta', '0016_activity_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='Incrementado a cada alteração dos dados')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Data e hora da última alteração dos dados')),
+            ],
+            options={
+                'verbose_name': 'Versão dos Dados',
+                'verbose_name_plural': 'Versão dos Dados',
+            },
+        ),
+        migrations.RunPython(create_singleton, migrations.RunPython.noop),
+    ]
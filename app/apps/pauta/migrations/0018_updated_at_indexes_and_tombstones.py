@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pauta', '0017_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('eixo', 'Eixo'), ('tema', 'Tema'), ('proposicao', 'Proposição'), ('atividade_senado', 'Atividade - Senado'), ('atividade_camara', 'Atividade - Câmara')], help_text='Tabela da linha removida', max_length=20)),
+                ('object_id', models.BigIntegerField(help_text='ID da linha removida')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, help_text='Data e hora da exclusão')),
+            ],
+            options={
+                'verbose_name': 'Registro de Exclusão',
+                'verbose_name_plural': 'Registros de Exclusão',
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='camaraactivityhistory',
+            index=models.Index(fields=['updated_at'], name='camara_act_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eixo',
+            index=models.Index(fields=['updated_at'], name='eixo_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proposicao',
+            index=models.Index(fields=['updated_at'], name='proposicao_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='senadoactivityhistory',
+            index=models.Index(fields=['updated_at'], name='senado_act_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(fields=['updated_at'], name='tema_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['deleted_at'], name='deleted_record_at_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.pauta.migration_operations import PostgresOnlyAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pauta', '0018_updated_at_indexes_and_tombstones'),
+    ]
+
+    # Índices GIN de expressão (to_tsvector 'portuguese'); não existem no SQLite
+    operations = [
+        PostgresOnlyAddIndex(
+            model_name='camaraactivityhistory',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('despacho', 'descricao_tramitacao', 'descricao_situacao', config='portuguese'), name='camara_act_fts_idx'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='proposicao',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('tipo', 'ementa', config='portuguese'), name='proposicao_fts_idx'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='senadoactivityhistory',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('descricao', 'colegiado_nome', 'ente_administrativo_nome', config='portuguese'), name='senado_act_fts_idx'),
+        ),
+    ]
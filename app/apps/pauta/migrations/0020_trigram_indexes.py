@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:20
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.pauta.migration_operations import PostgresOnlyAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pauta', '0019_full_text_search_indexes'),
+    ]
+
+    # pg_trgm e índices GIN de trigramas; não existem no SQLite
+    operations = [
+        TrigramExtension(),
+        PostgresOnlyAddIndex(
+            model_name='proposicao',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('autor'), name='gin_trgm_ops'), name='proposicao_autor_trgm_idx'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='proposicao',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('tipo'), name='gin_trgm_ops'), name='proposicao_tipo_trgm_idx'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='tema',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nome'), name='gin_trgm_ops'), name='tema_nome_trgm_idx'),
+        ),
+    ]
@@ -1,7 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
-from django.db.models.signals import post_save, post_delete
+from django.db.models.functions import Upper
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 
+from .search import search_vector
+
+
+def trigram_index(field: str, name: str) -> GinIndex:
+    """
+    Índice GIN de trigramas (pg_trgm) para buscas por substring.
+
+    Indexa `UPPER(campo)`, a mesma expressão gerada por `icontains` /
+    `istartswith` no PostgreSQL, então o admin e a API passam a usá-lo.
+    """
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
+# Campos da busca textual (?search=) de cada modelo, com índice GIN no PostgreSQL
+PROPOSICAO_SEARCH_FIELDS = ('tipo', 'ementa')
+SENADO_ACTIVITY_SEARCH_FIELDS = ('descricao', 'colegiado_nome', 'ente_administrativo_nome')
+CAMARA_ACTIVITY_SEARCH_FIELDS = ('despacho', 'descricao_tramitacao', 'descricao_situacao')
+
 
 class Eixo(models.Model):
     """
@@ -38,6 +58,10 @@ class Eixo(models.Model):
         verbose_name = "Eixo"
         verbose_name_plural = "Eixos"
         ordering = ['id']
+        indexes = [
+            # Consultas incrementais (?updated_since= / RangeStart / RangeEnd)
+            models.Index(fields=['updated_at'], name='eixo_updated_at_idx'),
+        ]
     
     def __str__(self):
         return f"Eixo {self.id}: {self.nome}"
@@ -81,6 +105,10 @@ class Tema(models.Model):
         verbose_name = "Tema"
         verbose_name_plural = "Temas"
         ordering = ['eixo__id', 'nome']
+        indexes = [
+            models.Index(fields=['updated_at'], name='tema_updated_at_idx'),
+            trigram_index('nome', 'tema_nome_trgm_idx'),
+        ]
     
     def __str__(self):
         return self.nome
@@ -210,6 +238,12 @@ class Proposicao(models.Model):
         verbose_name_plural = "Proposições"
         ordering = ['tema__nome', 'ano', 'numero']
         unique_together = ['tipo', 'numero', 'ano']
+        indexes = [
+            models.Index(fields=['updated_at'], name='proposicao_updated_at_idx'),
+            GinIndex(search_vector(*PROPOSICAO_SEARCH_FIELDS), name='proposicao_fts_idx'),
+            trigram_index('autor', 'proposicao_autor_trgm_idx'),
+            trigram_index('tipo', 'proposicao_tipo_trgm_idx'),
+        ]
     
     def __str__(self):
         return f"{self.tipo} {self.numero}/{self.ano}"
@@ -358,6 +392,12 @@ class SenadoActivityHistory(models.Model):
         verbose_name_plural = "Históricos de Atividade - Senado"
         ordering = ['proposicao', '-data', '-id_informe']
         unique_together = ['proposicao', 'id_informe']
+        indexes = [
+            # Paginação por cursor em /api/atividades/senado/
+            models.Index(fields=['-data', '-id_informe', '-id'], name='senado_act_keyset_idx'),
+            models.Index(fields=['updated_at'], name='senado_act_updated_at_idx'),
+            GinIndex(search_vector(*SENADO_ACTIVITY_SEARCH_FIELDS), name='senado_act_fts_idx'),
+        ]
     
     def __str__(self):
         return f"SF Activity {self.id_informe} - {self.proposicao} - {self.data}"
@@ -476,10 +516,84 @@ class CamaraActivityHistory(models.Model):
         verbose_name_plural = "Históricos de Atividade - Câmara"
         ordering = ['proposicao', '-data_hora', '-sequencia']
         unique_together = ['proposicao', 'sequencia']
+        indexes = [
+            # Paginação por cursor em /api/atividades/camara/
+            models.Index(fields=['-data_hora', '-sequencia', '-id'], name='camara_act_keyset_idx'),
+            models.Index(fields=['updated_at'], name='camara_act_updated_at_idx'),
+            GinIndex(search_vector(*CAMARA_ACTIVITY_SEARCH_FIELDS), name='camara_act_fts_idx'),
+        ]
     
     def __str__(self):
         return f"CD Activity {self.sequencia} - {self.proposicao} - {self.data_hora}"
 
+class DataVersion(models.Model):
+    """
+    Contador global de versão dos dados servidos pela API.
+    
+    Linha única, incrementada a cada alteração em eixos, temas, proposições
+    ou históricos de atividade (sinais e serviços de sincronização; ver
+    `apps.pauta.data_version`). Usada como chave do cache de respostas.
+    """
+    
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Incrementado a cada alteração dos dados"
+    )
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Data e hora da última alteração dos dados"
+    )
+    
+    class Meta:
+        verbose_name = "Versão dos Dados"
+        verbose_name_plural = "Versão dos Dados"
+    
+    def __str__(self):
+        return f"v{self.version} ({self.updated_at})"
+
+class DeletedRecord(models.Model):
+    """
+    Registro de exclusão (tombstone) para a atualização incremental do Power BI.
+    
+    Gravado pelo sinal `post_delete` de cada modelo servido pela API, para
+    que consultas "o que mudou desde T" também vejam as linhas removidas.
+    """
+    
+    MODEL_CHOICES = [
+        ('eixo', 'Eixo'),
+        ('tema', 'Tema'),
+        ('proposicao', 'Proposição'),
+        ('atividade_senado', 'Atividade - Senado'),
+        ('atividade_camara', 'Atividade - Câmara'),
+    ]
+    
+    model = models.CharField(
+        max_length=20,
+        choices=MODEL_CHOICES,
+        help_text="Tabela da linha removida"
+    )
+    
+    object_id = models.BigIntegerField(
+        help_text="ID da linha removida"
+    )
+    
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Data e hora da exclusão"
+    )
+    
+    class Meta:
+        verbose_name = "Registro de Exclusão"
+        verbose_name_plural = "Registros de Exclusão"
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='deleted_record_at_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} {self.object_id} ({self.deleted_at})"
+
 @receiver(post_save, sender=SenadoActivityHistory)
 @receiver(post_save, sender=CamaraActivityHistory)
 @receiver(post_delete, sender=SenadoActivityHistory)
@@ -488,12 +602,96 @@ def update_proposicao_derived_fields(sender, instance, **kwargs):
     """
     Automatically update derived fields (like current_house) when activity history changes.
     This ensures current_house is always up-to-date with the latest activity.
+    
+    Inside `deferred_derived_fields()` (sync services, bulk paths) the update
+    runs once per proposição when the block exits instead of once per row.
     """
     try:
-        from apps.pauta.services_impl.data_processing_service import DataProcessingService
-        processor = DataProcessingService()
-        processor.update_derived_fields(instance.proposicao)
+        from apps.pauta.services_impl.data_processing_service import request_derived_fields_update
+        request_derived_fields_update(instance.proposicao)
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
-        logger.error(f"Error updating derived fields after activity history change: {e}")
\ No newline at end of file
+        logger.error(f"Error updating derived fields after activity history change: {e}")
+
+
+@receiver(post_save, sender=Eixo)
+@receiver(post_save, sender=Tema)
+@receiver(post_save, sender=Proposicao)
+@receiver(post_save, sender=SenadoActivityHistory)
+@receiver(post_save, sender=CamaraActivityHistory)
+@receiver(post_delete, sender=Eixo)
+@receiver(post_delete, sender=Tema)
+@receiver(post_delete, sender=Proposicao)
+@receiver(post_delete, sender=SenadoActivityHistory)
+@receiver(post_delete, sender=CamaraActivityHistory)
+def bump_data_version_on_change(sender, instance, **kwargs):
+    """
+    Invalidate cached API responses whenever served data changes.
+    
+    Inside `batched_data_version()` (sync services) the version is bumped
+    once when the block exits instead of once per row.
+    """
+    from apps.pauta.data_version import bump_data_version
+    bump_data_version()
+
+
+TOMBSTONE_MODELS = {
+    Eixo: 'eixo',
+    Tema: 'tema',
+    Proposicao: 'proposicao',
+    SenadoActivityHistory: 'atividade_senado',
+    CamaraActivityHistory: 'atividade_camara',
+}
+
+
+@receiver(post_delete, sender=Eixo)
+@receiver(post_delete, sender=Tema)
+@receiver(post_delete, sender=Proposicao)
+@receiver(post_delete, sender=SenadoActivityHistory)
+@receiver(post_delete, sender=CamaraActivityHistory)
+def record_deletion(sender, instance, **kwargs):
+    """Record a tombstone so incremental BI refreshes can drop deleted rows."""
+    DeletedRecord.objects.create(model=TOMBSTONE_MODELS[sender], object_id=instance.pk)
+
+
+# FK do pai em cada modelo filho (Tema -> Eixo, Proposicao -> Tema)
+PARENT_FIELDS = {Tema: ('eixo_id', Eixo), Proposicao: ('tema_id', Tema)}
+
+
+@receiver(post_init, sender=Tema)
+@receiver(post_init, sender=Proposicao)
+def remember_parent(sender, instance, **kwargs):
+    """Keep the parent id as loaded, so a move to another parent can be detected on save."""
+    attname, _parent = PARENT_FIELDS[sender]
+    # Campo adiado (.only()/.defer()): não dispara uma query só para isso
+    instance._loaded_parent_id = instance.__dict__.get(attname)
+
+
+@receiver(post_save, sender=Tema)
+@receiver(post_delete, sender=Tema)
+@receiver(post_save, sender=Proposicao)
+@receiver(post_delete, sender=Proposicao)
+def touch_parent_on_membership_change(sender, instance, created=True, update_fields=None, **kwargs):
+    """
+    Touch the parent's `updated_at` when a child is added, removed or moved.
+    
+    `temas_count` (eixo) and `proposicoes_count` (tema) change in that case,
+    so the parent must show up in `?updated_since=` queries too. A move
+    (tema changing eixo, proposição changing tema) touches both parents.
+    """
+    from django.utils import timezone
+    attname, parent = PARENT_FIELDS[sender]
+    parent_id = getattr(instance, attname)
+    if created:
+        parent_ids = [parent_id]
+    else:
+        loaded_id = getattr(instance, '_loaded_parent_id', None)
+        if update_fields is not None and attname not in update_fields and attname[:-3] not in update_fields:
+            return
+        if loaded_id is None or loaded_id == parent_id:
+            instance._loaded_parent_id = parent_id
+            return
+        parent_ids = [loaded_id, parent_id]
+    parent.objects.filter(pk__in=parent_ids).update(updated_at=timezone.now())
+    instance._loaded_parent_id = parent_id
@@ -0,0 +1,168 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) para listagens grandes e ordenadas.
+
+    Cada página é buscada com um filtro sobre a chave de ordenação da view
+    (`keyset_ordering`, terminada em um campo único), a partir da última
+    linha da página anterior. Não há `COUNT(*)` nem OFFSET, então a página
+    1000 custa o mesmo que a primeira. O cursor é opaco para o cliente.
+
+    É opt-in: só pagina quando a requisição traz `?pagination=cursor` ou um
+    `cursor`; sem eles a listagem completa continua sendo retornada.
+    """
+
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    opt_in_query_param = 'pagination'
+    opt_in_value = 'cursor'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def is_enabled(self, request) -> bool:
+        params = request.query_params
+        return params.get(self.opt_in_query_param) == self.opt_in_value or self.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_enabled(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(view.keyset_ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+
+        reverse = False
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position, reverse = self.decode_cursor(encoded)
+            queryset = queryset.filter(self._after(position, reverse))
+
+        ordering = [self._invert(name) for name in self.ordering] if reverse else list(self.ordering)
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = bool(rows), has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(encoded)
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # --- Cursor ---
+    def _key(self, obj):
+        values = []
+        for name in self.fields:
+            value = getattr(obj, name)
+            values.append(value.isoformat() if isinstance(value, (date, datetime)) else value)
+        return values
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        payload = json.dumps({'k': self._key(obj), 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, encoded: str):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values = payload['k']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+            # Os campos do keyset não são nulos; None viraria um filtro inválido
+            if any(value is None for value in position):
+                raise ValueError
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, json.JSONDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _invert(name: str) -> str:
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    def _after(self, position, reverse: bool) -> Q:
+        """Filtro lexicográfico: linhas depois (ou antes, se `reverse`) da posição"""
+        conditions = []
+        for i, name in enumerate(self.ordering):
+            descending = name.startswith('-') != reverse
+            field = self.fields[i]
+            prefix = {self.fields[j]: position[j] for j in range(i)}
+            lookup = f"{field}__{'lt' if descending else 'gt'}"
+            conditions.append(Q(**prefix, **{lookup: position[i]}))
+        return reduce(or_, conditions)
+
+    # --- Resposta ---
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.opt_in_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Use 'cursor' para paginar por cursor (sem o parâmetro, retorna a lista completa)",
+                'schema': {'type': 'string', 'enum': [self.opt_in_value]},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor opaco retornado em next/previous',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Itens por página (padrão {self.page_size}, máximo {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
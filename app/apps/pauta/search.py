@@ -0,0 +1,60 @@
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+# Configuração de texto do PostgreSQL usada na busca e nos índices GIN
+FTS_CONFIG = 'portuguese'
+
+
+def search_vector(*fields) -> SearchVector:
+    """Documento de busca; a mesma expressão dos índices GIN (`models.py`)"""
+    return SearchVector(*fields, config=FTS_CONFIG)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `?search=` com busca textual do PostgreSQL.
+
+    No PostgreSQL, os campos em `search_vector_fields` da view são
+    pesquisados com `to_tsvector('portuguese', ...) @@ websearch_to_tsquery(...)`,
+    que usa o índice GIN de expressão do modelo (radicais, sem acentuação
+    exata, aspas e `-termo` como em buscadores). Sem `?ordering=`, os
+    resultados vêm ordenados por relevância (`search_rank`). Demais campos de
+    `search_fields` (ex.: nomes de tabelas relacionadas) continuam com
+    `icontains`.
+
+    Em outros bancos (SQLite nos testes), mantém o `SearchFilter` padrão.
+    Deve ficar depois do `OrderingFilter` em `filter_backends`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        fields = getattr(view, 'search_vector_fields', None)
+        if not fields or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        vector = search_vector(*fields)
+        query = SearchQuery(' '.join(terms), config=FTS_CONFIG, search_type='websearch')
+        # alias(): o documento só aparece no WHERE (casando com o índice), não no SELECT
+        queryset = queryset.alias(search_document=vector).annotate(search_rank=SearchRank(vector, query))
+
+        condition = Q(search_document=query)
+        others = [field for field in self.get_search_fields(view, request) or [] if field not in fields]
+        if others:
+            condition |= reduce(and_, [
+                reduce(or_, [Q(**{f'{field}__icontains': term}) for field in others])
+                for term in terms
+            ])
+        queryset = queryset.filter(condition)
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
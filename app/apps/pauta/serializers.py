@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
-from .models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from .models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory, DeletedRecord
 
 
 @extend_schema_serializer(
@@ -172,7 +172,9 @@ class EixoReadOnlySerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_temas_count(self, obj):
-        return obj.temas.count()
+        # Anotado pelo EixoReadOnlyViewSet; o COUNT por objeto fica só como fallback
+        count = getattr(obj, 'temas_count', None)
+        return count if count is not None else obj.temas.count()
 
 
 @extend_schema_serializer(
@@ -209,11 +211,17 @@ class TemaReadOnlySerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_proposicoes_count(self, obj):
-        return obj.proposicoes.count()
+        # Anotado pelo TemaReadOnlyViewSet; o COUNT por objeto fica só como fallback
+        count = getattr(obj, 'proposicoes_count', None)
+        return count if count is not None else obj.proposicoes.count()
 
     def get_selected_proposicao(self, obj):
         selected_list = getattr(obj, 'selected_list', None)
-        proposicao = selected_list[0] if selected_list else obj.proposicoes.filter(selected=True).first()
+        if selected_list is not None:
+            # Pré-carregado pelo TemaReadOnlyViewSet; lista vazia = tema sem selecionada
+            proposicao = selected_list[0] if selected_list else None
+        else:
+            proposicao = obj.proposicoes.filter(selected=True).first()
         return proposicao.identificador_completo if proposicao else None
 
 
@@ -350,4 +358,16 @@ class CamaraActivityHistorySerializer(serializers.ModelSerializer):
             'despacho', 'url', 'ambito', 'apreciacao',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at'] 
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class DeletedRecordSerializer(serializers.ModelSerializer):
+    """
+    Serializer para os registros de exclusão (tombstones) usados na
+    atualização incremental do Power BI.
+    """
+    
+    class Meta:
+        model = DeletedRecord
+        fields = ['id', 'model', 'object_id', 'deleted_at']
+        read_only_fields = fields
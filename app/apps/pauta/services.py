@@ -44,13 +44,14 @@ class APISyncService:
         """
         return self.orchestrator.sync_proposicao(proposicao)
     
-    def sincronizar_todas_proposicoes(self, limit: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+    def sincronizar_todas_proposicoes(self, limit: Optional[int] = None, force: bool = False,
+                                      workers: Optional[int] = None) -> Dict[str, int]:
         """
         Synchronize multiple proposições with external APIs.
         
         Delegates to SyncOrchestratorService for batch processing.
         """
-        return self.orchestrator.sync_all_proposicoes(limit=limit, force=force)
+        return self.orchestrator.sync_all_proposicoes(limit=limit, force=force, workers=workers)
     
     # =============================================================================
     # ACTIVITY SYNC METHODS - Delegate to ActivitySyncService
@@ -5,7 +5,10 @@ logger = logging.getLogger(__name__)
 from .activity_sync_service import ActivitySyncService
 from .selection_service import SelectionService
 from .data_processing_service import DataProcessingService
-from .api_config import APIConfig, RateLimiter
+from .api_config import APIConfig, RateLimiter, TokenBucket, get_token_bucket
+from .http_client import HTTPSessionPool, get_http_pool
+from .http_cache import HTTPResponseCache
+from .payload_archive import PayloadArchive, get_payload_archive
 
 __all__ = [
     'ActivitySyncService',
@@ -13,6 +16,13 @@ __all__ = [
     'DataProcessingService',
     'APIConfig',
     'RateLimiter',
+    'TokenBucket',
+    'get_token_bucket',
+    'HTTPSessionPool',
+    'get_http_pool',
+    'HTTPResponseCache',
+    'PayloadArchive',
+    'get_payload_archive',
 ]
 
 
@@ -2,13 +2,31 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 
-import requests
+from django.db import transaction
 from django.utils import timezone
 
+from apps.pauta.data_version import bump_data_version
+
 from .api_config import APIConfig, RateLimiter
+from .data_processing_service import request_derived_fields_update
+from .http_client import get_http_pool
+from .payload_archive import PayloadArchive, get_payload_archive
 
 logger = logging.getLogger(__name__)
 
+# Campos gravados a partir do payload de cada casa (além da proposição e da chave)
+SENADO_ACTIVITY_FIELDS = [
+    'data', 'descricao',
+    'colegiado_codigo', 'colegiado_casa', 'colegiado_sigla', 'colegiado_nome',
+    'ente_administrativo_id', 'ente_administrativo_casa', 'ente_administrativo_sigla', 'ente_administrativo_nome',
+    'id_situacao_iniciada', 'sigla_situacao_iniciada',
+]
+CAMARA_ACTIVITY_FIELDS = [
+    'data_hora', 'sigla_orgao', 'uri_orgao', 'uri_ultimo_relator', 'regime',
+    'descricao_tramitacao', 'cod_tipo_tramitacao', 'descricao_situacao', 'cod_situacao',
+    'despacho', 'url', 'ambito', 'apreciacao',
+]
+
 
 class ActivitySyncService:
     """
@@ -18,6 +36,16 @@ class ActivitySyncService:
 
     def __init__(self):
         self.rate_limiter = RateLimiter()
+        self.http = get_http_pool()
+        self.archive = get_payload_archive()
+
+    def _archive_payload(self, kind: str, ident, response) -> None:
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(kind, ident, response.content)
+        except OSError as e:
+            logger.warning(f"Não foi possível arquivar payload {kind}/{ident}: {e}")
 
     # --- Senado ---
     def sincronizar_atividades_senado(self, proposicao) -> bool:
@@ -26,30 +54,48 @@ class ActivitySyncService:
             return False
 
         try:
-            self.rate_limiter.rate_limit_senado()
             search_url = f"{APIConfig.SENADO_BASE_URL}/processo/{proposicao.sf_id}"
 
-            response = requests.get(search_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(search_url, self.rate_limiter.senado_bucket)
             if response.status_code != 200:
                 logger.warning(f"Erro ao buscar processo {proposicao.sf_id} no Senado: {response.status_code}")
                 return False
 
             data = response.json()
-            atividades_criadas = 0
-
-            for autuacao in data.get('autuacoes', []):
-                for informe in autuacao.get('informesLegislativos', []):
-                    if 'documentosAssociados' in informe:
-                        continue
-                    if self._criar_atividade_senado(proposicao, informe):
-                        atividades_criadas += 1
+            self._archive_payload(PayloadArchive.SENADO_PROCESSO, proposicao.sf_id, response)
+            stats = self.aplicar_atividades_senado(proposicao, data)
 
-            logger.info(f"Sincronizadas {atividades_criadas} atividades do Senado para {proposicao.identificador_completo}")
+            logger.info(
+                f"Sincronizadas atividades do Senado para {proposicao.identificador_completo}: "
+                f"{stats['criadas']} criadas, {stats['atualizadas']} atualizadas, {stats['inalteradas']} inalteradas"
+            )
             return True
         except Exception as e:
             logger.error(f"Erro ao sincronizar atividades do Senado para {proposicao.identificador_completo}: {e}")
             return False
 
+    def aplicar_atividades_senado(self, proposicao, data: Dict) -> Dict[str, int]:
+        """Grava os informes legislativos de um payload `/processo/{id}` do Senado"""
+        from apps.pauta.models import SenadoActivityHistory
+
+        linhas = {}
+        for autuacao in data.get('autuacoes', []):
+            for informe in autuacao.get('informesLegislativos', []):
+                if 'documentosAssociados' in informe:
+                    continue
+                id_informe = informe.get('id')
+                if not id_informe:
+                    continue
+                campos = self._campos_atividade_senado(informe)
+                if campos['data'] is None:
+                    logger.warning(f"Informe {id_informe} sem data válida ignorado")
+                    continue
+                linhas[id_informe] = campos
+
+        return self._upsert_atividades(
+            SenadoActivityHistory, proposicao, 'id_informe', SENADO_ACTIVITY_FIELDS, linhas
+        )
+
     def _processar_data(self, data_str: Optional[str]) -> Optional[str]:
         if not data_str:
             return None
@@ -72,6 +118,22 @@ class ActivitySyncService:
         except Exception:
             return None
 
+    def _campos_atividade_senado(self, informe: Dict) -> Dict:
+        return {
+            'data': self._processar_data(informe.get('data')),
+            'descricao': informe.get('descricao') or '',
+            'colegiado_codigo': self._extrair_valor_nested(informe, 'colegiado', 'codigo'),
+            'colegiado_casa': self._extrair_valor_nested(informe, 'colegiado', 'casa'),
+            'colegiado_sigla': self._extrair_valor_nested(informe, 'colegiado', 'sigla'),
+            'colegiado_nome': self._extrair_valor_nested(informe, 'colegiado', 'nome'),
+            'ente_administrativo_id': self._extrair_valor_nested(informe, 'enteAdministrativo', 'id'),
+            'ente_administrativo_casa': self._extrair_valor_nested(informe, 'enteAdministrativo', 'casa'),
+            'ente_administrativo_sigla': self._extrair_valor_nested(informe, 'enteAdministrativo', 'sigla'),
+            'ente_administrativo_nome': self._extrair_valor_nested(informe, 'enteAdministrativo', 'nome'),
+            'id_situacao_iniciada': informe.get('idSituacaoIniciada'),
+            'sigla_situacao_iniciada': informe.get('siglaSituacaoIniciada'),
+        }
+
     def _criar_atividade_senado(self, proposicao, informe: Dict) -> bool:
         from apps.pauta.models import SenadoActivityHistory
         try:
@@ -79,40 +141,11 @@ class ActivitySyncService:
             if not id_informe:
                 return False
 
-            atividade, created = SenadoActivityHistory.objects.get_or_create(
+            SenadoActivityHistory.objects.update_or_create(
                 proposicao=proposicao,
                 id_informe=id_informe,
-                defaults={
-                    'data': self._processar_data(informe.get('data')),
-                    'descricao': informe.get('descricao', ''),
-                    'colegiado_codigo': self._extrair_valor_nested(informe, 'colegiado', 'codigo'),
-                    'colegiado_casa': self._extrair_valor_nested(informe, 'colegiado', 'casa'),
-                    'colegiado_sigla': self._extrair_valor_nested(informe, 'colegiado', 'sigla'),
-                    'colegiado_nome': self._extrair_valor_nested(informe, 'colegiado', 'nome'),
-                    'ente_administrativo_id': self._extrair_valor_nested(informe, 'enteAdministrativo', 'id'),
-                    'ente_administrativo_casa': self._extrair_valor_nested(informe, 'enteAdministrativo', 'casa'),
-                    'ente_administrativo_sigla': self._extrair_valor_nested(informe, 'enteAdministrativo', 'sigla'),
-                    'ente_administrativo_nome': self._extrair_valor_nested(informe, 'enteAdministrativo', 'nome'),
-                    'id_situacao_iniciada': informe.get('idSituacaoIniciada'),
-                    'sigla_situacao_iniciada': informe.get('siglaSituacaoIniciada'),
-                }
+                defaults=self._campos_atividade_senado(informe),
             )
-
-            if not created:
-                atividade.data = self._processar_data(informe.get('data'))
-                atividade.descricao = informe.get('descricao', '')
-                atividade.colegiado_codigo = self._extrair_valor_nested(informe, 'colegiado', 'codigo')
-                atividade.colegiado_casa = self._extrair_valor_nested(informe, 'colegiado', 'casa')
-                atividade.colegiado_sigla = self._extrair_valor_nested(informe, 'colegiado', 'sigla')
-                atividade.colegiado_nome = self._extrair_valor_nested(informe, 'colegiado', 'nome')
-                atividade.ente_administrativo_id = self._extrair_valor_nested(informe, 'enteAdministrativo', 'id')
-                atividade.ente_administrativo_casa = self._extrair_valor_nested(informe, 'enteAdministrativo', 'casa')
-                atividade.ente_administrativo_sigla = self._extrair_valor_nested(informe, 'enteAdministrativo', 'sigla')
-                atividade.ente_administrativo_nome = self._extrair_valor_nested(informe, 'enteAdministrativo', 'nome')
-                atividade.id_situacao_iniciada = informe.get('idSituacaoIniciada')
-                atividade.sigla_situacao_iniciada = informe.get('siglaSituacaoIniciada')
-                atividade.save()
-
             return True
         except Exception as e:
             logger.error(f"Erro ao criar atividade do Senado: {e}")
@@ -125,26 +158,75 @@ class ActivitySyncService:
             return False
 
         try:
-            self.rate_limiter.rate_limit_camara()
             tramitacoes_url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/{proposicao.cd_id}/tramitacoes"
 
-            response = requests.get(tramitacoes_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(tramitacoes_url, self.rate_limiter.camara_bucket)
             if response.status_code != 200:
                 logger.warning(f"Erro ao buscar tramitações {proposicao.cd_id} na Câmara: {response.status_code}")
                 return False
 
             data = response.json()
-            atividades_criadas = 0
-            for tramitacao in data.get('dados', []):
-                if self._criar_atividade_camara(proposicao, tramitacao):
-                    atividades_criadas += 1
+            self._archive_payload(PayloadArchive.CAMARA_TRAMITACOES, proposicao.cd_id, response)
+            stats = self.aplicar_atividades_camara(proposicao, data)
 
-            logger.info(f"Sincronizadas {atividades_criadas} atividades da Câmara para {proposicao.identificador_completo}")
+            logger.info(
+                f"Sincronizadas atividades da Câmara para {proposicao.identificador_completo}: "
+                f"{stats['criadas']} criadas, {stats['atualizadas']} atualizadas, {stats['inalteradas']} inalteradas"
+            )
             return True
         except Exception as e:
             logger.error(f"Erro ao sincronizar atividades da Câmara para {proposicao.identificador_completo}: {e}")
             return False
 
+    def aplicar_atividades_camara(self, proposicao, data: Dict) -> Dict[str, int]:
+        """Grava as tramitações de um payload `/proposicoes/{id}/tramitacoes` da Câmara"""
+        from apps.pauta.models import CamaraActivityHistory
+
+        linhas = {}
+        for tramitacao in data.get('dados', []):
+            sequencia = tramitacao.get('sequencia')
+            if not sequencia:
+                continue
+            campos = self._campos_atividade_camara(tramitacao)
+            if campos['data_hora'] is None:
+                logger.warning(f"Tramitação {sequencia} sem data válida ignorada")
+                continue
+            linhas[sequencia] = campos
+
+        return self._upsert_atividades(
+            CamaraActivityHistory, proposicao, 'sequencia', CAMARA_ACTIVITY_FIELDS, linhas
+        )
+
+    def _processar_data_hora(self, data_hora_str: Optional[str]):
+        if not data_hora_str:
+            return None
+        try:
+            if 'T' in data_hora_str:
+                naive_datetime = datetime.strptime(data_hora_str, '%Y-%m-%dT%H:%M')
+            else:
+                naive_datetime = datetime.strptime(data_hora_str, '%Y-%m-%d')
+            return timezone.make_aware(naive_datetime, timezone=timezone.get_current_timezone())
+        except ValueError:
+            logger.warning(f"Formato de data inválido: {data_hora_str}")
+            return None
+
+    def _campos_atividade_camara(self, tramitacao: Dict) -> Dict:
+        return {
+            'data_hora': self._processar_data_hora(tramitacao.get('dataHora')),
+            'sigla_orgao': tramitacao.get('siglaOrgao') or '',
+            'uri_orgao': tramitacao.get('uriOrgao'),
+            'uri_ultimo_relator': tramitacao.get('uriUltimoRelator'),
+            'regime': tramitacao.get('regime'),
+            'descricao_tramitacao': tramitacao.get('descricaoTramitacao') or '',
+            'cod_tipo_tramitacao': tramitacao.get('codTipoTramitacao') or '',
+            'descricao_situacao': tramitacao.get('descricaoSituacao'),
+            'cod_situacao': tramitacao.get('codSituacao'),
+            'despacho': tramitacao.get('despacho') or '',
+            'url': tramitacao.get('url'),
+            'ambito': tramitacao.get('ambito'),
+            'apreciacao': tramitacao.get('apreciacao'),
+        }
+
     def _criar_atividade_camara(self, proposicao, tramitacao: Dict) -> bool:
         from apps.pauta.models import CamaraActivityHistory
         try:
@@ -152,57 +234,65 @@ class ActivitySyncService:
             if not sequencia:
                 return False
 
-            data_hora_str = tramitacao.get('dataHora')
-            data_hora = None
-            if data_hora_str:
-                try:
-                    if 'T' in data_hora_str:
-                        naive_datetime = datetime.strptime(data_hora_str, '%Y-%m-%dT%H:%M')
-                    else:
-                        naive_datetime = datetime.strptime(data_hora_str, '%Y-%m-%d')
-                    data_hora = timezone.make_aware(naive_datetime, timezone=timezone.get_current_timezone())
-                except ValueError:
-                    logger.warning(f"Formato de data inválido: {data_hora_str}")
-
-            atividade, created = CamaraActivityHistory.objects.get_or_create(
+            CamaraActivityHistory.objects.update_or_create(
                 proposicao=proposicao,
                 sequencia=sequencia,
-                defaults={
-                    'data_hora': data_hora,
-                    'sigla_orgao': tramitacao.get('siglaOrgao', ''),
-                    'uri_orgao': tramitacao.get('uriOrgao'),
-                    'uri_ultimo_relator': tramitacao.get('uriUltimoRelator'),
-                    'regime': tramitacao.get('regime'),
-                    'descricao_tramitacao': tramitacao.get('descricaoTramitacao', ''),
-                    'cod_tipo_tramitacao': tramitacao.get('codTipoTramitacao', ''),
-                    'descricao_situacao': tramitacao.get('descricaoSituacao'),
-                    'cod_situacao': tramitacao.get('codSituacao'),
-                    'despacho': tramitacao.get('despacho', ''),
-                    'url': tramitacao.get('url'),
-                    'ambito': tramitacao.get('ambito'),
-                    'apreciacao': tramitacao.get('apreciacao'),
-                }
+                defaults=self._campos_atividade_camara(tramitacao),
             )
-
-            if not created:
-                atividade.data_hora = data_hora
-                atividade.sigla_orgao = tramitacao.get('siglaOrgao', '')
-                atividade.uri_orgao = tramitacao.get('uriOrgao')
-                atividade.uri_ultimo_relator = tramitacao.get('uriUltimoRelator')
-                atividade.regime = tramitacao.get('regime')
-                atividade.descricao_tramitacao = tramitacao.get('descricaoTramitacao', '')
-                atividade.cod_tipo_tramitacao = tramitacao.get('codTipoTramitacao', '')
-                atividade.descricao_situacao = tramitacao.get('descricaoSituacao')
-                atividade.cod_situacao = tramitacao.get('codSituacao')
-                atividade.despacho = tramitacao.get('despacho', '')
-                atividade.url = tramitacao.get('url')
-                atividade.ambito = tramitacao.get('ambito')
-                atividade.apreciacao = tramitacao.get('apreciacao')
-                atividade.save()
-
             return True
         except Exception as e:
             logger.error(f"Erro ao criar atividade da Câmara: {e}")
             return False
 
+    # --- Gravação em lote ---
+    def _upsert_atividades(self, model, proposicao, chave: str, campos: list,
+                           linhas: Dict[int, Dict]) -> Dict[str, int]:
+        """
+        Grava o histórico completo de uma proposição com um único upsert.
+
+        Compara as linhas recebidas com as existentes (uma consulta) e envia
+        para `bulk_create(update_conflicts=True)` apenas as novas e as que
+        mudaram, tudo em uma transação. Como `bulk_create` não dispara
+        `post_save`, os campos derivados são recalculados uma única vez ao
+        final (ou ao fim de `deferred_derived_fields`), se algo foi gravado.
+
+        Returns:
+            Dict com as contagens 'criadas', 'atualizadas' e 'inalteradas'
+        """
+        stats = {'criadas': 0, 'atualizadas': 0, 'inalteradas': 0}
+        if not linhas:
+            return stats
+
+        to_python = {nome: model._meta.get_field(nome).to_python for nome in campos}
+        existentes = {
+            row[chave]: row
+            for row in model.objects.filter(proposicao=proposicao, **{f'{chave}__in': list(linhas)})
+                                    .values(chave, *campos)
+        }
+
+        objetos = []
+        for valor_chave, valores in linhas.items():
+            valores = {nome: to_python[nome](valor) for nome, valor in valores.items()}
+            atual = existentes.get(valor_chave)
+            if atual is None:
+                stats['criadas'] += 1
+            elif any(atual[nome] != valores[nome] for nome in campos):
+                stats['atualizadas'] += 1
+            else:
+                stats['inalteradas'] += 1
+                continue
+            objetos.append(model(proposicao=proposicao, **{chave: valor_chave}, **valores))
+
+        if objetos:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    objetos,
+                    update_conflicts=True,
+                    unique_fields=['proposicao', chave],
+                    update_fields=campos + ['updated_at'],
+                )
+
+            bump_data_version()
+            request_derived_fields_update(proposicao)
 
+        return stats
@@ -1,5 +1,17 @@
+import os
 import time
 import logging
+import threading
+from typing import Dict, Optional
+from decouple import config
+from django.conf import settings
+
+from apps.core.metrics import RATE_LIMITER_RATE, RATE_LIMITER_WAIT
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -19,34 +31,238 @@ class APIConfig:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
-    # Rate limiting
+    # Rate limiting (taxa inicial; ajustada em tempo de execução via AIMD)
     SENADO_RATE_LIMIT = 10  # requisições por segundo
     CAMARA_RATE_LIMIT = 15  # requisições por segundo
+    SENADO_RATE_LIMIT_MAX = config('SENADO_RATE_LIMIT_MAX', default=20.0, cast=float)  # teto da sondagem
+    CAMARA_RATE_LIMIT_MAX = config('CAMARA_RATE_LIMIT_MAX', default=30.0, cast=float)  # teto da sondagem
+    RATE_LIMIT_MIN = 0.5  # piso em requisições por segundo
+    RATE_ADDITIVE_STEP = config('API_RATE_ADDITIVE_STEP', default=0.1, cast=float)  # req/s por resposta OK
+    RATE_DECREASE_FACTOR = 0.5  # em 429/503/erro de conexão
+    RATE_LATENCY_THRESHOLD = config('API_RATE_LATENCY_THRESHOLD', default=5.0, cast=float)  # segundos
+    RATE_LATENCY_DECREASE_FACTOR = 0.9  # em respostas lentas
+    SENADO_RATE_BURST = config('SENADO_RATE_BURST', default=10, cast=int)  # capacidade do bucket
+    CAMARA_RATE_BURST = config('CAMARA_RATE_BURST', default=15, cast=int)  # capacidade do bucket
+    
+    # Diretório dos arquivos de estado dos buckets. Quando definido, o limite
+    # passa a ser compartilhado por todos os processos da máquina (flock).
+    RATE_LIMIT_STATE_DIR = config('API_RATE_LIMIT_STATE_DIR', default='')
+    
+    # Pool de conexões HTTP (uma sessão keep-alive por host upstream)
+    HTTP_POOL_SIZE = config('API_HTTP_POOL_SIZE', default=10, cast=int)
+    HTTP_CONNECT_TIMEOUT = config('API_HTTP_CONNECT_TIMEOUT', default=5.0, cast=float)  # segundos
+    HTTP_READ_TIMEOUT = config('API_HTTP_READ_TIMEOUT', default=30.0, cast=float)  # segundos
+    
+    # Erros de servidor retentados por `HTTPSessionPool.fetch` após backoff, sem
+    # reduzir a taxa (429 e 503 são sobrecarga: tratados pelo controle adaptativo)
+    HTTP_BACKOFF_FACTOR = config('API_HTTP_BACKOFF_FACTOR', default=0.5, cast=float)
+    HTTP_RETRY_STATUS = (500, 502, 504)
+    
+    # Tentativas extras por requisição (429/503/5xx/erros de conexão), cada uma
+    # consumindo um token do bucket; o adapter do urllib3 não retenta. Limite do Retry-After
+    HTTP_THROTTLE_STATUS = (429, 503)
+    HTTP_ADAPTIVE_RETRIES = config('API_HTTP_ADAPTIVE_RETRIES', default=4, cast=int)
+    HTTP_MAX_RETRY_AFTER = 120  # segundos
+    
+    # Cache em disco das respostas (vazio desativa). Entradas vencidas são
+    # revalidadas com ETag / Last-Modified quando o upstream os fornece.
+    HTTP_CACHE_DIR = config(
+        'API_HTTP_CACHE_DIR',
+        default='' if settings.TESTING else str(settings.BASE_DIR / 'var' / 'http_cache')
+    )
+    HTTP_CACHE_MAX_BYTES = config('API_HTTP_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+    HTTP_CACHE_DEFAULT_TTL = 3600  # segundos
+    HTTP_CACHE_TTLS = (  # (regex da URL, TTL em segundos); primeira correspondência vence
+        (r'/deputados/\d+$', 7 * 24 * 3600),
+        (r'/proposicoes/\d+/autores$', 24 * 3600),
+        (r'/proposicoes/\d+/tramitacoes$', 6 * 3600),
+        (r'/processo/\d+/informesLegislativos$', 6 * 3600),
+        (r'/processo/\d+$', 6 * 3600),
+        (r'/proposicoes/\d+$', 12 * 3600),
+        (r'/(processo|proposicoes)$', 12 * 3600),
+    )
+    
+    # Arquivo endereçado por conteúdo dos payloads brutos (vazio desativa)
+    PAYLOAD_ARCHIVE_DIR = config(
+        'API_PAYLOAD_ARCHIVE_DIR',
+        default='' if settings.TESTING else str(settings.BASE_DIR / 'var' / 'archive')
+    )
+    
+    # Sincronização em lote
+    SYNC_WORKERS = config('SYNC_WORKERS', default=1, cast=int)  # proposições em paralelo
+    SYNC_RETRY_PASSES = config('SYNC_RETRY_PASSES', default=1, cast=int)  # repescagem de falhas no mesmo lote
+    
+    @classmethod
+    def http_timeout(cls):
+        """Timeout (connect, read) usado nas requisições às APIs"""
+        return (cls.HTTP_CONNECT_TIMEOUT, cls.HTTP_READ_TIMEOUT)
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe com capacidade de rajada e taxa adaptativa.
+    
+    Os tokens são repostos continuamente a `rate` por segundo até `capacity`.
+    Cada requisição consome um token; quando não há saldo, o token é reservado
+    (saldo negativo) e quem chamou dorme fora do lock até a sua vez, o que
+    mantém a ordem de chegada entre threads.
+    
+    A taxa segue AIMD: `reward()` soma um passo fixo a cada resposta saudável
+    (até `max_rate`) e `penalize()` multiplica a taxa por um fator < 1 quando o
+    upstream sinaliza sobrecarga, suspendendo o bucket pelo `Retry-After`.
+    
+    Se `state_dir` for informado, o estado fica em um arquivo protegido por
+    `flock`, permitindo que vários processos dividam o mesmo orçamento.
+    """
+    
+    def __init__(self, name: str, rate: float, capacity: int, state_dir: Optional[str] = None,
+                 max_rate: Optional[float] = None, min_rate: Optional[float] = None):
+        self.name = name
+        self.capacity = float(max(1, capacity))
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = float(min_rate or APIConfig.RATE_LIMIT_MIN)
+        self._lock = threading.Lock()
+        self._state = {
+            'tokens': self.capacity,
+            'updated': time.time(),
+            'rate': float(rate),
+            'blocked_until': 0.0,
+        }
+        self._state_file = None
+        
+        if state_dir:
+            if fcntl is None:
+                logger.warning(f"flock indisponível; rate limit '{name}' restrito ao processo atual")
+            else:
+                os.makedirs(state_dir, exist_ok=True)
+                path = os.path.join(state_dir, f"{name}.bucket")
+                self._state_file = open(path, 'a+')
+    
+    @property
+    def rate(self) -> float:
+        return self._state['rate']
+    
+    def _update(self, func):
+        """Aplica `func` ao estado sob lock (de thread e, se houver, de arquivo)"""
+        with self._lock:
+            fh = self._state_file
+            if fh is None:
+                return func(self._state)
+            
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                fh.seek(0)
+                raw = fh.read().split()
+                if len(raw) == 4:
+                    self._state = dict(zip(('tokens', 'updated', 'rate', 'blocked_until'), map(float, raw)))
+                result = func(self._state)
+                fh.seek(0)
+                fh.truncate()
+                fh.write(' '.join(str(self._state[k]) for k in ('tokens', 'updated', 'rate', 'blocked_until')))
+                fh.flush()
+                return result
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+    
+    def _reserve(self, state: Dict) -> float:
+        now = time.time()
+        # max() protege contra relógio de parede retrocedendo
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self.capacity, state['tokens'] + elapsed * state['rate']) - 1
+        state['updated'] = now
+        
+        wait = -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+        return max(wait, state['blocked_until'] - now)
+    
+    def acquire(self) -> float:
+        """
+        Consome um token, bloqueando até que ele esteja disponível.
+        
+        Returns:
+            Tempo de espera em segundos
+        """
+        wait = self._update(self._reserve)
+        RATE_LIMITER_WAIT.observe(wait, bucket=self.name)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def reward(self, latency: Optional[float] = None):
+        """
+        Registra uma resposta saudável: aumento aditivo da taxa, ou leve
+        redução se a latência indicar que o upstream está saturando.
+        """
+        def apply(state):
+            if latency is not None and latency > APIConfig.RATE_LATENCY_THRESHOLD:
+                state['rate'] = max(self.min_rate, state['rate'] * APIConfig.RATE_LATENCY_DECREASE_FACTOR)
+            else:
+                state['rate'] = min(self.max_rate, state['rate'] + APIConfig.RATE_ADDITIVE_STEP)
+        self._update(apply)
+        RATE_LIMITER_RATE.set(self.rate, bucket=self.name)
+    
+    def penalize(self, pause: float = 0.0):
+        """
+        Registra sobrecarga do upstream (429/503/erro de conexão): redução
+        multiplicativa da taxa e suspensão do bucket por `pause` segundos.
+        """
+        def apply(state):
+            previous = state['rate']
+            state['rate'] = max(self.min_rate, previous * APIConfig.RATE_DECREASE_FACTOR)
+            state['blocked_until'] = max(state['blocked_until'], time.time() + pause)
+            return previous
+        previous = self._update(apply)
+        RATE_LIMITER_RATE.set(self.rate, bucket=self.name)
+        logger.warning(
+            f"Rate limit '{self.name}' reduzido de {previous:.2f} para {self.rate:.2f} req/s "
+            f"(pausa de {pause:.1f}s)"
+        )
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(name: str) -> TokenBucket:
+    """
+    Retorna o bucket compartilhado do processo para a casa informada
+    ('senado' ou 'camara').
+    """
+    bucket = _buckets.get(name)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(name)
+            if bucket is None:
+                if name == 'senado':
+                    rate, capacity, max_rate = (APIConfig.SENADO_RATE_LIMIT, APIConfig.SENADO_RATE_BURST,
+                                                APIConfig.SENADO_RATE_LIMIT_MAX)
+                elif name == 'camara':
+                    rate, capacity, max_rate = (APIConfig.CAMARA_RATE_LIMIT, APIConfig.CAMARA_RATE_BURST,
+                                                APIConfig.CAMARA_RATE_LIMIT_MAX)
+                else:
+                    raise ValueError(f"Bucket de rate limit desconhecido: {name}")
+                bucket = TokenBucket(name, rate, capacity, APIConfig.RATE_LIMIT_STATE_DIR or None,
+                                     max_rate=max_rate)
+                _buckets[name] = bucket
+    return bucket
 
 
 class RateLimiter:
     """
     Controle de rate limiting compartilhado para as APIs.
+    
+    Todas as instâncias delegam para os mesmos token buckets do processo
+    (e, com `RATE_LIMIT_STATE_DIR`, da máquina), de modo que fetcher e
+    sincronização de atividades dividem o orçamento de cada casa.
     """
     
     def __init__(self):
-        self.last_senado_request = 0
-        self.last_camara_request = 0
+        self.senado_bucket = get_token_bucket('senado')
+        self.camara_bucket = get_token_bucket('camara')
     
     def rate_limit_senado(self):
         """Aplica rate limiting para a API do Senado"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_senado_request
-        if time_since_last < (1.0 / APIConfig.SENADO_RATE_LIMIT):
-            sleep_time = (1.0 / APIConfig.SENADO_RATE_LIMIT) - time_since_last
-            time.sleep(sleep_time)
-        self.last_senado_request = time.time()
+        return self.senado_bucket.acquire()
     
     def rate_limit_camara(self):
         """Aplica rate limiting para a API da Câmara"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_camara_request
-        if time_since_last < (1.0 / APIConfig.CAMARA_RATE_LIMIT):
-            sleep_time = (1.0 / APIConfig.CAMARA_RATE_LIMIT) - time_since_last
-            time.sleep(sleep_time)
-        self.last_camara_request = time.time()
+        return self.camara_bucket.acquire()
@@ -2,10 +2,21 @@ import requests
 import logging
 from typing import Dict, Optional, List
 from .api_config import APIConfig, RateLimiter
+from .http_client import get_http_pool
+from .payload_archive import PayloadArchive, get_payload_archive
 
 logger = logging.getLogger(__name__)
 
 
+class UpstreamUnavailableError(Exception):
+    """
+    Transient upstream failure: network error, or a 429/5xx response after
+    the HTTP pool ran out of retries. Unlike a 404 or an empty search, it says
+    nothing about whether the proposição exists, so it must not be recorded as
+    'NOT FOUND' and the proposição stays eligible for retry.
+    """
+
+
 class DataFetcherService:
     """
     Pure data fetching service for external APIs.
@@ -14,11 +25,30 @@ class DataFetcherService:
     - Make HTTP requests to Senado and Câmara APIs
     - Handle rate limiting and error handling
     - Return raw API responses without processing
+    - Archive raw payloads for offline reprocessing
     - No business logic or data transformation
     """
     
     def __init__(self):
         self.rate_limiter = RateLimiter()
+        self.http = get_http_pool()
+        self.archive = get_payload_archive()
+    
+    def _archive_payload(self, kind: str, ident, response) -> None:
+        """Store the raw response body in the payload archive, if enabled."""
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(kind, ident, response.content)
+        except OSError as e:
+            logger.warning(f"Could not archive {kind} payload for {ident}: {e}")
+    
+    def _raise_if_unavailable(self, response) -> None:
+        """Raise UpstreamUnavailableError for throttled or server-error responses."""
+        if response.status_code in APIConfig.HTTP_THROTTLE_STATUS or response.status_code >= 500:
+            raise UpstreamUnavailableError(
+                f"{response.status_code} from {response.url}"
+            )
     
     def fetch_proposicao_senado(self, tipo: str, numero: int, ano: int) -> Optional[List[Dict]]:
         """
@@ -30,10 +60,11 @@ class DataFetcherService:
             ano: Ano da proposição
             
         Returns:
-            Raw API response data or None if error/not found
+            Raw API response data or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_senado()
-        
         search_url = f"{APIConfig.SENADO_BASE_URL}/processo"
         
         params = {
@@ -43,24 +74,23 @@ class DataFetcherService:
         }
         
         try:
-            response = requests.get(
-                search_url, 
-                params=params,
-                headers=APIConfig.DEFAULT_HEADERS, 
-                timeout=30
-            )
+            response = self.http.fetch(search_url, self.rate_limiter.senado_bucket, params=params)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(
+                    PayloadArchive.SENADO_BUSCA, PayloadArchive.proposicao_ident(tipo, numero, ano), response
+                )
                 logger.info(f"Successfully fetched Senado data for {tipo} {numero}/{ano}")
                 return data if isinstance(data, list) else None
             else:
                 logger.warning(f"Senado API returned status {response.status_code} for {tipo} {numero}/{ano}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Senado data for {tipo} {numero}/{ano}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_proposicao_camara_search(self, tipo: str, numero: int, ano: int) -> Optional[Dict]:
         """
@@ -72,10 +102,11 @@ class DataFetcherService:
             ano: Ano da proposição
             
         Returns:
-            Raw search API response or None if error/not found
+            Raw search API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_camara()
-        
         search_url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes"
         
         params = {
@@ -85,24 +116,23 @@ class DataFetcherService:
         }
         
         try:
-            response = requests.get(
-                search_url, 
-                params=params, 
-                headers=APIConfig.DEFAULT_HEADERS, 
-                timeout=30
-            )
+            response = self.http.fetch(search_url, self.rate_limiter.camara_bucket, params=params)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(
+                    PayloadArchive.CAMARA_BUSCA, PayloadArchive.proposicao_ident(tipo, numero, ano), response
+                )
                 logger.info(f"Successfully fetched Câmara search data for {tipo} {numero}/{ano}")
                 return data
             else:
                 logger.warning(f"Câmara search API returned status {response.status_code} for {tipo} {numero}/{ano}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Câmara search data for {tipo} {numero}/{ano}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_proposicao_camara_details(self, cd_id: int) -> Optional[Dict]:
         """
@@ -112,26 +142,29 @@ class DataFetcherService:
             cd_id: Câmara proposição ID
             
         Returns:
-            Raw details API response or None if error/not found
+            Raw details API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_camara()
-        
         details_url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/{cd_id}"
         
         try:
-            response = requests.get(details_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(details_url, self.rate_limiter.camara_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(PayloadArchive.CAMARA_DETALHES, cd_id, response)
                 logger.info(f"Successfully fetched Câmara details for ID {cd_id}")
                 return data
             else:
                 logger.warning(f"Câmara details API returned status {response.status_code} for ID {cd_id}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Câmara details for ID {cd_id}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_proposicao_camara_authors(self, cd_id: int) -> Optional[Dict]:
         """
@@ -141,26 +174,29 @@ class DataFetcherService:
             cd_id: Câmara proposição ID
             
         Returns:
-            Raw authors API response or None if error/not found
+            Raw authors API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_camara()
-        
         authors_url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/{cd_id}/autores"
         
         try:
-            response = requests.get(authors_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(authors_url, self.rate_limiter.camara_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(PayloadArchive.CAMARA_AUTORES, cd_id, response)
                 logger.info(f"Successfully fetched Câmara authors for ID {cd_id}")
                 return data
             else:
                 logger.warning(f"Câmara authors API returned status {response.status_code} for ID {cd_id}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Câmara authors for ID {cd_id}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_deputado_details(self, uri: str) -> Optional[Dict]:
         """
@@ -170,24 +206,27 @@ class DataFetcherService:
             uri: Deputado URI from API
             
         Returns:
-            Raw deputado API response or None if error/not found
+            Raw deputado API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_camara()
-        
         try:
-            response = requests.get(uri, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(uri, self.rate_limiter.camara_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(PayloadArchive.CAMARA_DEPUTADO, uri.rstrip('/').rsplit('/', 1)[-1], response)
                 logger.info(f"Successfully fetched deputado details from {uri}")
                 return data
             else:
                 logger.warning(f"Deputado details API returned status {response.status_code} for {uri}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching deputado details from {uri}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_atividades_senado(self, sf_id: int) -> Optional[Dict]:
         """
@@ -197,26 +236,29 @@ class DataFetcherService:
             sf_id: Senado proposição ID
             
         Returns:
-            Raw activity API response or None if error/not found
+            Raw activity API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_senado()
-        
         activities_url = f"{APIConfig.SENADO_BASE_URL}/processo/{sf_id}/informesLegislativos"
         
         try:
-            response = requests.get(activities_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(activities_url, self.rate_limiter.senado_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(PayloadArchive.SENADO_INFORMES, sf_id, response)
                 logger.info(f"Successfully fetched Senado activities for ID {sf_id}")
                 return data
             else:
                 logger.warning(f"Senado activities API returned status {response.status_code} for ID {sf_id}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Senado activities for ID {sf_id}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
     
     def fetch_atividades_camara(self, cd_id: int) -> Optional[Dict]:
         """
@@ -226,23 +268,26 @@ class DataFetcherService:
             cd_id: Câmara proposição ID
             
         Returns:
-            Raw activity API response or None if error/not found
+            Raw activity API response or None if not found
+
+        Raises:
+            UpstreamUnavailableError: on network errors or throttled/5xx responses
         """
-        self.rate_limiter.rate_limit_camara()
-        
         activities_url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/{cd_id}/tramitacoes"
         
         try:
-            response = requests.get(activities_url, headers=APIConfig.DEFAULT_HEADERS, timeout=30)
+            response = self.http.fetch(activities_url, self.rate_limiter.camara_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                self._archive_payload(PayloadArchive.CAMARA_TRAMITACOES, cd_id, response)
                 logger.info(f"Successfully fetched Câmara activities for ID {cd_id}")
                 return data
             else:
                 logger.warning(f"Câmara activities API returned status {response.status_code} for ID {cd_id}")
+                self._raise_if_unavailable(response)
                 return None
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error fetching Câmara activities for ID {cd_id}: {e}")
-            return None
+            raise UpstreamUnavailableError(str(e)) from e
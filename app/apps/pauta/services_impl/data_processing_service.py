@@ -1,11 +1,54 @@
 import logging
+import threading
+from contextlib import contextmanager
 from typing import Optional, Dict, List
 from datetime import datetime
-from django.db.models import Max, Min
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
 from django.utils import timezone
 
+from apps.pauta.data_version import batched_data_version, bump_data_version
+
 logger = logging.getLogger(__name__)
 
+# Proposições com campos derivados pendentes, por thread (None = sem adiamento)
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_derived_fields():
+    """
+    Adia o recálculo de campos derivados até o fim do bloco.
+
+    Dentro do bloco, gravações no histórico de atividades apenas registram a
+    proposição afetada; ao sair, `update_derived_fields` roda uma única vez
+    por proposição. Blocos aninhados são absorvidos pelo mais externo.
+    Fora dele (ex.: admin), o recálculo continua imediato. Os incrementos da
+    versão dos dados também são agrupados (`batched_data_version`).
+    """
+    if getattr(_deferred, 'pending', None) is not None:
+        yield
+        return
+
+    _deferred.pending = {}
+    with batched_data_version():
+        try:
+            yield
+        finally:
+            pending, _deferred.pending = _deferred.pending, None
+            processor = DataProcessingService()
+            for proposicao in pending.values():
+                processor.update_derived_fields(proposicao)
+
+
+def request_derived_fields_update(proposicao) -> None:
+    """Recalcula os campos derivados agora ou, dentro de `deferred_derived_fields`, ao final do bloco"""
+    pending = getattr(_deferred, 'pending', None)
+    if pending is not None:
+        pending[proposicao.pk] = proposicao
+    else:
+        DataProcessingService().update_derived_fields(proposicao)
+
 
 class DataProcessingService:
     """
@@ -38,23 +81,11 @@ class DataProcessingService:
                 .get('ultima')
             )
 
-            novo_current_house: Optional[str] = None
-            if ultima_sf and ultima_cd:
-                # Comparar datas para decidir a casa com atividade mais recente
-                # Convert datetime to date for proper comparison
-                ultima_cd_date = ultima_cd.date() if hasattr(ultima_cd, 'date') else ultima_cd
-                if ultima_cd_date > ultima_sf:
-                    novo_current_house = 'CD'
-                else:
-                    novo_current_house = 'SF'
-            elif ultima_cd:
-                novo_current_house = 'CD'
-            elif ultima_sf:
-                novo_current_house = 'SF'
+            novo_current_house = self._casa_atual(ultima_sf, ultima_cd)
 
             if novo_current_house and proposicao.current_house != novo_current_house:
                 proposicao.current_house = novo_current_house
-                proposicao.save(update_fields=['current_house'])
+                proposicao.save(update_fields=['current_house', 'updated_at'])
                 logger.info(
                     f"Atualizado current_house de {proposicao.identificador_completo} para {novo_current_house}"
                 )
@@ -73,17 +104,10 @@ class DataProcessingService:
                     .aggregate(primeira=Min('data_hora'))
                     .get('primeira')
                 )
-                # Converter datetime -> date quando necessário
-                if primeira_cd_date:
-                    primeira_cd = primeira_cd_date.date()
-                else:
-                    primeira_cd = None
-
-                candidates = [d for d in [primeira_sf, primeira_cd] if d is not None]
-                if candidates:
-                    nova_data = min(candidates)
+                nova_data = self._data_mais_antiga(primeira_sf, primeira_cd_date)
+                if nova_data:
                     proposicao.data_apresentacao = nova_data
-                    proposicao.save(update_fields=['data_apresentacao'])
+                    proposicao.save(update_fields=['data_apresentacao', 'updated_at'])
                     logger.info(
                         f"Backfill data_apresentacao de {proposicao.identificador_completo} para {nova_data}"
                     )
@@ -93,27 +117,145 @@ class DataProcessingService:
             logger.error(f"Erro ao atualizar campos derivados de {proposicao}: {e}")
             return False
 
+    @staticmethod
+    def _casa_atual(ultima_sf, ultima_cd) -> Optional[str]:
+        """Casa com a atividade mais recente (empate fica com o Senado)"""
+        if ultima_sf and ultima_cd:
+            # Convert datetime to date for proper comparison
+            ultima_cd_date = ultima_cd.date() if hasattr(ultima_cd, 'date') else ultima_cd
+            return 'CD' if ultima_cd_date > ultima_sf else 'SF'
+        if ultima_cd:
+            return 'CD'
+        if ultima_sf:
+            return 'SF'
+        return None
+
+    @staticmethod
+    def _data_mais_antiga(primeira_sf, primeira_cd):
+        """Data da atividade mais antiga conhecida nas duas casas"""
+        if primeira_cd and hasattr(primeira_cd, 'date'):
+            primeira_cd = primeira_cd.date()
+        candidates = [d for d in [primeira_sf, primeira_cd] if d is not None]
+        return min(candidates) if candidates else None
+
+    def recompute_derived_fields(self, queryset=None, dry_run: bool = False,
+                                 batch_size: int = 1000) -> Dict:
+        """
+        Recalcula current_house e data_apresentacao de várias proposições em lote.
+
+        As datas extremas de cada casa vêm de subconsultas agregadas anotadas
+        em uma única consulta; as proposições alteradas são gravadas com
+        `bulk_update`. O resultado é o mesmo de `update_derived_fields`
+        aplicado a cada proposição.
+
+        Args:
+            queryset: Proposições a recalcular (padrão: todas)
+            dry_run: Apenas calcula as alterações, sem gravar
+            batch_size: Tamanho dos lotes de leitura e de `bulk_update`
+
+        Returns:
+            Dict com 'total', 'com_atividades' e 'alteracoes' (lista com
+            id, identificador e valores antes/depois dos campos alterados)
+        """
+        from apps.pauta.models import Proposicao, SenadoActivityHistory, CamaraActivityHistory
+
+        def extremo(model, campo, func):
+            return Subquery(
+                model.objects
+                .filter(proposicao=OuterRef('pk'))
+                .order_by()
+                .values('proposicao')
+                .annotate(valor=func(campo))
+                .values('valor')[:1]
+            )
+
+        if queryset is None:
+            queryset = Proposicao.objects.all()
+
+        rows = (
+            queryset
+            .order_by('pk')
+            .annotate(
+                ultima_sf=extremo(SenadoActivityHistory, 'data', Max),
+                ultima_cd=extremo(CamaraActivityHistory, 'data_hora', Max),
+                primeira_sf=extremo(SenadoActivityHistory, 'data', Min),
+                primeira_cd=extremo(CamaraActivityHistory, 'data_hora', Min),
+            )
+            .values(
+                'pk', 'tipo', 'numero', 'ano', 'current_house', 'data_apresentacao',
+                'ultima_sf', 'ultima_cd', 'primeira_sf', 'primeira_cd',
+            )
+        )
+
+        total = 0
+        com_atividades = 0
+        alteracoes = []
+        objetos = []
+        agora = timezone.now()
+
+        for row in rows.iterator(chunk_size=batch_size):
+            total += 1
+            casa = self._casa_atual(row['ultima_sf'], row['ultima_cd'])
+            if casa is None:
+                continue
+            com_atividades += 1
+
+            alteracao = {}
+            if row['current_house'] != casa:
+                alteracao['current_house'] = (row['current_house'], casa)
+            if not row['data_apresentacao']:
+                data = self._data_mais_antiga(row['primeira_sf'], row['primeira_cd'])
+                if data:
+                    alteracao['data_apresentacao'] = (None, data)
+            if not alteracao:
+                continue
+
+            alteracoes.append({
+                'id': row['pk'],
+                'identificador': f"{row['tipo']} {row['numero']}/{row['ano']}",
+                **alteracao,
+            })
+            objetos.append(Proposicao(
+                pk=row['pk'],
+                current_house=casa,
+                data_apresentacao=alteracao.get('data_apresentacao', (None, row['data_apresentacao']))[1],
+                updated_at=agora,
+            ))
+
+        if objetos and not dry_run:
+            with transaction.atomic():
+                Proposicao.objects.bulk_update(
+                    objetos, ['current_house', 'data_apresentacao', 'updated_at'], batch_size=batch_size
+                )
+            bump_data_version()
+            logger.info(f"Campos derivados recalculados em lote: {len(objetos)} de {total} proposições alteradas")
+
+        return {'total': total, 'com_atividades': com_atividades, 'alteracoes': alteracoes}
+
     def processar_todas_proposicoes(self, limit: Optional[int] = None) -> Dict[str, int]:
         """
         Executa processamento de campos derivados para várias proposições.
         """
         from apps.pauta.models import Proposicao
 
-        qs = Proposicao.objects.all().order_by('created_at')
+        qs = Proposicao.objects.all()
         if limit:
-            qs = qs[:limit]
+            ids = list(qs.order_by('created_at').values_list('pk', flat=True)[:limit])
+            qs = qs.filter(pk__in=ids)
 
-        total = qs.count()
-        sucesso = 0
-        erros = 0
-
-        for prop in qs:
-            if self.update_derived_fields(prop):
-                sucesso += 1
-            else:
-                erros += 1
+        try:
+            stats = self.recompute_derived_fields(qs)
+        except Exception as e:
+            logger.error(f"Erro ao recalcular campos derivados em lote: {e}")
+            total = qs.count()
+            return {'total': total, 'sucesso': 0, 'erros': total, 'atualizadas': 0}
 
-        return {'total': total, 'sucesso': sucesso, 'erros': erros}
+        return {
+            'total': stats['total'],
+            'sucesso': stats['total'],
+            'erros': 0,
+            'atualizadas': len(stats['alteracoes']),
+        }
     
     def process_senado_raw_data(self, raw_data: List[Dict], tipo: str, numero: int, ano: int) -> Optional[Dict]:
         """
@@ -215,7 +357,8 @@ class DataProcessingService:
             logger.error(f"Error processing Câmara response: {e}")
             return None
     
-    def process_proposicao_sync_data(self, proposicao, senado_data: Optional[Dict], camara_data: Optional[Dict]) -> bool:
+    def process_proposicao_sync_data(self, proposicao, senado_data: Optional[Dict], camara_data: Optional[Dict],
+                                     mark_synced: bool = True) -> bool:
         """
         Process and apply sync data to a proposição.
         
@@ -223,6 +366,8 @@ class DataProcessingService:
             proposicao: Proposicao instance
             senado_data: Processed Senado data
             camara_data: Processed Câmara data
+            mark_synced: Update sync status fields (False when reprocessing
+                archived payloads, which says nothing about the live APIs)
             
         Returns:
             True if data was found and applied, False otherwise
@@ -272,6 +417,9 @@ class DataProcessingService:
             
             # Check if proposition was found in any API
             if not encontrou_dados:
+                if not mark_synced:
+                    logger.warning(f"No archived data for {proposicao.identificador_completo}")
+                    return False
                 # Proposition not found in any API
                 proposicao.ultima_sincronizacao = None
                 proposicao.erro_sincronizacao = 'NOT FOUND'
@@ -280,8 +428,9 @@ class DataProcessingService:
                 return False
             else:
                 # Mark as successfully synchronized
-                proposicao.ultima_sincronizacao = timezone.now()
-                proposicao.erro_sincronizacao = None
+                if mark_synced:
+                    proposicao.ultima_sincronizacao = timezone.now()
+                    proposicao.erro_sincronizacao = None
                 proposicao.save()
                 logger.info(f"Proposition {proposicao.identificador_completo} synchronized successfully")
                 return True
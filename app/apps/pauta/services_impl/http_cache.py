@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .api_config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+# Headers preservados junto com o corpo da resposta
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+@dataclass
+class CacheEntry:
+    """Resposta armazenada no cache em disco."""
+
+    url: str
+    body: bytes
+    stored_at: float
+    ttl: int
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers de revalidação (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.headers.get('ETag'):
+            headers['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Reconstrói um `requests.Response` 200 a partir da entrada"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.from_cache = True
+        return response
+
+
+def cache_ttl(url: str) -> int:
+    """TTL em segundos configurado para o endpoint da URL"""
+    for pattern, ttl in APIConfig.HTTP_CACHE_TTLS:
+        if re.search(pattern, url):
+            return ttl
+    return APIConfig.HTTP_CACHE_DEFAULT_TTL
+
+
+class HTTPResponseCache:
+    """
+    Cache persistente de respostas das APIs em disco.
+
+    Cada entrada é um arquivo `<chave>.entry` (cabeçalho JSON + corpo bruto),
+    com a chave derivada da URL e dos parâmetros. O mtime do arquivo marca o
+    último uso; quando o diretório passa de `max_bytes`, as entradas usadas há
+    mais tempo são removidas (LRU).
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.entry")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                header = json.loads(fh.readline())
+                body = fh.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de cache inválida {path}: {e}")
+            return None
+        return CacheEntry(body=body, **header)
+
+    def store(self, key: str, response: requests.Response, ttl: int) -> CacheEntry:
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        entry = CacheEntry(url=response.url, body=response.content, stored_at=time.time(), ttl=ttl, headers=headers)
+        self._write(key, entry)
+        return entry
+
+    def refresh(self, key: str, entry: CacheEntry, ttl: int) -> CacheEntry:
+        """Renova a validade de uma entrada após um 304 Not Modified"""
+        entry.stored_at = time.time()
+        entry.ttl = ttl
+        self._write(key, entry)
+        return entry
+
+    def _write(self, key: str, entry: CacheEntry):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = json.dumps({
+            'url': entry.url,
+            'stored_at': entry.stored_at,
+            'ttl': entry.ttl,
+            'headers': entry.headers,
+        }).encode('utf-8')
+
+        try:
+            previous_size = os.path.getsize(path)
+        except OSError:
+            previous_size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(header + b'\n')
+            fh.write(entry.body)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += os.path.getsize(path) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.entry'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for _path, stat in self._entries())
+
+    def _evict(self):
+        """Remove as entradas menos usadas até ficar em 90% do limite"""
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _path, stat in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+
+        for path, stat in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= stat.st_size
+            removed += 1
+
+        self._total_bytes = total
+        logger.info(f"Cache HTTP: {removed} entradas removidas (LRU), {total} bytes em uso")
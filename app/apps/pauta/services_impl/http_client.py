@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from apps.core.metrics import (
+    UPSTREAM_REQUESTS, UPSTREAM_REQUEST_DURATION, UPSTREAM_RESPONSE_BYTES, upstream_endpoint,
+)
+
+from .api_config import APIConfig, TokenBucket
+from .http_cache import HTTPResponseCache, cache_ttl
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionPool:
+    """
+    Pool de sessões HTTP keep-alive compartilhado pelos serviços de coleta.
+
+    Mantém uma `requests.Session` por host upstream (Senado, Câmara), de modo
+    que o handshake TCP+TLS seja pago uma única vez e as conexões sejam
+    reutilizadas por `DataFetcherService` e `ActivitySyncService`.
+
+    Com um `HTTPResponseCache`, `fetch` serve respostas ainda válidas do disco
+    e revalida as vencidas com requisições condicionais.
+    """
+
+    def __init__(self, cache: Optional[HTTPResponseCache] = None):
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self.cache = cache
+
+    def _build_session(self) -> requests.Session:
+        """
+        Cria uma sessão com pool de conexões, sem retentativas de transporte.
+
+        Todas as retentativas ficam no laço de `fetch`: assim cada tentativa
+        consome um token do bucket e uma requisição lógica faz no máximo
+        HTTP_ADAPTIVE_RETRIES + 1 tentativas.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=APIConfig.HTTP_POOL_SIZE,
+            max_retries=Retry(total=0, connect=0, read=0, status=0, redirect=None, raise_on_status=False),
+        )
+
+        session = requests.Session()
+        session.headers.update(APIConfig.DEFAULT_HEADERS)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Retorna a sessão associada ao host da URL, criando-a se necessário"""
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._build_session()
+                    self._sessions[host] = session
+                    logger.debug(f"Sessão HTTP criada para {host}")
+        return session
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """Executa um GET reutilizando a conexão do host"""
+        kwargs.setdefault('timeout', APIConfig.http_timeout())
+        return self.get_session(url).get(url, params=params, **kwargs)
+
+    def fetch(self, url: str, bucket: TokenBucket, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Executa um GET sob o rate limit adaptativo da casa (`bucket`).
+
+        Respostas 429/503 e erros de conexão reduzem a taxa do bucket, suspendem
+        novas requisições pelo `Retry-After` (ou backoff exponencial) e são
+        retentadas dentro da mesma execução. Respostas 500/502/504 são retentadas
+        após o backoff, sem reduzir a taxa. Cada tentativa consome um token do
+        bucket. Respostas saudáveis aumentam a taxa aos poucos, sondando a
+        capacidade real do upstream.
+
+        Returns:
+            A última resposta obtida (pode ser 429/5xx se as tentativas se esgotarem)
+
+        Raises:
+            requests.exceptions.RequestException: se todas as tentativas falharem
+        """
+        labels = {'upstream': bucket.name, 'endpoint': upstream_endpoint(url)}
+        cache_key = entry = None
+        request_headers = {}
+        if self.cache is not None:
+            cache_key = self.cache.make_key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if entry.is_fresh:
+                    UPSTREAM_REQUESTS.inc(status='cache', **labels)
+                    return entry.to_response()
+                request_headers = entry.conditional_headers()
+
+        attempts = APIConfig.HTTP_ADAPTIVE_RETRIES + 1
+        for attempt in range(attempts):
+            bucket.acquire()
+            start = time.monotonic()
+            try:
+                response = self.get(url, params=params, headers=request_headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                UPSTREAM_REQUESTS.inc(status='error', **labels)
+                bucket.penalize(self._backoff(attempt))
+                if attempt == attempts - 1:
+                    raise
+                logger.warning(f"Erro de conexão em {url} (tentativa {attempt + 1}/{attempts}): {e}")
+                continue
+
+            latency = time.monotonic() - start
+            UPSTREAM_REQUESTS.inc(status=response.status_code, **labels)
+            UPSTREAM_REQUEST_DURATION.observe(latency, **labels)
+            UPSTREAM_RESPONSE_BYTES.inc(len(response.content), **labels)
+            if response.status_code in APIConfig.HTTP_THROTTLE_STATUS:
+                bucket.penalize(self._retry_after(response, attempt))
+                if attempt < attempts - 1:
+                    logger.warning(
+                        f"Upstream retornou {response.status_code} para {url} "
+                        f"(tentativa {attempt + 1}/{attempts})"
+                    )
+                    continue
+                return response
+
+            if response.status_code in APIConfig.HTTP_RETRY_STATUS:
+                if attempt < attempts - 1:
+                    logger.warning(
+                        f"Upstream retornou {response.status_code} para {url} "
+                        f"(tentativa {attempt + 1}/{attempts})"
+                    )
+                    time.sleep(self._backoff(attempt))
+                    continue
+                return response
+
+            bucket.reward(latency)
+            return self._apply_cache(url, cache_key, entry, response)
+
+    def _apply_cache(self, url: str, cache_key: Optional[str], entry,
+                     response: requests.Response) -> requests.Response:
+        """Atualiza o cache com a resposta e resolve 304 para o corpo armazenado"""
+        if self.cache is None:
+            return response
+        ttl = cache_ttl(url)
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Cache HTTP revalidado: {entry.url}")
+            return self.cache.refresh(cache_key, entry, ttl).to_response()
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            self.cache.store(cache_key, response, ttl)
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        return min(APIConfig.HTTP_MAX_RETRY_AFTER, APIConfig.HTTP_BACKOFF_FACTOR * (2 ** attempt))
+
+    def _retry_after(self, response: requests.Response, attempt: int) -> float:
+        """Interpreta o header Retry-After (segundos ou data HTTP)"""
+        value = response.headers.get('Retry-After')
+        if value:
+            try:
+                if value.strip().isdigit():
+                    seconds = float(value)
+                else:
+                    seconds = parsedate_to_datetime(value).timestamp() - time.time()
+                return min(APIConfig.HTTP_MAX_RETRY_AFTER, max(0.0, seconds))
+            except (TypeError, ValueError):
+                logger.debug(f"Retry-After inválido: {value}")
+        return self._backoff(attempt)
+
+    def close(self):
+        """Fecha todas as sessões abertas"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _build_default_cache() -> Optional[HTTPResponseCache]:
+    if not APIConfig.HTTP_CACHE_DIR:
+        return None
+    try:
+        return HTTPResponseCache(APIConfig.HTTP_CACHE_DIR, APIConfig.HTTP_CACHE_MAX_BYTES)
+    except OSError as e:
+        logger.warning(f"Cache HTTP desativado: não foi possível usar {APIConfig.HTTP_CACHE_DIR}: {e}")
+        return None
+
+
+_pool = HTTPSessionPool(cache=_build_default_cache())
+
+
+def get_http_pool() -> HTTPSessionPool:
+    """Retorna o pool de sessões compartilhado pelo processo"""
+    return _pool
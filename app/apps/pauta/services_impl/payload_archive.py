@@ -0,0 +1,123 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Iterator, Optional, Tuple
+
+from .api_config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadArchive:
+    """
+    Arquivo local, endereçado por conteúdo, dos payloads brutos das APIs.
+
+    Estrutura:
+    - objects/<aa>/<sha256>.json.gz: corpo bruto da resposta, comprimido.
+      Payloads idênticos (mesmo hash) são gravados uma única vez.
+    - refs/<tipo>/<identificador>: hash do payload mais recente daquele
+      recurso (ex.: refs/camara_tramitacoes/2386490).
+
+    Permite reprocessar proposições e históricos sem acessar a rede.
+    """
+
+    # Tipos de payload arquivados e o identificador usado em cada um
+    SENADO_BUSCA = 'senado_busca'                # TIPO-NUMERO-ANO
+    SENADO_PROCESSO = 'senado_processo'          # sf_id
+    SENADO_INFORMES = 'senado_informes'          # sf_id
+    CAMARA_BUSCA = 'camara_busca'                # TIPO-NUMERO-ANO
+    CAMARA_DETALHES = 'camara_detalhes'          # cd_id
+    CAMARA_AUTORES = 'camara_autores'            # cd_id
+    CAMARA_TRAMITACOES = 'camara_tramitacoes'    # cd_id
+    CAMARA_DEPUTADO = 'camara_deputado'          # id do deputado
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'refs'), exist_ok=True)
+
+    @staticmethod
+    def proposicao_ident(tipo: str, numero: int, ano: int) -> str:
+        """Identificador de busca de uma proposição (ex.: PL-4381-2023)"""
+        return f"{tipo}-{numero}-{ano}"
+
+    @staticmethod
+    def _safe(name: Any) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', str(name))
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.json.gz")
+
+    def _ref_path(self, kind: str, ident: Any) -> str:
+        return os.path.join(self.directory, 'refs', self._safe(kind), self._safe(ident))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, kind: str, ident: Any, body: bytes) -> str:
+        """
+        Arquiva o corpo bruto de uma resposta e aponta a referência para ele.
+
+        Returns:
+            Hash SHA-256 do payload
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._atomic_write(object_path, gzip.compress(body))
+        self._atomic_write(self._ref_path(kind, ident), digest.encode('ascii'))
+        return digest
+
+    def load_bytes(self, kind: str, ident: Any) -> Optional[bytes]:
+        """Retorna o corpo bruto arquivado para o recurso, se existir"""
+        try:
+            with open(self._ref_path(kind, ident), 'rb') as fh:
+                digest = fh.read().decode('ascii').strip()
+            with open(self._object_path(digest), 'rb') as fh:
+                return gzip.decompress(fh.read())
+        except FileNotFoundError:
+            return None
+
+    def load_json(self, kind: str, ident: Any) -> Optional[Any]:
+        """Retorna o payload arquivado já decodificado como JSON"""
+        body = self.load_bytes(kind, ident)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            logger.warning(f"Payload arquivado inválido ({kind}/{ident}): {e}")
+            return None
+
+    def refs(self, kind: str) -> Iterator[Tuple[str, str]]:
+        """Itera (identificador, hash) das referências de um tipo"""
+        ref_dir = os.path.join(self.directory, 'refs', self._safe(kind))
+        if not os.path.isdir(ref_dir):
+            return
+        for name in sorted(os.listdir(ref_dir)):
+            with open(os.path.join(ref_dir, name), 'rb') as fh:
+                yield name, fh.read().decode('ascii').strip()
+
+
+_archive: Optional[PayloadArchive] = None
+
+
+def get_payload_archive() -> Optional[PayloadArchive]:
+    """Retorna o arquivo de payloads configurado, ou None se desativado"""
+    global _archive
+    if _archive is None and APIConfig.PAYLOAD_ARCHIVE_DIR:
+        try:
+            _archive = PayloadArchive(APIConfig.PAYLOAD_ARCHIVE_DIR)
+        except OSError as e:
+            logger.warning(f"Arquivo de payloads desativado: {APIConfig.PAYLOAD_ARCHIVE_DIR}: {e}")
+            return None
+    return _archive
@@ -1,5 +1,12 @@
 import logging
-from typing import Dict
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from apps.pauta.data_version import bump_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -7,82 +14,75 @@ logger = logging.getLogger(__name__)
 class SelectionService:
     """
     Lógica de seleção de proposições por tema, extraída de `APISyncService`.
+
+    Em cada tema é selecionada a proposição com a `data_apresentacao` mais
+    antiga; sem datas, a de menor id. A seleção é recalculada em conjunto,
+    com uma função de janela (ROW_NUMBER por tema) e um único UPDATE.
     """
 
     def atualizar_selecao_tema(self, tema) -> bool:
-        try:
-            from apps.pauta.models import Proposicao
-            Proposicao.objects.filter(tema=tema).update(selected=False)
-
-            proposicoes = Proposicao.objects.filter(tema=tema).filter(
-                data_apresentacao__isnull=False
-            ).order_by('data_apresentacao', 'id')
-
-            if proposicoes.exists():
-                proposicao_selecionada = proposicoes.first()
-                proposicao_selecionada.selected = True
-                proposicao_selecionada.save()
-                logger.info(f"Tema '{tema.nome}': selecionada proposição {proposicao_selecionada.identificador_completo}")
-                return True
-            else:
-                proposicoes_sem_data = Proposicao.objects.filter(tema=tema).order_by('id')
-                if proposicoes_sem_data.exists():
-                    proposicao_selecionada = proposicoes_sem_data.first()
-                    proposicao_selecionada.selected = True
-                    proposicao_selecionada.save()
-                    logger.info(f"Tema '{tema.nome}': selecionada proposição {proposicao_selecionada.identificador_completo} (sem data)")
-                    return True
-                else:
-                    logger.warning(f"Tema '{tema.nome}': não possui proposições para selecionar")
-                    return False
-        except Exception as e:
-            logger.error(f"Erro ao atualizar seleção do tema '{tema.nome}': {e}")
+        stats = self.atualizar_selecao_temas([tema.pk])
+        if stats['erros']:
+            return False
+        if not stats['total_atualizadas']:
+            logger.warning(f"Tema '{tema.nome}': não possui proposições para selecionar")
             return False
+        logger.info(f"Tema '{tema.nome}': seleção atualizada")
+        return True
 
     def atualizar_selecao_proposicoes(self) -> Dict[str, int]:
-        from apps.pauta.models import Proposicao, Tema
-        total_temas = 0
-        total_atualizadas = 0
-        erros = 0
-
         logger.info("Iniciando atualização de seleção de proposições por tema")
-        try:
-            temas = Tema.objects.filter(proposicoes__isnull=False).distinct()
-            total_temas = temas.count()
-            for tema in temas:
-                try:
-                    Proposicao.objects.filter(tema=tema).update(selected=False)
+        return self._recalcular_selecao()
 
-                    proposicoes = Proposicao.objects.filter(tema=tema).filter(
-                        data_apresentacao__isnull=False
-                    ).order_by('data_apresentacao', 'id')
+    def atualizar_selecao_temas(self, tema_ids: Iterable[int]) -> Dict[str, int]:
+        """
+        Recalcula a seleção apenas dos temas informados (variante incremental).
 
-                    if proposicoes.exists():
-                        proposicao_selecionada = proposicoes.first()
-                        proposicao_selecionada.selected = True
-                        proposicao_selecionada.save()
-                        total_atualizadas += 1
-                        logger.info(f"Tema '{tema.nome}': selecionada proposição {proposicao_selecionada.identificador_completo}")
-                    else:
-                        proposicoes_sem_data = Proposicao.objects.filter(tema=tema).order_by('id')
-                        if proposicoes_sem_data.exists():
-                            proposicao_selecionada = proposicoes_sem_data.first()
-                            proposicao_selecionada.selected = True
-                            proposicao_selecionada.save()
-                            total_atualizadas += 1
-                            logger.info(f"Tema '{tema.nome}': selecionada proposição {proposicao_selecionada.identificador_completo} (sem data)")
-                        else:
-                            logger.warning(f"Tema '{tema.nome}': não possui proposições para selecionar")
-                except Exception as e:
-                    logger.error(f"Erro ao processar tema '{tema.nome}': {e}")
-                    erros += 1
+        Returns:
+            Dict no mesmo formato de `atualizar_selecao_proposicoes`
+        """
+        tema_ids = set(tema_ids)
+        if not tema_ids:
+            return {'total_temas': 0, 'total_atualizadas': 0, 'erros': 0}
+        return self._recalcular_selecao(tema_ids)
 
-            logger.info(f"Atualização de seleção concluída: {total_atualizadas} proposições selecionadas em {total_temas} temas, {erros} erros")
-            return {
-                'total_temas': total_temas,
-                'total_atualizadas': total_atualizadas,
-                'erros': erros
-            }
+    def _recalcular_selecao(self, tema_ids: Optional[set] = None) -> Dict[str, int]:
+        from apps.pauta.models import Proposicao, Tema
+
+        escopo = Proposicao.objects.all()
+        if tema_ids is not None:
+            escopo = escopo.filter(tema_id__in=tema_ids)
+
+        # Primeira proposição de cada tema: data mais antiga (sem data por último), depois menor id
+        selecionadas = (
+            escopo
+            .annotate(posicao=Window(
+                expression=RowNumber(),
+                partition_by=[F('tema_id')],
+                order_by=[F('data_apresentacao').asc(nulls_last=True), F('id').asc()],
+            ))
+            .filter(posicao=1)
+            .values('id')
+        )
+
+        try:
+            with transaction.atomic():
+                total_temas = escopo.values('tema_id').distinct().count()
+                # Só as linhas cujo estado muda são gravadas (invertendo `selected`)
+                mudancas = escopo.filter(
+                    Q(selected=True) & ~Q(id__in=selecionadas)
+                    | Q(selected=False, id__in=selecionadas)
+                )
+                temas_alterados = set(mudancas.values_list('tema_id', flat=True))
+                agora = timezone.now()
+                alteradas = mudancas.update(
+                    selected=Case(When(selected=True, then=Value(False)), default=Value(True)),
+                    updated_at=agora,
+                )
+                if alteradas:
+                    # `selected_proposicao` do tema mudou: aparece em ?updated_since=
+                    Tema.objects.filter(id__in=temas_alterados).update(updated_at=agora)
+                    bump_data_version()
         except Exception as e:
             logger.error(f"Erro na atualização de seleção de proposições: {e}")
             return {
@@ -91,4 +91,12 @@ class SelectionService:
                 'erros': 1
             }
 
-
+        logger.info(
+            f"Atualização de seleção concluída: {total_temas} proposições selecionadas em {total_temas} temas "
+            f"({alteradas} linhas alteradas), 0 erros"
+        )
+        return {
+            'total_temas': total_temas,
+            'total_atualizadas': total_temas,
+            'erros': 0
+        }
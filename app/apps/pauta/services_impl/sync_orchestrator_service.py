@@ -1,10 +1,18 @@
 import logging
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set
+from django.db import connection
 from django.utils import timezone
 
+from apps.core.logging_utils import log_performance
+from apps.core.metrics import SYNC_STAGE_DURATION
+from apps.pauta.data_version import batched_data_version
+
+from .api_config import APIConfig
 from .data_fetcher_service import DataFetcherService
-from .data_processing_service import DataProcessingService
+from .data_processing_service import DataProcessingService, deferred_derived_fields, request_derived_fields_update
+from .payload_archive import PayloadArchive
 from .activity_sync_service import ActivitySyncService
 from .selection_service import SelectionService
 
@@ -27,6 +35,8 @@ class SyncOrchestratorService:
         self.processor = DataProcessingService()
         self.activity_sync = ActivitySyncService()
         self.selection = SelectionService()
+        # Temas tocados durante um lote (None = fora de lote, seleção imediata)
+        self._temas_tocados: Optional[Set[int]] = None
     
     def sync_proposicao(self, proposicao) -> bool:
         """
@@ -38,6 +48,9 @@ class SyncOrchestratorService:
         3. Apply processed data to proposição
         4. Update derived fields and selection
         
+        Inside `sync_all_proposicoes` the tema selection is not updated here:
+        the tema is recorded and recomputed once at the end of the batch.
+        
         Args:
             proposicao: Proposicao instance
             
@@ -48,55 +61,67 @@ class SyncOrchestratorService:
             logger.info(f"Starting sync for proposition: {proposicao.identificador_completo}")
             
             # Step 1: Fetch raw data from external APIs
-            raw_senado_data = self.fetcher.fetch_proposicao_senado(
-                proposicao.tipo, proposicao.numero, proposicao.ano
-            )
+            with SYNC_STAGE_DURATION.time(stage='fetch_senado'):
+                raw_senado_data = self.fetcher.fetch_proposicao_senado(
+                    proposicao.tipo, proposicao.numero, proposicao.ano
+                )
             
             # Step 2: Process Senado data
             senado_data = None
             if raw_senado_data:
-                senado_data = self.processor.process_senado_raw_data(
-                    raw_senado_data, proposicao.tipo, proposicao.numero, proposicao.ano
-                )
+                with SYNC_STAGE_DURATION.time(stage='process_senado'):
+                    senado_data = self.processor.process_senado_raw_data(
+                        raw_senado_data, proposicao.tipo, proposicao.numero, proposicao.ano
+                    )
             
             # Step 3: Fetch and process Câmara data if needed
             camara_data = None
             if not senado_data or not senado_data.get('iniciadora'):
                 # Fetch Câmara data
-                search_data = self.fetcher.fetch_proposicao_camara_search(
-                    proposicao.tipo, proposicao.numero, proposicao.ano
-                )
+                with SYNC_STAGE_DURATION.time(stage='fetch_camara_search'):
+                    search_data = self.fetcher.fetch_proposicao_camara_search(
+                        proposicao.tipo, proposicao.numero, proposicao.ano
+                    )
                 
                 if search_data and 'dados' in search_data and len(search_data['dados']) > 0:
                     cd_id = search_data['dados'][0]['id']
                     
                     # Fetch details and authors
-                    details_data = self.fetcher.fetch_proposicao_camara_details(cd_id)
-                    authors_data = self.fetcher.fetch_proposicao_camara_authors(cd_id)
+                    with SYNC_STAGE_DURATION.time(stage='fetch_camara_details'):
+                        details_data = self.fetcher.fetch_proposicao_camara_details(cd_id)
+                        authors_data = self.fetcher.fetch_proposicao_camara_authors(cd_id)
                     
                     # Process Câmara data
-                    camara_data = self.processor.process_camara_raw_data(
-                        search_data, details_data, authors_data
-                    )
+                    with SYNC_STAGE_DURATION.time(stage='process_camara'):
+                        camara_data = self.processor.process_camara_raw_data(
+                            search_data, details_data, authors_data
+                        )
             
             # Step 4: Apply processed data to proposição
-            success = self.processor.process_proposicao_sync_data(
-                proposicao, senado_data, camara_data
-            )
+            with SYNC_STAGE_DURATION.time(stage='apply'):
+                success = self.processor.process_proposicao_sync_data(
+                    proposicao, senado_data, camara_data
+                )
             
             if success:
                 # Step 5: Update derived fields
                 try:
-                    self.processor.update_derived_fields(proposicao)
+                    with SYNC_STAGE_DURATION.time(stage='derived_fields'):
+                        self.processor.update_derived_fields(proposicao)
                 except Exception as e:
                     logger.warning(f"Error updating derived fields after sync: {e}")
                 
-                # Step 6: Update tema selection
-                try:
-                    self.selection.atualizar_selecao_tema(proposicao.tema)
-                    logger.debug(f"Selection updated for tema '{proposicao.tema.nome}' after sync")
-                except Exception as e:
-                    logger.warning(f"Error updating tema selection after sync: {e}")
+                # Step 6: Update tema selection (deferred to the end of a batch)
+                temas_tocados = self._temas_tocados
+                if temas_tocados is not None:
+                    temas_tocados.add(proposicao.tema_id)
+                else:
+                    try:
+                        with SYNC_STAGE_DURATION.time(stage='selection'):
+                            self.selection.atualizar_selecao_tema(proposicao.tema)
+                        logger.debug(f"Selection updated for tema '{proposicao.tema.nome}' after sync")
+                    except Exception as e:
+                        logger.warning(f"Error updating tema selection after sync: {e}")
                 
                 logger.info(f"Successfully synchronized: {proposicao.identificador_completo}")
                 return True
@@ -111,19 +136,27 @@ class SyncOrchestratorService:
             proposicao.save()
             return False
     
-    def sync_all_proposicoes(self, limit: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+    def sync_all_proposicoes(self, limit: Optional[int] = None, force: bool = False,
+                             workers: Optional[int] = None) -> Dict[str, int]:
         """
         Synchronize multiple proposições with external APIs.
         
+        With ``workers > 1`` several proposições are kept in flight at once on a
+        thread pool. All workers share this orchestrator's fetcher, so the
+        per-house rate limits in `APIConfig` remain the only throttle.
+        
         Args:
             limit: Maximum number of proposições to process (None for all)
             force: If True, sync all proposições, even already synchronized ones
+            workers: Number of concurrent workers (defaults to APIConfig.SYNC_WORKERS)
             
         Returns:
             Dict with synchronization statistics
         """
         from apps.pauta.models import Proposicao
         
+        workers = max(1, workers or APIConfig.SYNC_WORKERS)
+        
         # Determine which proposições to sync
         if force:
             proposicoes = Proposicao.objects.all().order_by('created_at')
@@ -136,28 +169,49 @@ class SyncOrchestratorService:
             proposicoes = proposicoes[:limit]
         
         total = proposicoes.count()
-        sucessos = 0
-        erros = 0
-        
-        logger.info(f"Starting batch sync for {total} proposições")
+        logger.info(f"Starting batch sync for {total} proposições ({workers} workers)")
+        start_time = time.time()
         
-        # Process each proposição
-        for proposicao in proposicoes:
-            if self.sync_proposicao(proposicao):
-                sucessos += 1
-            else:
-                erros += 1
+        temas_tocados: Set[int] = set()
+        self._temas_tocados = temas_tocados
+        try:
+            falhas = self._run_sync_batch(proposicoes, workers)
             
-            # Rate limiting pause between proposições
-            time.sleep(0.5)
+            # Retry failures within the same run instead of leaving them for the
+            # next cron. 'NOT FOUND' is a definitive answer from the APIs.
+            for passe in range(APIConfig.SYNC_RETRY_PASSES):
+                retentaveis = [p for p in falhas if p.erro_sincronizacao != 'NOT FOUND']
+                if not retentaveis:
+                    break
+                logger.info(f"Retry pass {passe + 1}: {len(retentaveis)} proposições")
+                falhas = [p for p in falhas if p.erro_sincronizacao == 'NOT FOUND']
+                falhas += self._run_sync_batch(retentaveis, workers)
+        finally:
+            self._temas_tocados = None
+        
+        erros = len(falhas)
+        sucessos = total - erros
         
-        logger.info(f"Batch sync completed: {sucessos} successes, {erros} errors")
+        duration = time.time() - start_time
+        throughput = total / duration if duration > 0 else 0.0
+        logger.info(
+            f"Batch sync completed: {sucessos} successes, {erros} errors "
+            f"in {duration:.1f}s ({throughput:.2f} proposições/s)"
+        )
+        log_performance('sync_all_proposicoes', duration, {
+            'total': total,
+            'sucessos': sucessos,
+            'erros': erros,
+            'workers': workers,
+            'throughput_per_s': round(throughput, 3),
+        })
         
-        # Update selection for all temas after batch sync
-        if sucessos > 0:
+        # Update selection once, only for the temas touched by this batch
+        if temas_tocados:
             try:
-                logger.info("Updating selection for all proposições after batch sync")
-                selecao_result = self.selection.atualizar_selecao_proposicoes()
+                logger.info(f"Updating selection for {len(temas_tocados)} temas touched by batch sync")
+                with SYNC_STAGE_DURATION.time(stage='batch_selection'):
+                    selecao_result = self.selection.atualizar_selecao_temas(temas_tocados)
                 logger.info(f"Selection updated: {selecao_result}")
             except Exception as e:
                 logger.warning(f"Error updating selection after batch sync: {e}")
@@ -168,6 +222,52 @@ class SyncOrchestratorService:
             'erros': erros
         }
     
+    def _run_sync_batch(self, proposicoes, workers: int) -> List:
+        """
+        Sync a batch of proposições serially or on a thread pool.
+        
+        Returns:
+            List of proposições whose sync failed
+        """
+        falhas = []
+        
+        if workers == 1:
+            # Process each proposição (data version bumped once, at the end)
+            with batched_data_version():
+                for proposicao in proposicoes:
+                    if not self.sync_proposicao(proposicao):
+                        falhas.append(proposicao)
+                    
+                    # Rate limiting pause between proposições
+                    time.sleep(0.5)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sync-proposicao') as executor:
+                futures = {
+                    executor.submit(self._sync_proposicao_worker, proposicao): proposicao
+                    for proposicao in proposicoes
+                }
+                for future in as_completed(futures):
+                    if not future.result():
+                        falhas.append(futures[future])
+        
+        return falhas
+    
+    def _sync_proposicao_worker(self, proposicao) -> bool:
+        """
+        Run `sync_proposicao` on a pool thread.
+        
+        Each thread gets its own DB connection from Django; close it when the
+        task ends so worker threads do not leak connections.
+        """
+        try:
+            with batched_data_version():
+                return self.sync_proposicao(proposicao)
+        except Exception as e:
+            logger.error(f"Unexpected error in sync worker for {proposicao.identificador_completo}: {e}")
+            return False
+        finally:
+            connection.close()
+    
     def sync_activities_for_proposicao(self, proposicao) -> Dict[str, bool]:
         """
         Synchronize activity history for a single proposição.
@@ -184,16 +284,17 @@ class SyncOrchestratorService:
         }
         
         try:
-            # Sync Senado activities if sf_id exists
-            if proposicao.sf_id:
-                results['senado'] = self.activity_sync.sincronizar_atividades_senado(proposicao)
-            
-            # Sync Câmara activities if cd_id exists
-            if proposicao.cd_id:
-                results['camara'] = self.activity_sync.sincronizar_atividades_camara(proposicao)
-            
-            # Note: Derived fields (like current_house) are now updated automatically
-            # via Django signals when activity history changes
+            # Derived fields (like current_house) are recomputed once, after both houses
+            with deferred_derived_fields():
+                # Sync Senado activities if sf_id exists
+                if proposicao.sf_id:
+                    with SYNC_STAGE_DURATION.time(stage='activities_senado'):
+                        results['senado'] = self.activity_sync.sincronizar_atividades_senado(proposicao)
+                
+                # Sync Câmara activities if cd_id exists
+                if proposicao.cd_id:
+                    with SYNC_STAGE_DURATION.time(stage='activities_camara'):
+                        results['camara'] = self.activity_sync.sincronizar_atividades_camara(proposicao)
             
             return results
             
@@ -257,6 +358,71 @@ class SyncOrchestratorService:
             'erros': erros
         }
     
+    def reprocess_from_archive(self, proposicao, archive: PayloadArchive, activities: bool = True) -> bool:
+        """
+        Rebuild a proposição (and optionally its activity history) from
+        archived raw payloads, without touching the network.
+        
+        Follows the same steps as `sync_proposicao`, reading each payload
+        from the archive instead of the APIs. Sync status fields are left
+        untouched.
+        
+        Args:
+            proposicao: Proposicao instance
+            archive: PayloadArchive holding the raw payloads
+            activities: Also rebuild Senado/Câmara activity history
+            
+        Returns:
+            bool: True if archived data was found and applied
+        """
+        ident = PayloadArchive.proposicao_ident(proposicao.tipo, proposicao.numero, proposicao.ano)
+        
+        try:
+            senado_data = None
+            raw_senado_data = archive.load_json(PayloadArchive.SENADO_BUSCA, ident)
+            if isinstance(raw_senado_data, list):
+                senado_data = self.processor.process_senado_raw_data(
+                    raw_senado_data, proposicao.tipo, proposicao.numero, proposicao.ano
+                )
+            
+            camara_data = None
+            if not senado_data or not senado_data.get('iniciadora'):
+                search_data = archive.load_json(PayloadArchive.CAMARA_BUSCA, ident)
+                if search_data and search_data.get('dados'):
+                    cd_id = search_data['dados'][0]['id']
+                    camara_data = self.processor.process_camara_raw_data(
+                        search_data,
+                        archive.load_json(PayloadArchive.CAMARA_DETALHES, cd_id),
+                        archive.load_json(PayloadArchive.CAMARA_AUTORES, cd_id),
+                    )
+            
+            success = self.processor.process_proposicao_sync_data(
+                proposicao, senado_data, camara_data, mark_synced=False
+            )
+            
+            if activities:
+                with deferred_derived_fields():
+                    if proposicao.sf_id:
+                        data = archive.load_json(PayloadArchive.SENADO_PROCESSO, proposicao.sf_id)
+                        if data:
+                            self.activity_sync.aplicar_atividades_senado(proposicao, data)
+                            success = True
+                    if proposicao.cd_id:
+                        data = archive.load_json(PayloadArchive.CAMARA_TRAMITACOES, proposicao.cd_id)
+                        if data:
+                            self.activity_sync.aplicar_atividades_camara(proposicao, data)
+                            success = True
+                    # Recalculado uma única vez ao sair do bloco, com ou sem atividades gravadas
+                    if success:
+                        request_derived_fields_update(proposicao)
+            elif success:
+                self.processor.update_derived_fields(proposicao)
+            return success
+            
+        except Exception as e:
+            logger.error(f"Error reprocessing {proposicao.identificador_completo} from archive: {e}")
+            return False
+    
     def get_sync_statistics(self) -> Dict[str, int]:
         """
         Get current synchronization statistics.
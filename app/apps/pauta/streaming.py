@@ -0,0 +1,103 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _dumps(data) -> str:
+    """Serializa como o `JSONRenderer` do DRF (compacto, UTF-8)"""
+    return json.dumps(
+        data,
+        cls=JSONEncoder,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(',', ':') if api_settings.COMPACT_JSON else (', ', ': '),
+    )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """JSON delimitado por linhas: um objeto por linha (`?format=ndjson`)"""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(_dumps(row) + '\n' for row in rows).encode(self.charset)
+
+
+class JSONStreamRenderer(JSONRenderer):
+    """Array JSON comum, mas gerado em partes na listagem (`?format=jsonstream`)"""
+
+    format = 'jsonstream'
+
+
+class StreamingListMixin:
+    """
+    Listagem em streaming para os endpoints do Power BI.
+
+    Com `?format=ndjson` ou `?format=jsonstream`, o queryset filtrado é
+    percorrido com `.iterator(chunk_size=...)` e cada linha é serializada e
+    enviada assim que lida, em um `StreamingHttpResponse`. O consumo de
+    memória fica constante e o primeiro byte sai sem esperar a tabela toda.
+    Sem esses formatos, a listagem continua como antes.
+    """
+
+    stream_formats = ('ndjson', 'jsonstream')
+    stream_chunk_size = 2000
+    # Tamanho aproximado de cada bloco enviado ao cliente
+    stream_buffer_size = 64 * 1024
+
+    def get_renderers(self):
+        return super().get_renderers() + [NDJSONRenderer(), JSONStreamRenderer()]
+
+    def list(self, request, *args, **kwargs):
+        renderer = getattr(request, 'accepted_renderer', None)
+        if renderer is None or renderer.format not in self.stream_formats:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if renderer.format == 'ndjson':
+            content = self._buffered(_dumps(row) + '\n' for row in self.stream_rows(queryset))
+        else:
+            content = self._buffered(self._json_array(self.stream_rows(queryset)))
+
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def stream_rows(self, queryset):
+        """Serializa as linhas uma a uma, lendo o banco em blocos"""
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield serializer_class(obj, context=context).data
+
+    @staticmethod
+    def _json_array(rows):
+        yield '['
+        separator = ''
+        for row in rows:
+            yield separator + _dumps(row)
+            separator = ','
+        yield ']'
+
+    def _buffered(self, parts):
+        """Agrupa as partes em blocos de ~`stream_buffer_size` bytes"""
+        buffer = []
+        size = 0
+        for part in parts:
+            chunk = part.encode('utf-8')
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= self.stream_buffer_size:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b''.join(buffer)
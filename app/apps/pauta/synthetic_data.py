@@ -0,0 +1,387 @@
+"""
+Geração de dados sintéticos em volume (eixos, temas, proposições e
+históricos de atividades) para testes de carga e benchmarks.
+
+Tudo sai de geradores `random.Random` derivados da semente e consumidos
+sempre na mesma ordem: a mesma semente gera os mesmos dados (exceto ids de
+chave substituta e timestamps de criação), independentemente do tamanho
+do bloco.
+As distribuições seguem a agenda real (`data/processed/agenda_2025.json`):
+maioria de PLs, anos recentes mais frequentes, proposições com cauda longa
+de tramitações e textos de tamanhos variados.
+
+As linhas são inseridas em blocos, sem sinais por objeto: `bulk_create`
+para eixos, temas e proposições (os ids são necessários a seguir) e, no
+PostgreSQL, `COPY` para os históricos de atividades (o grosso do volume;
+nos demais bancos, `bulk_create`). A versão dos dados é incrementada uma
+vez ao final. Os dados
+sintéticos ficam em eixos com id a partir de `EIXO_ID_START` e em números
+de proposição a partir de `NUMERO_START`, sem colidir com a agenda real.
+"""
+import io
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+CHUNK_SIZE = 5000
+
+EIXO_ID_START = 1000
+NUMERO_START = 10000
+INT4_MAX = 2 ** 31 - 1
+
+# Distribuições (peso relativo), aproximando a agenda real
+TIPOS = {'PL': 70, 'PLP': 14, 'MPV': 9, 'PEC': 5, 'PDL': 1, 'MSC': 1}
+ANOS = {ano: 1 + (ano - 2010) ** 1.5 for ano in range(2011, 2026)}
+INICIADORA_POR_TIPO = {
+    'MPV': {'EXECUTIVO': 1},
+    'MSC': {'EXECUTIVO': 1},
+    'PEC': {'CD': 50, 'SF': 50},
+}
+INICIADORA_PADRAO = {'CD': 70, 'SF': 28, 'OUTROS': 2}
+
+ORGAOS_CAMARA = {
+    'PLEN': 30, 'MESA': 12, 'CCJC': 14, 'CFT': 9, 'CTRAB': 4, 'CSAUDE': 4, 'CE': 4, 'CDEICS': 3,
+    'CAPADR': 3, 'CMADS': 3, 'CSPCCO': 3, 'CCTI': 2, 'CDHMIR': 2, 'CVT': 2, 'COPER': 1,
+}
+ORGAO_IDS = {sigla: 180 + i for i, sigla in enumerate(ORGAOS_CAMARA)}
+COLEGIADOS_SENADO = {
+    'PLEN': ('Plenário do Senado Federal', 40), 'CCJ': ('Comissão de Constituição, Justiça e Cidadania', 15),
+    'CAE': ('Comissão de Assuntos Econômicos', 12), 'CAS': ('Comissão de Assuntos Sociais', 8),
+    'CE': ('Comissão de Educação e Cultura', 6), 'CI': ('Comissão de Serviços de Infraestrutura', 5),
+    'CMA': ('Comissão de Meio Ambiente', 4), 'CRA': ('Comissão de Agricultura e Reforma Agrária', 4),
+    'CCT': ('Comissão de Ciência, Tecnologia, Inovação e Informática', 3),
+    'CDH': ('Comissão de Direitos Humanos e Legislação Participativa', 3),
+}
+REGIMES = {'Ordinário (Art. 151, III, RICD)': 70, 'Prioridade (Art. 151, II, RICD)': 20, 'Urgência (Art. 155, RICD)': 10}
+SITUACOES_CAMARA = ('Aguardando Parecer', 'Pronta para Pauta', 'Tramitando em Conjunto', None)
+SITUACOES_SENADO = {'AGDESP': 30, 'PRONTOPAUT': 20, 'AGRELATOR': 25, 'APROVADA': 10, 'ARQUIVADA': 15}
+
+PALAVRAS = (
+    'dispõe altera institui estabelece regulamenta lei federal nacional política programa sistema '
+    'saúde educação segurança pública trabalho renda tributária fiscal orçamento municípios estados '
+    'união servidores agricultura familiar meio ambiente energia transporte infraestrutura crédito '
+    'previdência social assistência direitos criança adolescente mulher idoso pessoa deficiência '
+    'tecnologia inovação dados pessoais proteção consumidor empresas micro pequeno porte cooperativas '
+    'recursos hídricos saneamento habitação cidades mobilidade urbana cultura esporte turismo defesa '
+    'forças armadas reserva remunerada imposto contribuição isenção incentivo fundo comitê gestor '
+    'conselho agência reguladora concessão licitação contratos administração procedimento prazo'
+).split()
+PREFIXOS_EMENTA = ('Dispõe sobre', 'Altera a Lei nº', 'Institui', 'Estabelece', 'Regulamenta', 'Acrescenta dispositivo à')
+DESCRICOES_TRAMITACAO = (
+    'Apresentação de Proposição', 'Recebimento', 'Designação de Relator', 'Parecer do Relator',
+    'Aprovação do Parecer', 'Encaminhamento', 'Leitura e publicação', 'Requerimento de Urgência',
+    'Votação em Plenário', 'Remessa ao Senado Federal', 'Transformação em Norma Jurídica', 'Arquivamento',
+)
+DESCRICOES_SENADO = (
+    'Recebido o Projeto', 'Leitura em Plenário', 'Distribuído ao relator', 'Aprovado o requerimento',
+    'Aguardando designação do relator', 'Incluído em Ordem do Dia', 'Aprovado o parecer da comissão',
+    'Remetido à Câmara dos Deputados', 'Encaminhado à sanção', 'Arquivado ao final da legislatura',
+)
+# Ordem dos valores nas tuplas geradas por `_atividades`
+CAMARA_COLUNAS = (
+    'proposicao_id', 'data_hora', 'sequencia', 'sigla_orgao', 'uri_orgao', 'regime', 'descricao_tramitacao',
+    'cod_tipo_tramitacao', 'descricao_situacao', 'despacho', 'ambito', 'apreciacao',
+)
+SENADO_COLUNAS = (
+    'proposicao_id', 'id_informe', 'data', 'descricao', 'colegiado_casa', 'colegiado_sigla', 'colegiado_nome',
+    'ente_administrativo_casa', 'ente_administrativo_sigla', 'ente_administrativo_nome', 'sigla_situacao_iniciada',
+)
+PRENOMES = ('Maria', 'José', 'Ana', 'João', 'Antônio', 'Francisca', 'Carlos', 'Paulo', 'Adriana', 'Lucas', 'Juliana', 'Marcos')
+SOBRENOMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro')
+
+
+@dataclass(frozen=True)
+class Volumes:
+    eixos: int = 50
+    temas: int = 2000
+    proposicoes: int = 200_000
+    atividades: int = 20_000_000
+
+    def scaled(self, factor: float) -> 'Volumes':
+        return Volumes(*(max(1, round(value * factor)) for value in (
+            self.eixos, self.temas, self.proposicoes, self.atividades)))
+
+
+class SyntheticDataError(Exception):
+    """Volumes inválidos ou dados sintéticos já existentes"""
+
+
+class _Sorteio:
+    """Escolha ponderada com pesos acumulados pré-calculados (evita refazer a soma a cada sorteio)"""
+
+    def __init__(self, rng: random.Random, weights: Dict):
+        self.rng = rng
+        self.values = list(weights)
+        self.cum_weights = list(accumulate(
+            w[-1] if isinstance(w, tuple) else w for w in weights.values()
+        ))
+
+    def __call__(self):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+class SyntheticDataGenerator:
+    def __init__(self, volumes: Volumes, seed: int = 42, chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[Callable[[str, int], None]] = None):
+        if min(volumes.eixos, volumes.temas, volumes.proposicoes) < 1 or volumes.atividades < 0:
+            raise SyntheticDataError("Volumes devem ser positivos")
+        if volumes.temas < volumes.eixos or volumes.proposicoes < volumes.temas:
+            raise SyntheticDataError("É preciso ao menos um tema por eixo e uma proposição por tema")
+        if volumes.atividades > INT4_MAX:
+            raise SyntheticDataError(f"No máximo {INT4_MAX} atividades (id_informe é int4 no PostgreSQL)")
+        self.volumes = volumes
+        self.chunk_size = chunk_size
+        self.progress = progress or (lambda model, count: None)
+        self.rng = random.Random(seed)
+        # Fluxo próprio das atividades: sorteadas por bloco, não podem intercalar
+        # com as proposições (o resultado dependeria do tamanho do bloco)
+        self.rng_atividades = random.Random(f'{seed}:atividades')
+        # id_informe (int4 no PostgreSQL) vem de um contador do lote: no máximo o total de atividades
+        self.ultimo_informe = 0
+        rng = self.rng
+        self.tipo = _Sorteio(rng, TIPOS)
+        self.ano = _Sorteio(rng, ANOS)
+        self.iniciadora = {tipo: _Sorteio(rng, pesos) for tipo, pesos in INICIADORA_POR_TIPO.items()}
+        self.iniciadora_padrao = _Sorteio(rng, INICIADORA_PADRAO)
+        self.orgao_camara = _Sorteio(self.rng_atividades, ORGAOS_CAMARA)
+        self.colegiado_senado = _Sorteio(self.rng_atividades, COLEGIADOS_SENADO)
+        self.regime = _Sorteio(self.rng_atividades, REGIMES)
+        self.situacao_senado = _Sorteio(self.rng_atividades, SITUACOES_SENADO)
+        # Textos pré-gerados: sortear de um conjunto é muito mais rápido que montar um texto por linha
+        self.ementas = [self._ementa() for _ in range(4096)]
+        self.despachos = [''] * 2048 + [self._texto(rng.randint(8, 300)) for _ in range(2048)]
+        self.autores = [f"{rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)}" for _ in range(1500)]
+
+    # Textos -----------------------------------------------------------------
+
+    def _texto(self, palavras: int) -> str:
+        return ' '.join(self.rng.choices(PALAVRAS, k=palavras)).capitalize() + '.'
+
+    def _ementa(self) -> str:
+        # Comprimento log-normal: mediana ~25 palavras, cauda até ~120
+        palavras = min(120, max(6, round(self.rng.lognormvariate(math.log(25), 0.5))))
+        return f"{self.rng.choice(PREFIXOS_EMENTA)} {self._texto(palavras).lower()}"
+
+    # Geração ----------------------------------------------------------------
+
+    def generate(self) -> Dict[str, int]:
+        """Cria todos os registros; retorna as quantidades por modelo"""
+        from apps.pauta.data_version import bump_data_version
+        from apps.pauta.models import Eixo
+        from apps.pauta.services_impl.selection_service import SelectionService
+
+        if Eixo.objects.filter(id__gte=EIXO_ID_START).exists():
+            raise SyntheticDataError("Já existem dados sintéticos; use --clear para recriá-los")
+
+        with transaction.atomic():
+            eixos = self._criar_eixos()
+            temas = self._criar_temas(eixos)
+        totais = {'eixos': len(eixos), 'temas': len(temas)}
+        totais.update(self._criar_proposicoes_e_atividades(temas))
+
+        SelectionService().atualizar_selecao_temas([tema.id for tema in temas])
+        bump_data_version()
+        return totais
+
+    def _criar_eixos(self) -> List:
+        from apps.pauta.models import Eixo
+
+        eixos = [
+            Eixo(id=EIXO_ID_START + i, nome=f"Eixo sintético {i + 1:03d}: {self._texto(3)[:-1].lower()}")
+            for i in range(self.volumes.eixos)
+        ]
+        Eixo.objects.bulk_create(eixos, batch_size=self.chunk_size)
+        self.progress('eixos', len(eixos))
+        return eixos
+
+    def _criar_temas(self, eixos) -> List:
+        from apps.pauta.models import Tema
+
+        # Distribuição desigual entre eixos: alguns eixos concentram mais temas
+        pesos = [self.rng.paretovariate(1.5) for _ in eixos]
+        contagens = _repartir(self.volumes.temas, pesos, minimo=1)
+        temas = []
+        for eixo, quantidade in zip(eixos, contagens):
+            for _ in range(quantidade):
+                temas.append(Tema(eixo=eixo, nome=f"{self._texto(self.rng.randint(2, 8))[:-1]} #{len(temas) + 1}"))
+        temas = Tema.objects.bulk_create(temas, batch_size=self.chunk_size)
+        self.progress('temas', len(temas))
+        return temas
+
+    def _criar_proposicoes_e_atividades(self, temas) -> Dict[str, int]:
+        volumes = self.volumes
+        por_tema = _repartir(volumes.proposicoes, [self.rng.paretovariate(1.2) for _ in temas], minimo=1)
+        # Cauda longa de tramitações: a maioria tem poucas, algumas têm centenas
+        atividades = _repartir(volumes.atividades, [self.rng.lognormvariate(0, 1.2) for _ in range(volumes.proposicoes)])
+
+        numeros: Dict = {}
+        totais = {'proposicoes': 0, 'atividades_senado': 0, 'atividades_camara': 0}
+        bloco = []
+        indice = 0
+        for tema, quantidade in zip(temas, por_tema):
+            for _ in range(quantidade):
+                bloco.append((self._proposicao(tema, numeros), atividades[indice]))
+                indice += 1
+                if len(bloco) >= self.chunk_size:
+                    self._gravar_bloco(bloco, totais)
+                    bloco = []
+        if bloco:
+            self._gravar_bloco(bloco, totais)
+        return totais
+
+    def _proposicao(self, tema, numeros: Dict):
+        from apps.pauta.models import Proposicao
+
+        rng = self.rng
+        tipo = self.tipo()
+        ano = self.ano()
+        numero = numeros[(tipo, ano)] = numeros.get((tipo, ano), NUMERO_START - 1) + 1
+        iniciadora = self.iniciadora.get(tipo, self.iniciadora_padrao)()
+        revisora = {'CD': 'SF', 'SF': 'CD'}.get(iniciadora, 'CD')
+        apresentacao = date(ano, 1, 1) + timedelta(days=rng.randrange(365))
+        return Proposicao(
+            tema=tema, tipo=tipo, numero=numero, ano=ano,
+            sf_id=rng.randrange(100_000, 10_000_000) if iniciadora == 'SF' or rng.random() < 0.4 else None,
+            cd_id=rng.randrange(100_000, 3_000_000) if iniciadora != 'SF' or rng.random() < 0.4 else None,
+            autor=rng.choice(self.autores) if iniciadora not in ('EXECUTIVO', 'OUTROS') else 'Poder Executivo',
+            data_apresentacao=apresentacao,
+            iniciadora=iniciadora,
+            revisora=revisora,
+            current_house=iniciadora if rng.random() < 0.65 else revisora,
+            ementa=rng.choice(self.ementas),
+            ultima_sincronizacao=datetime.combine(apresentacao, time(12), dt_timezone.utc),
+        )
+
+    def _gravar_bloco(self, bloco, totais: Dict[str, int]):
+        from apps.pauta.models import CamaraActivityHistory, Proposicao, SenadoActivityHistory
+
+        with transaction.atomic():
+            proposicoes = Proposicao.objects.bulk_create([p for p, _ in bloco], batch_size=self.chunk_size)
+            senado, camara = [], []
+            for proposicao, quantidade in zip(proposicoes, (n for _, n in bloco)):
+                self._atividades(proposicao, quantidade, senado, camara)
+                if len(senado) >= self.chunk_size:
+                    totais['atividades_senado'] += self._inserir(SenadoActivityHistory, SENADO_COLUNAS, senado)
+                    senado = []
+                if len(camara) >= self.chunk_size:
+                    totais['atividades_camara'] += self._inserir(CamaraActivityHistory, CAMARA_COLUNAS, camara)
+                    camara = []
+            totais['atividades_senado'] += self._inserir(SenadoActivityHistory, SENADO_COLUNAS, senado)
+            totais['atividades_camara'] += self._inserir(CamaraActivityHistory, CAMARA_COLUNAS, camara)
+        totais['proposicoes'] += len(proposicoes)
+        self.progress('proposicoes', totais['proposicoes'])
+
+    def _inserir(self, model, colunas, linhas: List[tuple]) -> int:
+        """Grava as linhas (tuplas na ordem de `colunas`): COPY no PostgreSQL, bulk_create nos demais"""
+        if not linhas:
+            return 0
+        if connection.vendor == 'postgresql':
+            _copy(model, colunas, linhas)
+        else:
+            model.objects.bulk_create(
+                [model(**dict(zip(colunas, linha))) for linha in linhas], batch_size=self.chunk_size,
+            )
+        return len(linhas)
+
+    def _atividades(self, proposicao, quantidade: int, senado: List, camara: List):
+        """Acrescenta as atividades da proposição às listas, como tuplas de SENADO_COLUNAS / CAMARA_COLUNAS"""
+        rng = self.rng_atividades
+        # Tramitação começa na casa iniciadora (o Executivo envia à Câmara)
+        fracao_camara = 0.3 if proposicao.iniciadora == 'SF' else 0.7
+        momento = datetime.combine(proposicao.data_apresentacao, time(10), dt_timezone.utc)
+        sequencia_camara = 0
+        for _ in range(quantidade):
+            # Intervalos entre eventos: muitos no mesmo dia, alguns de meses
+            momento += timedelta(minutes=rng.randrange(5, 240), days=int(rng.expovariate(1 / 6)))
+            if rng.random() < fracao_camara:
+                sequencia_camara += 1
+                sigla = self.orgao_camara()
+                camara.append((
+                    proposicao.id, momento, sequencia_camara, sigla,
+                    f"https://dadosabertos.camara.leg.br/api/v2/orgaos/{ORGAO_IDS[sigla]}",
+                    self.regime(), rng.choice(DESCRICOES_TRAMITACAO), str(rng.randrange(100, 1300)),
+                    rng.choice(SITUACOES_CAMARA), rng.choice(self.despachos),
+                    'Regimental', 'Proposição Sujeita à Apreciação do Plenário',
+                ))
+            else:
+                self.ultimo_informe += 1
+                sigla = self.colegiado_senado()
+                senado.append((
+                    proposicao.id, self.ultimo_informe, momento.date(), rng.choice(DESCRICOES_SENADO),
+                    'SF', sigla, COLEGIADOS_SENADO[sigla][0],
+                    'SF', 'SLSF', 'Secretaria Legislativa do Senado Federal', self.situacao_senado(),
+                ))
+
+
+def _copy(model, colunas, linhas: List[tuple]):
+    """COPY ... FROM STDIN (formato texto) das linhas, com created_at/updated_at = agora"""
+    agora = timezone.now().isoformat()
+    buffer = io.StringIO()
+    for linha in linhas:
+        buffer.write('\t'.join(_copy_valor(valor) for valor in linha))
+        buffer.write(f'\t{agora}\t{agora}\n')
+    buffer.seek(0)
+
+    opts = model._meta
+    nomes = [opts.get_field(coluna).column for coluna in colunas] + ['created_at', 'updated_at']
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {connection.ops.quote_name(opts.db_table)} '
+            f'({", ".join(connection.ops.quote_name(nome) for nome in nomes)}) FROM STDIN',
+            buffer,
+        )
+
+
+def _copy_valor(valor) -> str:
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, str):
+        return valor.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return str(valor)
+
+
+def _repartir(total: int, pesos: List[float], minimo: int = 0) -> List[int]:
+    """Divide `total` proporcionalmente a `pesos`, com soma exata e `minimo` por item"""
+    livre = total - minimo * len(pesos)
+    soma = sum(pesos)
+    partes = [math.floor(livre * peso / soma) for peso in pesos]
+    restante = livre - sum(partes)
+    # Sobras vão para os maiores pesos (ordem estável: determinística)
+    for i in sorted(range(len(pesos)), key=lambda i: -pesos[i])[:restante]:
+        partes[i] += 1
+    return [parte + minimo for parte in partes]
+
+
+def clear_synthetic_data() -> Dict[str, int]:
+    """
+    Remove os dados sintéticos (eixos a partir de EIXO_ID_START e tudo abaixo).
+
+    DELETEs em lote, filhos antes dos pais, sem carregar objetos nem disparar
+    sinais por linha (tombstones não são gravados para dados sintéticos).
+    """
+    from apps.pauta.data_version import bump_data_version
+    from apps.pauta.models import CamaraActivityHistory, Eixo, Proposicao, SenadoActivityHistory, Tema
+
+    filtros = [
+        ('atividades_senado', SenadoActivityHistory, 'proposicao__tema__eixo_id__gte'),
+        ('atividades_camara', CamaraActivityHistory, 'proposicao__tema__eixo_id__gte'),
+        ('proposicoes', Proposicao, 'tema__eixo_id__gte'),
+        ('temas', Tema, 'eixo_id__gte'),
+        ('eixos', Eixo, 'id__gte'),
+    ]
+    removidos = {}
+    with transaction.atomic():
+        for nome, model, lookup in filtros:
+            queryset = model.objects.filter(**{lookup: EIXO_ID_START})
+            removidos[nome] = queryset._raw_delete(queryset.db)
+    if any(removidos.values()):
+        bump_data_version()
+    return removidos
@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+
+
+class ActivityKeysetPaginationTest(TestCase):
+    """Testes para a paginação por cursor dos endpoints de atividades."""
+
+    def setUp(self):
+        self.client = APIClient()
+        eixo = Eixo.objects.create(id=50, nome="Eixo Atividades API")
+        tema = Tema.objects.create(eixo=eixo, nome="Atividades API")
+        p1 = Proposicao.objects.create(tema=tema, tipo='PL', numero=1, ano=2023)
+        p2 = Proposicao.objects.create(tema=tema, tipo='PL', numero=2, ano=2023)
+
+        # Vários empates em data_hora e em sequencia entre proposições
+        CamaraActivityHistory.objects.bulk_create([
+            CamaraActivityHistory(
+                proposicao=proposicao, sequencia=seq,
+                data_hora=datetime(2023, 9, 1 + seq // 3, 10, 0, tzinfo=dt_timezone.utc),
+                sigla_orgao='PLEN', descricao_tramitacao='x', cod_tipo_tramitacao='1', despacho='',
+            )
+            for proposicao in (p1, p2)
+            for seq in range(1, 12)
+        ])
+        SenadoActivityHistory.objects.bulk_create([
+            SenadoActivityHistory(proposicao=p1, id_informe=i, data=date(2024, 1, 1 + i // 4), descricao='x')
+            for i in range(1, 10)
+        ])
+        self.camara_url = reverse('pauta:camara-activity-list')
+        self.senado_url = reverse('pauta:senado-activity-list')
+
+    def _percorrer(self, url, **params):
+        ids = []
+        response = self.client.get(url, {'pagination': 'cursor', **params})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            if not response.data['next']:
+                return ids, response
+            response = self.client.get(response.data['next'])
+
+    def test_sem_parametro_retorna_lista_completa(self):
+        """Testa que o comportamento padrão (lista sem paginação) é mantido."""
+        response = self.client.get(self.camara_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 22)
+
+    def test_percorre_todas_as_paginas_sem_repetir(self):
+        """Testa que as páginas cobrem todas as linhas, na ordem keyset e sem duplicatas."""
+        esperado = list(
+            CamaraActivityHistory.objects.order_by('-data_hora', '-sequencia', '-id').values_list('id', flat=True)
+        )
+        ids, _ = self._percorrer(self.camara_url, page_size=5)
+        self.assertEqual(ids, esperado)
+
+        esperado = list(
+            SenadoActivityHistory.objects.order_by('-data', '-id_informe', '-id').values_list('id', flat=True)
+        )
+        ids, _ = self._percorrer(self.senado_url, page_size=4)
+        self.assertEqual(ids, esperado)
+
+    def test_link_previous_volta_uma_pagina(self):
+        """Testa a navegação para a página anterior."""
+        primeira = self.client.get(self.camara_url, {'pagination': 'cursor', 'page_size': 6})
+        segunda = self.client.get(primeira.data['next'])
+        volta = self.client.get(segunda.data['previous'])
+
+        self.assertEqual(
+            [item['id'] for item in volta.data['results']],
+            [item['id'] for item in primeira.data['results']],
+        )
+
+    def test_sem_count_e_consultas_constantes(self):
+        """Testa que nenhuma página executa COUNT(*) e que páginas profundas custam o mesmo."""
+        primeira = self.client.get(self.camara_url, {'pagination': 'cursor', 'page_size': 3})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(primeira.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in queries))
+
+        with CaptureQueriesContext(connection) as primeira_queries:
+            self.client.get(self.camara_url, {'pagination': 'cursor', 'page_size': 3})
+        self.assertEqual(len(queries), len(primeira_queries))
+
+    def test_cursor_invalido(self):
+        """Testa que um cursor adulterado retorna 404."""
+        response = self.client.get(self.camara_url, {'cursor': 'nao-e-um-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # JSON válido, mas com valores que não passam no to_python do campo ou nulos
+        for chave in (['abc', 1, 1], [None, 1, 1]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'k': chave}).encode()).decode().rstrip('=')
+            response = self.client.get(self.camara_url, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, chave)
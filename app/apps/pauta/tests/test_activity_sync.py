@@ -0,0 +1,183 @@
+from datetime import date
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.pauta.models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from apps.pauta.services_impl.activity_sync_service import ActivitySyncService
+from apps.pauta.services_impl.data_processing_service import DataProcessingService, deferred_derived_fields
+
+
+class ActivityBulkUpsertTest(TestCase):
+    """Testes para a gravação em lote do histórico de atividades."""
+
+    def setUp(self):
+        eixo = Eixo.objects.create(id=32, nome="Eixo Atividades")
+        tema = Tema.objects.create(eixo=eixo, nome="Atividades")
+        self.proposicao = Proposicao.objects.create(tema=tema, tipo='PL', numero=100, ano=2023)
+        self.service = ActivitySyncService()
+
+    def _tramitacoes(self, n, despacho='Despacho'):
+        return {'dados': [
+            {
+                'sequencia': i,
+                'dataHora': f'2023-09-{i:02d}T10:00',
+                'siglaOrgao': 'PLEN',
+                'descricaoTramitacao': 'Apresentação',
+                'codTipoTramitacao': '100',
+                'despacho': despacho if i == n else 'Despacho',
+            }
+            for i in range(1, n + 1)
+        ]}
+
+    def test_upsert_camara_conta_criadas_atualizadas_inalteradas(self):
+        """Testa as contagens da primeira carga e de uma recarga parcialmente alterada."""
+        stats = self.service.aplicar_atividades_camara(self.proposicao, self._tramitacoes(5))
+        self.assertEqual(stats, {'criadas': 5, 'atualizadas': 0, 'inalteradas': 0})
+
+        stats = self.service.aplicar_atividades_camara(self.proposicao, self._tramitacoes(6, despacho='Novo'))
+        self.assertEqual(stats, {'criadas': 1, 'atualizadas': 0, 'inalteradas': 5})
+
+        stats = self.service.aplicar_atividades_camara(self.proposicao, self._tramitacoes(6))
+        self.assertEqual(stats, {'criadas': 0, 'atualizadas': 1, 'inalteradas': 5})
+
+        self.assertEqual(CamaraActivityHistory.objects.filter(proposicao=self.proposicao).count(), 6)
+        self.assertEqual(
+            CamaraActivityHistory.objects.get(proposicao=self.proposicao, sequencia=6).despacho, 'Despacho'
+        )
+
+    def test_numero_de_consultas_independe_do_tamanho(self):
+        """Testa que o histórico é gravado com um número fixo de consultas."""
+        # Campos derivados já preenchidos, para não contar suas atualizações
+        Proposicao.objects.filter(pk=self.proposicao.pk).update(
+            current_house='CD', data_apresentacao='2023-01-01'
+        )
+        self.proposicao.refresh_from_db()
+        with CaptureQueriesContext(connection) as pequeno:
+            self.service.aplicar_atividades_camara(self.proposicao, self._tramitacoes(3))
+        CamaraActivityHistory.objects.all().delete()
+        with CaptureQueriesContext(connection) as grande:
+            self.service.aplicar_atividades_camara(self.proposicao, self._tramitacoes(30))
+
+        self.assertEqual(len(pequeno), len(grande))
+
+    def test_upsert_senado_e_campos_derivados(self):
+        """Testa o upsert do Senado e a atualização única de current_house."""
+        data = {'autuacoes': [{'informesLegislativos': [
+            {'id': 1, 'data': '2024-03-01T00:00:00', 'descricao': 'Recebido', 'colegiado': {'sigla': 'CCJ'}},
+            {'id': 2, 'data': '2024-03-05', 'descricao': None},
+            {'id': 3, 'data': None, 'descricao': 'Sem data'},
+        ]}]}
+
+        stats = self.service.aplicar_atividades_senado(self.proposicao, data)
+        self.assertEqual(stats, {'criadas': 2, 'atualizadas': 0, 'inalteradas': 0})
+
+        stats = self.service.aplicar_atividades_senado(self.proposicao, data)
+        self.assertEqual(stats, {'criadas': 0, 'atualizadas': 0, 'inalteradas': 2})
+
+        self.assertEqual(
+            SenadoActivityHistory.objects.get(proposicao=self.proposicao, id_informe=1).colegiado_sigla, 'CCJ'
+        )
+        self.proposicao.refresh_from_db()
+        self.assertEqual(self.proposicao.current_house, 'SF')
+
+
+class DeferredDerivedFieldsTest(TestCase):
+    """Testes para o adiamento do recálculo de campos derivados."""
+
+    def setUp(self):
+        eixo = Eixo.objects.create(id=33, nome="Eixo Sinais")
+        tema = Tema.objects.create(eixo=eixo, nome="Sinais")
+        self.proposicao = Proposicao.objects.create(tema=tema, tipo='PL', numero=200, ano=2023)
+
+    def _criar_informes(self, n):
+        for i in range(1, n + 1):
+            SenadoActivityHistory.objects.create(
+                proposicao=self.proposicao, id_informe=i, data=date(2024, 3, i), descricao='Informe'
+            )
+
+    def test_save_avulso_recalcula_imediatamente(self):
+        """Testa que saves fora do bloco (ex.: admin) mantêm o recálculo por linha."""
+        with patch.object(DataProcessingService, 'update_derived_fields') as mock_update:
+            self._criar_informes(3)
+        self.assertEqual(mock_update.call_count, 3)
+
+    def test_bloco_recalcula_uma_vez_por_proposicao(self):
+        """Testa que o bloco agrupa os sinais e recalcula ao sair, inclusive aninhado."""
+        with patch.object(DataProcessingService, 'update_derived_fields') as mock_update:
+            with deferred_derived_fields():
+                self._criar_informes(3)
+                with deferred_derived_fields():
+                    SenadoActivityHistory.objects.filter(id_informe=3).delete()
+                self.assertEqual(mock_update.call_count, 0)
+        mock_update.assert_called_once()
+
+    def test_campos_derivados_atualizados_ao_sair(self):
+        """Testa que current_house reflete o histórico ao fim do bloco."""
+        with deferred_derived_fields():
+            self._criar_informes(2)
+            self.proposicao.refresh_from_db()
+            self.assertIsNone(self.proposicao.current_house)
+        self.proposicao.refresh_from_db()
+        self.assertEqual(self.proposicao.current_house, 'SF')
+
+
+class RecomputeDerivedFieldsTest(TestCase):
+    """Testes para o recálculo em lote de campos derivados."""
+
+    def setUp(self):
+        eixo = Eixo.objects.create(id=34, nome="Eixo Lote")
+        tema = Tema.objects.create(eixo=eixo, nome="Lote")
+        self.sf = Proposicao.objects.create(tema=tema, tipo='PL', numero=301, ano=2023)
+        self.cd = Proposicao.objects.create(tema=tema, tipo='PL', numero=302, ano=2023,
+                                            data_apresentacao=date(2020, 1, 1))
+        self.vazia = Proposicao.objects.create(tema=tema, tipo='PL', numero=303, ano=2023)
+
+        SenadoActivityHistory.objects.bulk_create([
+            SenadoActivityHistory(proposicao=self.sf, id_informe=1, data=date(2024, 3, 1), descricao='a'),
+            SenadoActivityHistory(proposicao=self.sf, id_informe=2, data=date(2024, 5, 1), descricao='b'),
+            SenadoActivityHistory(proposicao=self.cd, id_informe=3, data=date(2023, 1, 1), descricao='c'),
+        ])
+        service = ActivitySyncService()
+        CamaraActivityHistory.objects.bulk_create([
+            CamaraActivityHistory(
+                proposicao=proposicao, sequencia=seq, data_hora=service._processar_data_hora(data_hora),
+                sigla_orgao='PLEN', descricao_tramitacao='x', cod_tipo_tramitacao='1', despacho='',
+            )
+            for proposicao, seq, data_hora in [
+                (self.sf, 1, '2023-09-12T10:00'),
+                (self.cd, 1, '2023-06-01T10:00'),
+                (self.cd, 2, '2024-02-01T10:00'),
+            ]
+        ])
+        self.service = DataProcessingService()
+
+    def test_dry_run_nao_grava(self):
+        """Testa que o dry-run calcula o diff sem alterar o banco."""
+        stats = self.service.recompute_derived_fields(dry_run=True)
+
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['com_atividades'], 2)
+        alteracoes = {a['id']: a for a in stats['alteracoes']}
+        self.assertEqual(alteracoes[self.sf.pk]['current_house'], (None, 'SF'))
+        self.assertEqual(alteracoes[self.sf.pk]['data_apresentacao'], (None, date(2023, 9, 12)))
+        self.assertEqual(alteracoes[self.cd.pk]['current_house'], (None, 'CD'))
+        self.assertNotIn('data_apresentacao', alteracoes[self.cd.pk])
+        self.assertIsNone(Proposicao.objects.get(pk=self.sf.pk).current_house)
+
+    def test_lote_equivale_ao_calculo_por_proposicao(self):
+        """Testa que o lote produz o mesmo resultado de update_derived_fields, em consultas fixas."""
+        with CaptureQueriesContext(connection) as queries:
+            self.service.recompute_derived_fields()
+        lote = {p.pk: (p.current_house, p.data_apresentacao) for p in Proposicao.objects.all()}
+
+        Proposicao.objects.update(current_house=None)
+        Proposicao.objects.filter(pk=self.sf.pk).update(data_apresentacao=None)
+        for proposicao in Proposicao.objects.all():
+            self.service.update_derived_fields(proposicao)
+        individual = {p.pk: (p.current_house, p.data_apresentacao) for p in Proposicao.objects.all()}
+
+        self.assertEqual(lote, individual)
+        self.assertLessEqual(len(queries), 5)  # inclui o incremento da versão dos dados
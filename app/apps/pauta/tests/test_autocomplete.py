@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Eixo, Tema, Proposicao
+
+
+class AutocompleteTest(TestCase):
+    """Testes para o endpoint de autocompletar (/api/autocomplete/)."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('pauta:autocomplete')
+        eixo = Eixo.objects.create(id=95, nome="Eixo Autocomplete")
+        self.tema_agua = Tema.objects.create(eixo=eixo, nome="Recursos Hídricos")
+        self.tema_saude = Tema.objects.create(eixo=eixo, nome="Saúde e Recursos")
+        self.pl = Proposicao.objects.create(tema=self.tema_agua, tipo='PL', numero=4381, ano=2023, autor='Maria Silva')
+        Proposicao.objects.create(tema=self.tema_agua, tipo='PL', numero=43, ano=2021, autor='Ana Maria Souza')
+        Proposicao.objects.create(tema=self.tema_saude, tipo='PL', numero=500, ano=2023, autor='Maria Silva')
+        Proposicao.objects.create(tema=self.tema_saude, tipo='PEC', numero=4381, ano=2023, autor='João Pereira')
+        cache.clear()
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _identificadores(self, q):
+        return [item['identificador'] for item in self._get(q=q, tipo='proposicoes')['proposicoes']]
+
+    def test_identificador(self):
+        """Testa a busca por prefixos do identificador (tipo, número e ano)."""
+        self.assertEqual(self._identificadores('PL 4381/2023'), ['PL 4381/2023'])
+        self.assertEqual(self._identificadores('pl 43'), ['PL 43/2021', 'PL 4381/2023'])
+        self.assertEqual(self._identificadores('PL 4381/20'), ['PL 4381/2023'])
+        self.assertEqual(self._identificadores('PL'), ['PL 43/2021', 'PL 500/2023', 'PL 4381/2023'])
+        self.assertEqual(self._identificadores('PEC4381'), ['PEC 4381/2023'])
+        self.assertEqual(self._identificadores('PL 043'), [])
+        self.assertEqual(self._get(q='PL 4381/2023', tipo='proposicoes')['proposicoes'][0]['id'], self.pl.pk)
+
+    def test_autores_e_temas(self):
+        """Testa autores distintos e temas, com correspondências no início primeiro."""
+        data = self._get(q='maria')
+        self.assertEqual(data['autores'], ['Maria Silva', 'Ana Maria Souza'])
+        self.assertEqual(data['proposicoes'], [])
+
+        data = self._get(q='recursos', tipo='temas')
+        self.assertEqual(list(data), ['temas'])
+        self.assertEqual([tema['nome'] for tema in data['temas']], ['Recursos Hídricos', 'Saúde e Recursos'])
+        self.assertEqual(data['temas'][0]['eixo_nome'], 'Eixo Autocomplete')
+
+    def test_limite_e_termo_curto(self):
+        """Testa o limite por tipo, termos curtos e parâmetros inválidos."""
+        self.assertEqual(len(self._get(q='PL', limit=1)['proposicoes']), 1)
+        self.assertEqual(self._get(q='m'), {'proposicoes': [], 'autores': [], 'temas': []})
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self._get(q='ma')  # curto demais para os trigramas: sem icontains em autores e temas
+        self.assertEqual((data['autores'], data['temas']), ([], []))
+        self.assertFalse([q for q in queries.captured_queries if 'LIKE' in q['sql'].upper()])
+        self.assertEqual(self._get(q='mar')['autores'], ['Maria Silva', 'Ana Maria Souza'])
+
+        response = self.client.get(self.url, {'q': 'maria', 'tipo': 'autores,eixos'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'q': 'maria', 'limit': 'dez'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(API_RESPONSE_CACHE_ENABLED=True)
+    def test_prefixo_em_cache(self):
+        """Testa que um prefixo repetido vem do cache e que alterações nos dados o invalidam."""
+        self.assertEqual(self._get(q='Maria ')['autores'], ['Maria Silva', 'Ana Maria Souza'])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._get(q='  maria')['autores'], ['Maria Silva', 'Ana Maria Souza'])
+        self.assertEqual(len(queries), 1)  # apenas a versão dos dados
+
+        Proposicao.objects.create(tema=self.tema_saude, tipo='PL', numero=1, ano=2024, autor='Mariana Costa')
+        self.assertIn('Mariana Costa', self._get(q='maria')['autores'])
+
+    def test_sql_postgres(self):
+        """Testa que o icontains gera UPPER(...) LIKE, a mesma expressão dos índices de trigramas."""
+        pg = PostgresDatabaseWrapper({**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'}, 'pg')
+        sql, _params = Proposicao.objects.filter(autor__icontains='maria').query.get_compiler(connection=pg).as_sql()
+        self.assertIn('UPPER("pauta_proposicao"."autor"::text) LIKE UPPER(', sql)
+
+        index = next(i for i in Proposicao._meta.indexes if i.name == 'proposicao_autor_trgm_idx')
+        index_sql = str(index.create_sql(Proposicao, pg.schema_editor(collect_sql=True)))
+        self.assertIn('USING gin ((UPPER("autor") gin_trgm_ops))', index_sql)
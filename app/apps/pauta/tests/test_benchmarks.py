@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from .. import benchmarks
+from ..benchmarks import BenchmarkError, compare, percentile
+
+
+def _resultado(p95_ms, queries):
+    return {'cenarios': {'bi_eixos': {'p95_ms': p95_ms, 'queries': queries}}}
+
+
+class BenchmarkFunctionsTest(SimpleTestCase):
+    """Testes para percentis e comparação com a baseline."""
+
+    def test_percentile_nearest_rank(self):
+        valores = list(range(100, 0, -1))
+        self.assertEqual(percentile(valores, 50), 50)
+        self.assertEqual(percentile(valores, 95), 95)
+        self.assertEqual(percentile(valores, 99), 99)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+
+    def test_compare(self):
+        """Testa que latência regride só acima da tolerância e do ruído, e queries a qualquer aumento."""
+        baseline = _resultado(10.0, 3)
+        self.assertEqual(compare(_resultado(11.9, 3), baseline), [])
+        self.assertEqual(compare(_resultado(1.0, 3), _resultado(0.5, 3)), [])  # dobro, mas abaixo do ruído
+        self.assertEqual(len(compare(_resultado(12.5, 3), baseline)), 1)
+        self.assertIn('4 queries (baseline 3)', compare(_resultado(10.0, 4), baseline)[0])
+        self.assertEqual(compare({'cenarios': {'novo': {'p95_ms': 99, 'queries': 9}}}, baseline), [])
+
+    def test_load_rejeita_outra_versao(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            with open(path, 'w') as f:
+                json.dump({'version': 0, 'cenarios': {}}, f)
+            with self.assertRaises(BenchmarkError):
+                benchmarks.load(path)
+
+
+class BenchmarkCommandTest(TestCase):
+    """Executa todos os cenários uma vez sobre uma base sintética mínima."""
+
+    def test_todos_os_cenarios_e_baseline(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', '--iterations', '1', stdout=StringIO())  # base vazia
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            call_command(
+                'benchmark_api', '--iterations', '1', '--warmup', '0', '--generate-scale', '0.0005',
+                '--output', path, stdout=StringIO(),
+            )
+            resultado = benchmarks.load(path)
+            self.assertEqual(set(resultado['cenarios']), {c.nome for c in benchmarks.CENARIOS})
+            for nome, cenario in resultado['cenarios'].items():
+                self.assertGreater(cenario['bytes'], 0, nome)
+                self.assertGreater(cenario['peak_rss_kb'], 0, nome)
+            self.assertGreater(resultado['cenarios']['bi_proposicoes_por_tema']['queries'], 0)
+            self.assertEqual(resultado['meta']['dataset']['proposicoes'], 100)
+
+            out = StringIO()
+            call_command(
+                'benchmark_api', '--iterations', '1', '--warmup', '0', '--only', 'bi_', '--baseline', path,
+                '--tolerance', '1000', stdout=out,
+            )
+            self.assertIn('Sem regressões', out.getvalue())
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'defina RUN_BENCHMARKS=1 para rodar o benchmark')
+class ApiBenchmarkTest(TestCase):
+    """
+    Benchmark completo, fora da suíte padrão.
+
+    Variáveis: BENCHMARK_SCALE (escala da base sintética, padrão 0.01),
+    BENCHMARK_ITERATIONS, BENCHMARK_OUTPUT (grava os resultados) e
+    BENCHMARK_BASELINE (falha se houver regressão em relação a ela).
+    """
+
+    def test_api_benchmark(self):
+        args = [
+            '--generate-scale', os.environ.get('BENCHMARK_SCALE', '0.01'),
+            '--iterations', os.environ.get('BENCHMARK_ITERATIONS', str(benchmarks.ITERATIONS)),
+        ]
+        if os.environ.get('BENCHMARK_OUTPUT'):
+            args += ['--output', os.environ['BENCHMARK_OUTPUT']]
+        if os.environ.get('BENCHMARK_BASELINE'):
+            args += ['--baseline', os.environ['BENCHMARK_BASELINE']]
+        call_command('benchmark_api', *args)
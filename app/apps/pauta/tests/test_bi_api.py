@@ -0,0 +1,132 @@
+import json
+from datetime import date
+
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Eixo, Tema, Proposicao
+
+
+class BIStreamingTest(TestCase):
+    """Testes para as listagens em streaming dos endpoints do Power BI."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.eixo = Eixo.objects.create(id=60, nome="Eixo BI")
+        self.tema = Tema.objects.create(eixo=self.eixo, nome="Tema BI")
+        for numero in range(1, 8):
+            Proposicao.objects.create(
+                tema=self.tema, tipo='PL', numero=numero, ano=2023,
+                data_apresentacao=date(2023, 1, numero), selected=numero == 1,
+                ementa='Dispõe sobre ação',
+            )
+        self.url = reverse('pauta:bi-proposicao-list')
+
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_uma_linha_por_objeto(self):
+        """Testa que o NDJSON traz os mesmos objetos da listagem padrão."""
+        padrao = self.client.get(self.url).json()
+        response = self.client.get(self.url, {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        linhas = self._body(response).splitlines()
+        self.assertEqual([json.loads(linha) for linha in linhas], padrao)
+
+    def test_jsonstream_array_equivalente(self):
+        """Testa que o array em partes é idêntico ao JSON padrão, com filtros aplicados."""
+        padrao = self.client.get(self.url, {'ano': 2023, 'ordering': '-numero'}).json()
+        response = self.client.get(self.url, {'format': 'jsonstream', 'ano': 2023, 'ordering': '-numero'})
+
+        self.assertEqual(json.loads(self._body(response)), padrao)
+        self.assertEqual(json.loads(self._body(self.client.get(self.url, {'format': 'jsonstream', 'ano': 1999}))), [])
+
+    def test_streaming_em_blocos(self):
+        """Testa que o corpo é enviado em vários blocos quando excede o buffer."""
+        from apps.pauta.views import ProposicaoReadOnlyViewSet
+        original = ProposicaoReadOnlyViewSet.stream_buffer_size
+        ProposicaoReadOnlyViewSet.stream_buffer_size = 100
+        try:
+            response = self.client.get(self.url, {'format': 'ndjson'})
+            blocos = list(response.streaming_content)
+        finally:
+            ProposicaoReadOnlyViewSet.stream_buffer_size = original
+        self.assertGreater(len(blocos), 1)
+
+    def test_temas_e_eixos_com_prefetch(self):
+        """Testa o streaming dos endpoints com prefetch (temas e eixos)."""
+        temas = self._body(self.client.get(reverse('pauta:bi-tema-list'), {'format': 'ndjson'}))
+        tema = json.loads(temas.splitlines()[0])
+        self.assertEqual(tema['selected_proposicao'], 'PL 1/2023')
+
+        eixos = self._body(self.client.get(reverse('pauta:bi-eixo-list'), {'format': 'ndjson'}))
+        self.assertEqual(json.loads(eixos.splitlines()[0])['temas_count'], 1)
+
+
+class BIQueryCountTest(TestCase):
+    """Testes de regressão do número de consultas dos endpoints do Power BI."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _criar(self, eixos):
+        for e in range(eixos):
+            eixo = Eixo.objects.create(id=80 + e, nome=f"Eixo {e}")
+            for t in range(3):
+                tema = Tema.objects.create(eixo=eixo, nome=f"Tema {e}.{t}")
+                for numero in range(t + 1):
+                    Proposicao.objects.create(
+                        tema=tema, tipo='PL', numero=100 * e + 10 * t + numero, ano=2023, selected=numero == 0,
+                    )
+
+    def _consultas(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_consultas_constantes(self):
+        """Testa que o número de consultas não cresce com o número de linhas."""
+        urls = [reverse('pauta:bi-eixo-list'), reverse('pauta:bi-tema-list'), reverse('pauta:bi-proposicao-list')]
+        self._criar(1)
+        poucos = [self._consultas(url) for url in urls]
+        Eixo.objects.all().delete()
+        self._criar(4)
+        muitos = [self._consultas(url) for url in urls]
+
+        self.assertEqual(poucos, muitos)
+        # Versão dos dados (GET condicional) + listagem (+ prefetch da seleção nos temas)
+        self.assertEqual(muitos, [2, 3, 2])
+        self.assertEqual([self._consultas(url, format='ndjson') for url in urls], [2, 3, 2])
+
+    def test_contagens_anotadas(self):
+        """Testa que as contagens anotadas batem com os relacionamentos."""
+        self._criar(2)
+        eixos = self.client.get(reverse('pauta:bi-eixo-list')).json()
+        self.assertEqual([eixo['temas_count'] for eixo in eixos], [3, 3])
+
+        temas = self.client.get(reverse('pauta:bi-tema-list'), {'eixo__id': 80}).json()
+        self.assertEqual(sorted(tema['proposicoes_count'] for tema in temas), [1, 2, 3])
+
+        tema = Tema.objects.get(nome="Tema 0.2")
+        with CaptureQueriesContext(connection) as queries:
+            detalhe = self.client.get(reverse('pauta:bi-tema-detail', args=[tema.id])).json()
+        self.assertEqual(detalhe['proposicoes_count'], 3)
+        self.assertEqual(len(queries), 3)
+
+    def test_temas_sem_selecionada(self):
+        """Testa que temas sem proposição selecionada não geram uma consulta por tema."""
+        self._criar(2)
+        Proposicao.objects.update(selected=False)
+        self.assertEqual(self._consultas(reverse('pauta:bi-tema-list')), 3)
+        temas = self.client.get(reverse('pauta:bi-tema-list')).json()
+        self.assertEqual({tema['selected_proposicao'] for tema in temas}, {None})
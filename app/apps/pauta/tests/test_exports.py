@@ -0,0 +1,116 @@
+import csv
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .. import exports
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from ..serializers import ProposicaoReadOnlySerializer
+
+
+class DatasetExportTest(TestCase):
+    """Testes para a exportação CSV/Parquet das tabelas do Power BI."""
+
+    def setUp(self):
+        self.client = APIClient()
+        eixo = Eixo.objects.create(id=70, nome="Eixo Exportação")
+        tema = Tema.objects.create(eixo=eixo, nome="Exportação")
+        self.proposicoes = [
+            Proposicao.objects.create(
+                tema=tema, tipo='PL', numero=numero, ano=2023,
+                data_apresentacao=date(2023, 2, numero), ementa='Dispõe, "entre aspas", sobre ação',
+            )
+            for numero in range(1, 6)
+        ]
+        SenadoActivityHistory.objects.create(
+            proposicao=self.proposicoes[0], id_informe=1, data=date(2024, 1, 2), descricao='Leitura',
+        )
+        CamaraActivityHistory.objects.create(
+            proposicao=self.proposicoes[0], sequencia=1, sigla_orgao='PLEN',
+            data_hora=datetime(2023, 9, 1, 10, 0, tzinfo=dt_timezone.utc),
+            descricao_tramitacao='Apresentação', cod_tipo_tramitacao='100', despacho='',
+        )
+
+    def _csv(self, content: bytes):
+        return list(csv.reader(io.StringIO(gzip.decompress(content).decode('utf-8'))))
+
+    def test_csv_colunas_do_serializer(self):
+        """Testa que o CSV de proposições tem as colunas e valores do serializer read-only."""
+        content = b''.join(exports.export_chunks(exports.get_dataset('proposicoes'), 'csv', chunk_size=2))
+        linhas = self._csv(content)
+
+        self.assertEqual(linhas[0], ProposicaoReadOnlySerializer.Meta.fields)
+        self.assertEqual(len(linhas), 6)
+        esperado = ProposicaoReadOnlySerializer(self.proposicoes[0]).data
+        primeira = dict(zip(linhas[0], linhas[1]))
+        for campo in ('identificador_completo', 'ementa', 'data_apresentacao', 'tema_nome', 'eixo_id'):
+            self.assertEqual(primeira[campo], str(esperado[campo]))
+        self.assertEqual(primeira['sf_id'], '')
+
+    def test_sem_instanciar_modelos(self):
+        """Testa que a exportação roda em uma única consulta, sem joins extras por linha."""
+        with CaptureQueriesContext(connection) as queries:
+            b''.join(exports.export_chunks(exports.get_dataset('proposicoes'), 'csv'))
+        self.assertEqual(len(queries), 1)
+
+    def test_endpoint_streaming(self):
+        """Testa o endpoint de exportação das tabelas de atividades."""
+        response = self.client.get(reverse('pauta:export-dataset', args=['atividades_camara', 'csv']))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('atividades_camara.csv.gz', response['Content-Disposition'])
+        linhas = self._csv(b''.join(response.streaming_content))
+        self.assertEqual(linhas[1][linhas[0].index('sigla_orgao')], 'PLEN')
+
+    def test_endpoint_erros(self):
+        """Testa dataset desconhecido (404) e formato inválido (400)."""
+        response = self.client.get(reverse('pauta:export-dataset', args=['usuarios', 'csv']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('pauta:export-dataset', args=['proposicoes', 'xlsx']))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @unittest.skipIf(exports.pa is not None, 'pyarrow instalado')
+    def test_parquet_sem_pyarrow(self):
+        """Testa que, sem pyarrow, o Parquet é recusado com uma mensagem clara."""
+        response = self.client.get(reverse('pauta:export-dataset', args=['proposicoes', 'parquet']))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('pyarrow', response.data['detail'])
+
+    @unittest.skipIf(exports.pa is None, 'pyarrow não instalado')
+    def test_parquet(self):
+        """Testa a leitura do Parquet gerado em vários row groups."""
+        import pyarrow.parquet as pq
+        content = b''.join(exports.export_chunks(exports.get_dataset('proposicoes'), 'parquet', chunk_size=2))
+        arquivo = pq.ParquetFile(io.BytesIO(content))
+
+        self.assertEqual(arquivo.metadata.num_rows, 5)
+        self.assertEqual(arquivo.metadata.num_row_groups, 3)
+        self.assertEqual(arquivo.schema_arrow.names, ProposicaoReadOnlySerializer.Meta.fields)
+
+    def test_comando(self):
+        """Testa o comando export_dataset."""
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command('export_dataset', '--output-dir', tmp, stdout=io.StringIO())
+            self.assertEqual(
+                sorted(os.listdir(tmp)),
+                ['atividades_camara.csv.gz', 'atividades_senado.csv.gz', 'proposicoes.csv.gz'],
+            )
+            with open(os.path.join(tmp, 'atividades_senado.csv.gz'), 'rb') as f:
+                self.assertEqual(len(self._csv(f.read())), 2)
+
+        with self.assertRaises(CommandError):
+            call_command('export_dataset', 'usuarios', stdout=io.StringIO())
@@ -0,0 +1,186 @@
+import os
+import tempfile
+from unittest.mock import Mock, patch
+
+import requests
+from django.test import SimpleTestCase
+
+from apps.pauta.services_impl.api_config import APIConfig
+from apps.pauta.services_impl.http_cache import HTTPResponseCache, cache_ttl
+from apps.pauta.services_impl.http_client import HTTPSessionPool
+
+
+class HTTPSessionPoolTest(SimpleTestCase):
+    """Testes para o pool de sessões HTTP compartilhado."""
+
+    def setUp(self):
+        self.pool = HTTPSessionPool()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_reutiliza_sessao_por_host(self):
+        """Testa que URLs do mesmo host compartilham a mesma sessão."""
+        s1 = self.pool.get_session(f"{APIConfig.SENADO_BASE_URL}/processo")
+        s2 = self.pool.get_session(f"{APIConfig.SENADO_BASE_URL}/processo/8797561")
+        s3 = self.pool.get_session(f"{APIConfig.CAMARA_BASE_URL}/proposicoes/2386490")
+        self.assertIs(s1, s2)
+        self.assertIsNot(s1, s3)
+
+    def test_sessao_configurada(self):
+        """Testa headers padrão, tamanho do pool e retentativas do adapter."""
+        session = self.pool.get_session(APIConfig.CAMARA_BASE_URL)
+        adapter = session.get_adapter(APIConfig.CAMARA_BASE_URL)
+        self.assertEqual(session.headers['Accept'], 'application/json')
+        self.assertEqual(adapter._pool_maxsize, APIConfig.HTTP_POOL_SIZE)
+        # Sem retentativas de transporte: todas passam pelo bucket em `fetch`
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_get_usa_timeout_separado(self):
+        """Testa que o GET usa timeouts distintos de conexão e leitura."""
+        url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/2386490"
+        session = self.pool.get_session(url)
+        with patch.object(session, 'get') as mock_get:
+            self.pool.get(url, params={'a': 1})
+        mock_get.assert_called_once_with(url, params={'a': 1}, timeout=APIConfig.http_timeout())
+
+
+class AdaptiveFetchTest(SimpleTestCase):
+    """Testes para o GET com rate limit adaptativo."""
+
+    def setUp(self):
+        self.pool = HTTPSessionPool()
+        self.bucket = Mock()
+        self.url = f"{APIConfig.SENADO_BASE_URL}/processo/8797561"
+
+    def _response(self, status, headers=None):
+        response = Mock(status_code=status, content=b'{}')
+        response.headers = headers or {}
+        return response
+
+    def test_resposta_ok_aumenta_taxa(self):
+        """Testa que uma resposta 200 recompensa o bucket sem retentar."""
+        with patch.object(self.pool, 'get', return_value=self._response(200)) as mock_get:
+            response = self.pool.fetch(self.url, self.bucket)
+
+        self.assertEqual(response.status_code, 200)
+        mock_get.assert_called_once()
+        self.bucket.reward.assert_called_once()
+        self.bucket.penalize.assert_not_called()
+
+    def test_429_respeita_retry_after_e_retenta(self):
+        """Testa que 429 reduz a taxa com a pausa do Retry-After e a requisição é repetida."""
+        respostas = [self._response(429, {'Retry-After': '7'}), self._response(200)]
+        with patch.object(self.pool, 'get', side_effect=respostas):
+            response = self.pool.fetch(self.url, self.bucket)
+
+        self.assertEqual(response.status_code, 200)
+        self.bucket.penalize.assert_called_once_with(7.0)
+        self.assertEqual(self.bucket.acquire.call_count, 2)
+
+    @patch('apps.pauta.services_impl.http_client.time.sleep')
+    def test_5xx_retentado_sem_reduzir_taxa(self, mock_sleep):
+        """Testa que 502 é retentado após backoff, consumindo um token por tentativa."""
+        respostas = [self._response(502), self._response(502), self._response(200)]
+        with patch.object(self.pool, 'get', side_effect=respostas):
+            response = self.pool.fetch(self.url, self.bucket)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.bucket.acquire.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.bucket.penalize.assert_not_called()
+
+    @patch('apps.pauta.services_impl.http_client.APIConfig.HTTP_ADAPTIVE_RETRIES', 1)
+    def test_503_persistente_devolve_ultima_resposta(self):
+        """Testa que, esgotadas as tentativas, a última resposta 503 é devolvida."""
+        with patch.object(self.pool, 'get', return_value=self._response(503)):
+            response = self.pool.fetch(self.url, self.bucket)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.bucket.penalize.call_count, 2)
+
+    @patch('apps.pauta.services_impl.http_client.APIConfig.HTTP_ADAPTIVE_RETRIES', 1)
+    def test_erro_de_conexao_relancado_apos_tentativas(self):
+        """Testa que erros de conexão são retentados e depois propagados."""
+        with patch.object(self.pool, 'get', side_effect=requests.exceptions.ConnectionError('reset')):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.pool.fetch(self.url, self.bucket)
+
+        self.assertEqual(self.bucket.penalize.call_count, 2)
+
+
+class HTTPResponseCacheTest(SimpleTestCase):
+    """Testes para o cache em disco das respostas das APIs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HTTPResponseCache(self.tmp.name, max_bytes=10 * 1024 * 1024)
+        self.pool = HTTPSessionPool(cache=self.cache)
+        self.bucket = Mock()
+        self.url = f"{APIConfig.CAMARA_BASE_URL}/proposicoes/2386490/tramitacoes"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _response(self, status, body=b'', headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.url = self.url
+        response._content = body
+        response.headers.update(headers or {})
+        return response
+
+    def test_entrada_valida_nao_gera_requisicao(self):
+        """Testa que uma resposta ainda válida é servida do disco sem consumir rate limit."""
+        with patch.object(self.pool, 'get', return_value=self._response(200, b'{"dados": []}')) as mock_get:
+            self.pool.fetch(self.url, self.bucket)
+            response = self.pool.fetch(self.url, self.bucket)
+
+        mock_get.assert_called_once()
+        self.assertEqual(self.bucket.acquire.call_count, 1)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.json(), {'dados': []})
+
+    def test_revalidacao_condicional_com_304(self):
+        """Testa que entradas vencidas são revalidadas com ETag / Last-Modified."""
+        headers = {'ETag': '"abc"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        with patch.object(self.pool, 'get', return_value=self._response(200, b'{"v": 1}', headers)):
+            self.pool.fetch(self.url, self.bucket)
+
+        # Força o vencimento da entrada
+        key = self.cache.make_key(self.url)
+        entry = self.cache.get(key)
+        self.cache.refresh(key, entry, ttl=0)
+
+        with patch.object(self.pool, 'get', return_value=self._response(304)) as mock_get:
+            response = self.pool.fetch(self.url, self.bucket)
+
+        sent_headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual(sent_headers['If-None-Match'], '"abc"')
+        self.assertEqual(sent_headers['If-Modified-Since'], headers['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'v': 1})
+        self.assertTrue(self.cache.get(key).is_fresh)
+
+    def test_ttl_por_endpoint(self):
+        """Testa a escolha de TTL pela URL do endpoint."""
+        self.assertEqual(cache_ttl(self.url), 6 * 3600)
+        self.assertEqual(cache_ttl(f"{APIConfig.CAMARA_BASE_URL}/deputados/204554"), 7 * 24 * 3600)
+        self.assertEqual(cache_ttl(f"{APIConfig.SENADO_BASE_URL}/processo"), 12 * 3600)
+
+    def test_eviccao_lru(self):
+        """Testa que as entradas usadas há mais tempo são removidas ao exceder o limite."""
+        cache = HTTPResponseCache(self.tmp.name, max_bytes=4000)
+        keys = []
+        for i in range(3):
+            key = cache.make_key(self.url, {'pagina': i})
+            cache.store(key, self._response(200, b'x' * 1000), ttl=60)
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+            keys.append(key)
+
+        # Usa a primeira entrada, tornando-a a mais recente
+        cache.get(keys[0])
+        cache.store(cache.make_key(self.url, {'pagina': 3}), self._response(200, b'x' * 1000), ttl=60)
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
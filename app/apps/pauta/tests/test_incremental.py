@@ -0,0 +1,134 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory, DeletedRecord
+from ..services_impl.selection_service import SelectionService
+
+ANTIGO = datetime(2024, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+RECENTE = datetime(2024, 6, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class IncrementalRefreshTest(TestCase):
+    """Testes para os filtros incrementais (updated_since / RangeStart / RangeEnd) e tombstones."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.eixo = Eixo.objects.create(id=93, nome="Eixo Incremental")
+        self.tema = Tema.objects.create(eixo=self.eixo, nome="Incremental")
+        self.antiga = Proposicao.objects.create(tema=self.tema, tipo='PL', numero=1, ano=2023)
+        self.recente = Proposicao.objects.create(tema=self.tema, tipo='PL', numero=2, ano=2023)
+        CamaraActivityHistory.objects.create(
+            proposicao=self.antiga, sequencia=1, sigla_orgao='PLEN',
+            data_hora=datetime(2023, 9, 1, 10, 0, tzinfo=dt_timezone.utc),
+            descricao_tramitacao='x', cod_tipo_tramitacao='1', despacho='',
+        )
+
+        Proposicao.objects.filter(pk=self.antiga.pk).update(updated_at=ANTIGO)
+        Proposicao.objects.filter(pk=self.recente.pk).update(updated_at=RECENTE)
+        CamaraActivityHistory.objects.update(updated_at=ANTIGO)
+
+    def _ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.json()]
+
+    def test_updated_since(self):
+        """Testa que apenas as linhas alteradas a partir do instante são retornadas."""
+        url = reverse('pauta:bi-proposicao-list')
+        self.assertEqual(self._ids(url, updated_since='2024-03-01T00:00:00Z'), [self.recente.pk])
+        self.assertEqual(self._ids(url, updated_since=RECENTE.isoformat()), [self.recente.pk])
+        self.assertEqual(len(self._ids(url, updated_since='2023-12-31')), 2)
+
+    def test_range_start_end(self):
+        """Testa o intervalo [RangeStart, RangeEnd) da atualização incremental do Power BI."""
+        url = reverse('pauta:bi-proposicao-list')
+        self.assertEqual(self._ids(url, RangeStart='2024-01-01', RangeEnd='2024-06-01T12:00:00Z'), [self.antiga.pk])
+
+        url = reverse('pauta:camara-activity-list')
+        self.assertEqual(len(self._ids(url, RangeStart='2023-12-01', RangeEnd='2024-02-01')), 1)
+        self.assertEqual(self._ids(url, RangeStart='2024-02-01'), [])
+
+    def test_data_invalida(self):
+        """Testa que uma data inválida retorna 400."""
+        response = self.client.get(reverse('pauta:bi-tema-list'), {'updated_since': 'ontem'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('updated_since', response.json())
+
+    def test_exclusoes_geram_tombstones(self):
+        """Testa os tombstones, inclusive das exclusões em cascata, e o endpoint de exclusões."""
+        atividade_id = CamaraActivityHistory.objects.get().pk
+        proposicao_id = self.antiga.pk
+        antes = datetime.now(dt_timezone.utc)
+        self.antiga.delete()
+
+        registros = set(DeletedRecord.objects.values_list('model', 'object_id'))
+        self.assertEqual(registros, {('proposicao', proposicao_id), ('atividade_camara', atividade_id)})
+
+        response = self.client.get(reverse('pauta:bi-exclusao-list'), {'updated_since': antes.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({(item['model'], item['object_id']) for item in response.json()}, registros)
+        response = self.client.get(reverse('pauta:bi-exclusao-list'), {'RangeEnd': '2020-01-01'})
+        self.assertEqual(response.json(), [])
+
+    def test_contagens_e_selecao_tocam_o_pai(self):
+        """Testa que mudanças em campos derivados do tema e do eixo atualizam seu updated_at."""
+        Tema.objects.update(updated_at=ANTIGO)
+        Eixo.objects.update(updated_at=ANTIGO)
+
+        SelectionService().atualizar_selecao_proposicoes()
+        self.assertGreater(Tema.objects.get().updated_at, ANTIGO)
+
+        Tema.objects.update(updated_at=ANTIGO)
+        Proposicao.objects.create(tema=self.tema, tipo='PL', numero=3, ano=2023)
+        self.assertGreater(Tema.objects.get().updated_at, ANTIGO)
+
+        Tema.objects.create(eixo=self.eixo, nome="Outro")
+        self.assertEqual(self._ids(reverse('pauta:bi-eixo-list'), updated_since='2024-03-01'), [self.eixo.pk])
+
+    def test_upsert_em_lote_atualiza_updated_at(self):
+        """Testa que o upsert do histórico (bulk_create) grava updated_at."""
+        from ..services_impl.activity_sync_service import ActivitySyncService
+        ActivitySyncService().aplicar_atividades_senado(self.recente, {
+            'autuacoes': [{'informesLegislativos': [{'id': 1, 'data': '2024-07-01', 'descricao': 'Leitura'}]}],
+        })
+        self.assertGreater(SenadoActivityHistory.objects.get().updated_at, RECENTE)
+
+    def test_campos_derivados_entram_no_delta(self):
+        """Testa que a mudança de current_house pela sincronização aparece em updated_since."""
+        from ..services_impl.activity_sync_service import ActivitySyncService
+        ActivitySyncService().aplicar_atividades_senado(self.antiga, {
+            'autuacoes': [{'informesLegislativos': [{'id': 1, 'data': '2024-07-01', 'descricao': 'Leitura'}]}],
+        })
+        self.antiga.refresh_from_db()
+        self.assertEqual(self.antiga.current_house, 'SF')
+        ids = self._ids(reverse('pauta:bi-proposicao-list'), updated_since='2024-03-01')
+        self.assertIn(self.antiga.pk, ids)
+
+    def test_mudanca_de_pai_toca_os_dois_pais(self):
+        """Testa que mover proposição de tema (e tema de eixo) atualiza o pai antigo e o novo."""
+        outro_eixo = Eixo.objects.create(id=94, nome="Eixo Destino")
+        outro_tema = Tema.objects.create(eixo=outro_eixo, nome="Destino")
+        Tema.objects.update(updated_at=ANTIGO)
+        Eixo.objects.update(updated_at=ANTIGO)
+
+        proposicao = Proposicao.objects.get(pk=self.recente.pk)
+        proposicao.tema = outro_tema
+        proposicao.save()
+        url = reverse('pauta:bi-tema-list')
+        self.assertEqual(sorted(self._ids(url, updated_since='2024-03-01')), sorted([self.tema.pk, outro_tema.pk]))
+
+        # Salvar de novo sem mudar o tema não toca ninguém
+        Tema.objects.update(updated_at=ANTIGO)
+        proposicao.ementa = 'Nova ementa'
+        proposicao.save()
+        self.assertEqual(self._ids(url, updated_since='2024-03-01'), [])
+
+        tema = Tema.objects.get(pk=outro_tema.pk)
+        tema.eixo = self.eixo
+        tema.save(update_fields=['eixo'])
+        url = reverse('pauta:bi-eixo-list')
+        self.assertEqual(sorted(self._ids(url, updated_since='2024-03-01')), sorted([self.eixo.pk, outro_eixo.pk]))
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.pauta.models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from apps.pauta.services_impl.data_processing_service import DataProcessingService
+from apps.pauta.services_impl.payload_archive import PayloadArchive
+from apps.pauta.services_impl.sync_orchestrator_service import SyncOrchestratorService
+
+
+class PayloadArchiveTest(SimpleTestCase):
+    """Testes para o arquivo de payloads endereçado por conteúdo."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = PayloadArchive(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _objects(self):
+        return [
+            name
+            for _root, _dirs, files in os.walk(os.path.join(self.directory, 'objects'))
+            for name in files
+        ]
+
+    def test_store_e_load(self):
+        """Testa que o corpo arquivado é recuperado byte a byte."""
+        body = json.dumps({'dados': [{'id': 1}]}).encode('utf-8')
+        self.archive.store(PayloadArchive.CAMARA_DETALHES, 2386490, body)
+
+        self.assertEqual(self.archive.load_bytes(PayloadArchive.CAMARA_DETALHES, 2386490), body)
+        self.assertEqual(self.archive.load_json(PayloadArchive.CAMARA_DETALHES, 2386490), {'dados': [{'id': 1}]})
+        self.assertIsNone(self.archive.load_json(PayloadArchive.CAMARA_DETALHES, 1))
+
+    def test_payloads_identicos_deduplicados(self):
+        """Testa que o mesmo conteúdo é gravado uma única vez."""
+        body = b'{"dados": []}'
+        d1 = self.archive.store(PayloadArchive.CAMARA_AUTORES, 1, body)
+        d2 = self.archive.store(PayloadArchive.CAMARA_AUTORES, 2, body)
+
+        self.assertEqual(d1, d2)
+        self.assertEqual(len(self._objects()), 1)
+        self.assertEqual([ident for ident, _ in self.archive.refs(PayloadArchive.CAMARA_AUTORES)], ['1', '2'])
+
+    def test_referencia_aponta_para_versao_mais_recente(self):
+        """Testa que um novo payload do mesmo recurso substitui a referência."""
+        self.archive.store(PayloadArchive.SENADO_PROCESSO, 10, b'{"v": 1}')
+        self.archive.store(PayloadArchive.SENADO_PROCESSO, 10, b'{"v": 2}')
+
+        self.assertEqual(self.archive.load_json(PayloadArchive.SENADO_PROCESSO, 10), {'v': 2})
+        self.assertEqual(len(self._objects()), 2)
+
+
+class ReprocessFromArchiveTest(TestCase):
+    """Testes para o reprocessamento offline a partir do arquivo."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = PayloadArchive(self.directory)
+        eixo = Eixo.objects.create(id=31, nome="Eixo Arquivo")
+        tema = Tema.objects.create(eixo=eixo, nome="Arquivo")
+        self.proposicao = Proposicao.objects.create(tema=tema, tipo='PL', numero=4381, ano=2023)
+        self.orchestrator = SyncOrchestratorService()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _store(self, kind, ident, data):
+        self.archive.store(kind, ident, json.dumps(data).encode('utf-8'))
+
+    def test_reconstroi_proposicao_e_historicos(self):
+        """Testa que proposição e históricos das duas casas são reconstruídos sem rede."""
+        self._store(PayloadArchive.SENADO_BUSCA, 'PL-4381-2023', [{
+            'id': 8797561,
+            'identificacao': 'PL 4381/2023',
+            'objetivo': 'Revisora',
+            'ementa': 'Ementa do Senado',
+        }])
+        self._store(PayloadArchive.CAMARA_BUSCA, 'PL-4381-2023', {'dados': [{'id': 2386490}]})
+        self._store(PayloadArchive.CAMARA_DETALHES, 2386490, {'dados': {
+            'id': 2386490, 'ementa': 'Ementa da Câmara', 'dataApresentacao': '2023-09-12T10:00',
+        }})
+        self._store(PayloadArchive.CAMARA_AUTORES, 2386490, {'dados': []})
+        self._store(PayloadArchive.SENADO_PROCESSO, 8797561, {'autuacoes': [{'informesLegislativos': [
+            {'id': 1, 'data': '2024-03-01', 'descricao': 'Recebido'},
+            {'id': 2, 'data': '2024-03-02', 'documentosAssociados': []},
+        ]}]})
+        self._store(PayloadArchive.CAMARA_TRAMITACOES, 2386490, {'dados': [
+            {'sequencia': 1, 'dataHora': '2023-09-12T10:00', 'siglaOrgao': 'PLEN'},
+        ]})
+
+        original = DataProcessingService.update_derived_fields
+        with mock.patch.object(DataProcessingService, 'update_derived_fields', autospec=True,
+                               side_effect=original) as update_derived_fields:
+            self.assertTrue(self.orchestrator.reprocess_from_archive(self.proposicao, self.archive))
+        # Uma vez só, ao fim do bloco de atividades
+        self.assertEqual(update_derived_fields.call_count, 1)
+
+        self.proposicao.refresh_from_db()
+        self.assertEqual(self.proposicao.sf_id, 8797561)
+        self.assertEqual(self.proposicao.cd_id, 2386490)
+        self.assertEqual(self.proposicao.iniciadora, 'CD')
+        self.assertEqual(self.proposicao.current_house, 'SF')
+        self.assertIsNone(self.proposicao.ultima_sincronizacao)
+        self.assertEqual(SenadoActivityHistory.objects.filter(proposicao=self.proposicao).count(), 1)
+        self.assertEqual(CamaraActivityHistory.objects.filter(proposicao=self.proposicao).count(), 1)
+
+    def test_sem_payloads_nao_marca_not_found(self):
+        """Testa que a ausência de payloads não é tratada como 'NOT FOUND'."""
+        self.assertFalse(self.orchestrator.reprocess_from_archive(self.proposicao, self.archive))
+
+        self.proposicao.refresh_from_db()
+        self.assertIsNone(self.proposicao.erro_sincronizacao)
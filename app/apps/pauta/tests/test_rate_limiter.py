@@ -0,0 +1,81 @@
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.pauta.services_impl.api_config import RateLimiter, TokenBucket
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Testes para o token bucket usado no rate limiting das APIs."""
+
+    @patch('apps.pauta.services_impl.api_config.time.sleep')
+    def test_rajada_ate_capacidade(self, mock_sleep):
+        """Testa que a capacidade é consumida sem espera e o excedente espera 1/rate."""
+        bucket = TokenBucket('teste', rate=10, capacity=3)
+        with patch('apps.pauta.services_impl.api_config.time.time', return_value=1000.0):
+            waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.1)
+        mock_sleep.assert_called_once()
+
+    @patch('apps.pauta.services_impl.api_config.time.sleep')
+    def test_threads_nao_excedem_orcamento(self, mock_sleep):
+        """Testa que threads concorrentes reservam tokens distintos."""
+        bucket = TokenBucket('teste', rate=5, capacity=1)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.acquire()
+            with lock:
+                waits.append(wait)
+
+        with patch('apps.pauta.services_impl.api_config.time.time', return_value=1000.0):
+            threads = [threading.Thread(target=worker) for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(sorted(round(w, 3) for w in waits), [0.0, 0.2, 0.4, 0.6, 0.8])
+
+    @patch('apps.pauta.services_impl.api_config.time.sleep')
+    def test_estado_compartilhado_entre_processos(self, mock_sleep):
+        """Testa que buckets com o mesmo arquivo de estado dividem o saldo."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            a = TokenBucket('senado', rate=10, capacity=2, state_dir=state_dir)
+            b = TokenBucket('senado', rate=10, capacity=2, state_dir=state_dir)
+            with patch('apps.pauta.services_impl.api_config.time.time', return_value=1000.0):
+                self.assertEqual(a.acquire(), 0.0)
+                self.assertEqual(b.acquire(), 0.0)
+                self.assertAlmostEqual(a.acquire(), 0.1)
+            a._state_file.close()
+            b._state_file.close()
+
+    @patch('apps.pauta.services_impl.api_config.time.sleep')
+    def test_aimd(self, mock_sleep):
+        """Testa aumento aditivo, redução multiplicativa e pausa do Retry-After."""
+        bucket = TokenBucket('teste', rate=10, capacity=1, max_rate=10.2)
+        bucket.reward(latency=0.1)
+        bucket.reward(latency=0.1)
+        bucket.reward(latency=0.1)
+        self.assertAlmostEqual(bucket.rate, 10.2)
+
+        with patch('apps.pauta.services_impl.api_config.time.time', return_value=2000.0):
+            bucket.penalize(pause=3.0)
+            self.assertAlmostEqual(bucket.rate, 5.1)
+            self.assertAlmostEqual(bucket.acquire(), 3.0)
+
+    def test_latencia_alta_reduz_taxa(self):
+        """Testa que respostas lentas reduzem levemente a taxa."""
+        bucket = TokenBucket('teste', rate=10, capacity=1)
+        bucket.reward(latency=60.0)
+        self.assertLess(bucket.rate, 10)
+
+    def test_rate_limiters_compartilham_buckets(self):
+        """Testa que instâncias distintas de RateLimiter usam os mesmos buckets."""
+        self.assertIs(RateLimiter().senado_bucket, RateLimiter().senado_bucket)
+        self.assertIs(RateLimiter().camara_bucket, RateLimiter().camara_bucket)
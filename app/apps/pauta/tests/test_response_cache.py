@@ -0,0 +1,169 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..data_version import batched_data_version, get_data_version
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory
+from ..services_impl.selection_service import SelectionService
+
+
+class DataVersionTest(TestCase):
+    """Testes para o contador global de versão dos dados."""
+
+    def setUp(self):
+        self.eixo = Eixo.objects.create(id=90, nome="Eixo Versão")
+
+    def test_sinais_incrementam_versao(self):
+        """Testa que criar, alterar e apagar registros incrementa a versão."""
+        inicial = get_data_version().number
+        tema = Tema.objects.create(eixo=self.eixo, nome="Versão")
+        tema.nome = "Versão 2"
+        tema.save()
+        tema.delete()
+        self.assertEqual(get_data_version().number, inicial + 3)
+
+    def test_lote_incrementa_uma_vez(self):
+        """Testa que, dentro de batched_data_version, a versão sobe uma única vez."""
+        inicial = get_data_version().number
+        with batched_data_version():
+            tema = Tema.objects.create(eixo=self.eixo, nome="Lote")
+            for numero in range(5):
+                Proposicao.objects.create(tema=tema, tipo='PL', numero=numero, ano=2023)
+            self.assertEqual(get_data_version().number, inicial)
+        self.assertEqual(get_data_version().number, inicial + 1)
+
+    def test_caminhos_em_lote_incrementam(self):
+        """Testa que o UPDATE em lote da seleção (sem sinais) também incrementa a versão."""
+        tema = Tema.objects.create(eixo=self.eixo, nome="Seleção")
+        Proposicao.objects.create(tema=tema, tipo='PL', numero=1, ano=2023)
+        inicial = get_data_version().number
+
+        SelectionService().atualizar_selecao_proposicoes()
+        self.assertEqual(get_data_version().number, inicial + 1)
+        SelectionService().atualizar_selecao_proposicoes()  # nada muda
+        self.assertEqual(get_data_version().number, inicial + 1)
+
+
+@override_settings(API_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTest(TestCase):
+    """Testes para o cache de respostas dos endpoints read-only."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        eixo = Eixo.objects.create(id=91, nome="Eixo Cache")
+        self.tema = Tema.objects.create(eixo=eixo, nome="Cache")
+        self.proposicao = Proposicao.objects.create(
+            tema=self.tema, tipo='PL', numero=1, ano=2023, data_apresentacao=date(2023, 1, 1),
+        )
+        self.url = reverse('pauta:bi-tema-list')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_segunda_requisicao_vem_do_cache(self):
+        """Testa que a resposta repetida vem do cache, com uma única consulta (a versão)."""
+        primeira = self.client.get(self.url, {'eixo__id': 91, 'ordering': 'nome'})
+        self.assertEqual(primeira['X-Cache'], 'MISS')
+
+        with CaptureQueriesContext(connection) as queries:
+            segunda = self.client.get(self.url, {'ordering': 'nome', 'eixo__id': 91})
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(segunda.content, primeira.content)
+        self.assertEqual(len(queries), 1)
+
+    def test_alteracao_invalida_o_cache(self):
+        """Testa que alterações por sinal e pela sincronização invalidam as respostas."""
+        self.client.get(self.url)
+        self.tema.nome = "Cache renomeado"
+        self.tema.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()[0]['nome'], "Cache renomeado")
+
+        url = reverse('pauta:senado-activity-list')
+        self.assertEqual(self.client.get(url).json(), [])
+        SenadoActivityHistory.objects.create(
+            proposicao=self.proposicao, id_informe=1, data=date(2024, 1, 2), descricao='Leitura',
+        )
+        self.assertEqual(len(self.client.get(url).json()), 1)
+
+    def test_parametros_e_formatos_distintos(self):
+        """Testa que filtros e formatos diferentes não compartilham a entrada."""
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'eixo__id': 999})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json(), [])
+
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        self.assertTrue(response.streaming)
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(API_RESPONSE_CACHE_ENABLED=False)
+    def test_desativado(self):
+        """Testa que, desativado, o cache não é consultado."""
+        self.client.get(self.url)
+        self.assertNotIn('X-Cache', self.client.get(self.url))
+
+
+class ConditionalGetTest(TestCase):
+    """Testes para ETag / Last-Modified e respostas 304 dos endpoints read-only."""
+
+    def setUp(self):
+        self.client = APIClient()
+        eixo = Eixo.objects.create(id=92, nome="Eixo Condicional")
+        self.tema = Tema.objects.create(eixo=eixo, nome="Condicional")
+        self.url = reverse('pauta:bi-eixo-list')
+
+    def test_if_none_match_retorna_304(self):
+        """Testa que o ETag conhecido resulta em 304 com uma única consulta."""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"v'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_alteracao_muda_etag(self):
+        """Testa que uma alteração nos dados gera novo ETag e resposta completa."""
+        etag = self.client.get(self.url)['ETag']
+        self.tema.delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0]['temas_count'], 0)
+
+    def test_etag_por_representacao(self):
+        """Testa que filtros e formatos diferentes têm ETags diferentes."""
+        url = reverse('pauta:bi-tema-list')
+        padrao = self.client.get(url)['ETag']
+        self.assertNotEqual(self.client.get(url, {'eixo__id': 92})['ETag'], padrao)
+        ndjson = self.client.get(url, {'format': 'ndjson'})
+        self.assertNotEqual(ndjson['ETag'], padrao)
+
+        response = self.client.get(reverse('pauta:camara-activity-list'), HTTP_IF_NONE_MATCH=padrao)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self):
+        """Testa If-Modified-Since com o Last-Modified recebido."""
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
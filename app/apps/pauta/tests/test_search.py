@@ -0,0 +1,67 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory
+from ..search import FullTextSearchFilter
+from ..views import ProposicaoReadOnlyViewSet
+
+
+class FullTextSearchTest(TestCase):
+    """Testes para a busca textual (?search=) dos endpoints de proposições e atividades."""
+
+    def setUp(self):
+        self.client = APIClient()
+        eixo = Eixo.objects.create(id=94, nome="Eixo Busca")
+        self.tema = Tema.objects.create(eixo=eixo, nome="Políticas Sociais")
+        self.saude = Proposicao.objects.create(
+            tema=self.tema, tipo='PL', numero=1, ano=2023, ementa='Dispõe sobre a saúde pública',
+        )
+        self.outra = Proposicao.objects.create(
+            tema=self.tema, tipo='PEC', numero=2, ano=2023, ementa='Altera o sistema tributário',
+        )
+        SenadoActivityHistory.objects.create(
+            proposicao=self.saude, id_informe=1, data=date(2024, 1, 2),
+            descricao='Aprovado o requerimento', colegiado_nome='Comissão de Assuntos Sociais',
+        )
+
+    def _ids(self, url, **params):
+        return [item['id'] for item in self.client.get(url, params).json()]
+
+    def test_fallback_sqlite(self):
+        """Testa que, fora do PostgreSQL, a busca mantém o SearchFilter (icontains)."""
+        url = reverse('pauta:bi-proposicao-list')
+        self.assertEqual(self._ids(url, search='saúde'), [self.saude.pk])
+        self.assertEqual(self._ids(url, search='PEC'), [self.outra.pk])
+        self.assertEqual(len(self._ids(url, search='Políticas')), 2)  # nome do tema
+
+        url = reverse('pauta:senado-activity-list')
+        self.assertEqual(len(self._ids(url, search='Assuntos Sociais')), 1)
+        self.assertEqual(self._ids(url, search='inexistente'), [])
+
+    def test_sql_postgres(self):
+        """Testa a consulta gerada no PostgreSQL: tsvector português, índice GIN e ordenação por relevância."""
+        pg = PostgresDatabaseWrapper({**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'}, 'pg')
+        request = Request(APIRequestFactory().get('/', {'search': 'saúde pública'}))
+        view = ProposicaoReadOnlyViewSet()
+
+        with mock.patch('apps.pauta.search.connections', {'default': pg}):
+            queryset = FullTextSearchFilter().filter_queryset(request, Proposicao.objects.order_by('id'), view)
+        sql, params = queryset.query.get_compiler(connection=pg).as_sql()
+
+        self.assertIn('@@ (websearch_to_tsquery(%s::regconfig, %s))', sql)
+        self.assertIn('"pauta_tema"."nome"', sql)  # nomes do tema continuam com icontains
+        self.assertNotIn('AS "search_document"', sql)
+        self.assertIn('DESC', sql.split('ORDER BY')[1])
+        self.assertIn('portuguese', params)
+
+        index = next(i for i in Proposicao._meta.indexes if isinstance(i, GinIndex))
+        index_sql = str(index.create_sql(Proposicao, pg.schema_editor(collect_sql=True)))
+        self.assertIn("USING gin ((to_tsvector('portuguese'::regconfig, COALESCE(\"tipo\", '')", index_sql)
@@ -0,0 +1,72 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.pauta.models import Eixo, Tema, Proposicao
+from apps.pauta.services_impl.selection_service import SelectionService
+
+
+class SelectionServiceTest(TestCase):
+    """Testes para o recálculo em conjunto da seleção por tema."""
+
+    def setUp(self):
+        eixo = Eixo.objects.create(id=40, nome="Eixo Seleção")
+        self.com_data = Tema.objects.create(eixo=eixo, nome="Com data")
+        self.sem_data = Tema.objects.create(eixo=eixo, nome="Sem data")
+        self.vazio = Tema.objects.create(eixo=eixo, nome="Vazio")
+
+        self.recente = Proposicao.objects.create(
+            tema=self.com_data, tipo='PL', numero=1, ano=2023, data_apresentacao=date(2023, 5, 1), selected=True
+        )
+        self.antiga = Proposicao.objects.create(
+            tema=self.com_data, tipo='PL', numero=2, ano=2023, data_apresentacao=date(2021, 5, 1)
+        )
+        self.sem_data_item = Proposicao.objects.create(tema=self.com_data, tipo='PL', numero=3, ano=2023)
+
+        self.primeira = Proposicao.objects.create(tema=self.sem_data, tipo='PL', numero=4, ano=2023)
+        self.segunda = Proposicao.objects.create(tema=self.sem_data, tipo='PL', numero=5, ano=2023)
+
+        self.service = SelectionService()
+
+    def _selecionadas(self):
+        return set(Proposicao.objects.filter(selected=True).values_list('pk', flat=True))
+
+    def test_seleciona_data_mais_antiga_ou_menor_id(self):
+        """Testa a regra de seleção e o formato das estatísticas."""
+        stats = self.service.atualizar_selecao_proposicoes()
+
+        self.assertEqual(stats, {'total_temas': 2, 'total_atualizadas': 2, 'erros': 0})
+        self.assertEqual(self._selecionadas(), {self.antiga.pk, self.primeira.pk})
+
+    def test_numero_fixo_de_consultas(self):
+        """Testa que o recálculo não depende do número de temas."""
+        with CaptureQueriesContext(connection) as poucos:
+            self.service.atualizar_selecao_proposicoes()
+
+        eixo = Eixo.objects.get(id=40)
+        for i in range(10):
+            tema = Tema.objects.create(eixo=eixo, nome=f"Extra {i}")
+            Proposicao.objects.create(tema=tema, tipo='PEC', numero=i, ano=2024)
+        with CaptureQueriesContext(connection) as muitos:
+            self.service.atualizar_selecao_proposicoes()
+
+        self.assertEqual(len(poucos), len(muitos))
+
+    def test_incremental_afeta_apenas_temas_informados(self):
+        """Testa que a variante incremental não toca outros temas."""
+        self.service.atualizar_selecao_temas([self.sem_data.pk])
+        self.assertEqual(self._selecionadas(), {self.recente.pk, self.primeira.pk})
+
+        Proposicao.objects.filter(pk=self.segunda.pk).update(data_apresentacao=date(2022, 1, 1))
+        stats = self.service.atualizar_selecao_temas([self.sem_data.pk, self.vazio.pk])
+
+        self.assertEqual(stats, {'total_temas': 1, 'total_atualizadas': 1, 'erros': 0})
+        self.assertEqual(self._selecionadas(), {self.recente.pk, self.segunda.pk})
+
+    def test_atualizar_selecao_tema(self):
+        """Testa o retorno booleano da atualização de um único tema."""
+        self.assertTrue(self.service.atualizar_selecao_tema(self.com_data))
+        self.assertFalse(self.service.atualizar_selecao_tema(self.vazio))
+        self.assertEqual(self._selecionadas(), {self.antiga.pk})
@@ -0,0 +1,146 @@
+from unittest.mock import Mock, patch
+
+import requests
+
+from django.test import TestCase
+
+from apps.pauta.models import Eixo, Tema, Proposicao
+from apps.pauta.services_impl.data_fetcher_service import DataFetcherService, UpstreamUnavailableError
+from apps.pauta.services_impl.sync_orchestrator_service import SyncOrchestratorService
+
+
+class SyncAllProposicoesConcurrentTest(TestCase):
+    """Testes para o modo concorrente de `sync_all_proposicoes`."""
+
+    def setUp(self):
+        self.eixo = Eixo.objects.create(id=30, nome="Eixo Sync")
+        self.tema = Tema.objects.create(eixo=self.eixo, nome="Sync")
+        for numero in range(1, 6):
+            Proposicao.objects.create(tema=self.tema, tipo='PL', numero=numero, ano=2023)
+        self.orchestrator = SyncOrchestratorService()
+
+    @patch('apps.pauta.services_impl.sync_orchestrator_service.APIConfig.SYNC_RETRY_PASSES', 0)
+    def test_estatisticas_com_workers(self):
+        """Testa que o modo concorrente processa tudo e mantém o formato das estatísticas."""
+        resultados = {1: True, 2: False, 3: True, 4: True, 5: False}
+
+        with patch.object(self.orchestrator, 'sync_proposicao',
+                          side_effect=lambda p: resultados[p.numero]) as mock_sync:
+            stats = self.orchestrator.sync_all_proposicoes(workers=3)
+
+        self.assertEqual(mock_sync.call_count, 5)
+        self.assertEqual(stats, {'total': 5, 'sucessos': 3, 'erros': 2})
+
+    def test_falhas_transitorias_retentadas_no_mesmo_lote(self):
+        """Testa a repescagem de falhas transitórias, exceto 'NOT FOUND'."""
+        tentativas = {}
+
+        def sync(proposicao):
+            tentativas[proposicao.numero] = tentativas.get(proposicao.numero, 0) + 1
+            if proposicao.numero == 4:
+                proposicao.erro_sincronizacao = 'NOT FOUND'
+                return False
+            # Proposição 2 falha apenas na primeira tentativa
+            return not (proposicao.numero == 2 and tentativas[2] == 1)
+
+        with patch.object(self.orchestrator, 'sync_proposicao', side_effect=sync):
+            stats = self.orchestrator.sync_all_proposicoes(workers=2)
+
+        self.assertEqual(stats, {'total': 5, 'sucessos': 4, 'erros': 1})
+        self.assertEqual(tentativas[2], 2)
+        self.assertEqual(tentativas[4], 1)
+
+    def test_falha_inesperada_conta_como_erro(self):
+        """Testa que exceções em um worker não derrubam o lote."""
+        def sync(proposicao):
+            if proposicao.numero == 2:
+                raise RuntimeError("boom")
+            return True
+
+        with patch.object(self.orchestrator, 'sync_proposicao', side_effect=sync):
+            stats = self.orchestrator.sync_all_proposicoes(limit=3, workers=2)
+
+        self.assertEqual(stats, {'total': 3, 'sucessos': 2, 'erros': 1})
+
+    @patch('apps.pauta.services_impl.sync_orchestrator_service.APIConfig.SYNC_RETRY_PASSES', 1)
+    @patch('apps.pauta.services_impl.sync_orchestrator_service.time.sleep')
+    def test_upstream_indisponivel_nao_vira_not_found(self, _sleep):
+        """Testa que 429/5xx esgotados são retentados e não gravados como 'NOT FOUND'."""
+        fetcher = self.orchestrator.fetcher
+        erro = UpstreamUnavailableError("503 from https://legis.senado.leg.br/dadosabertos/processo")
+        with patch.object(fetcher, 'fetch_proposicao_senado', side_effect=erro) as senado, \
+                patch.object(fetcher, 'fetch_proposicao_camara_search') as camara:
+            stats = self.orchestrator.sync_all_proposicoes(limit=1, workers=1)
+
+        self.assertEqual(stats, {'total': 1, 'sucessos': 0, 'erros': 1})
+        self.assertEqual(senado.call_count, 2)
+        camara.assert_not_called()
+        proposicao = Proposicao.objects.get(numero=1)
+        self.assertIn('503', proposicao.erro_sincronizacao)
+        self.assertIsNone(proposicao.ultima_sincronizacao)
+
+
+class DataFetcherErrorsTest(TestCase):
+    """Testes para a distinção entre 'não encontrado' e falha transitória no fetcher."""
+
+    def setUp(self):
+        self.fetcher = DataFetcherService()
+        self.fetcher.archive = None
+
+    def _respondendo(self, status_code):
+        return patch.object(self.fetcher.http, 'fetch', return_value=Mock(
+            status_code=status_code, url='https://dadosabertos.camara.leg.br/api/v2/proposicoes',
+        ))
+
+    def test_404_e_nao_encontrado(self):
+        with self._respondendo(404):
+            self.assertIsNone(self.fetcher.fetch_proposicao_camara_search('PL', 1, 2023))
+
+    def test_throttle_e_5xx_levantam_erro_transitorio(self):
+        for status_code in (429, 503, 500):
+            with self._respondendo(status_code), self.assertRaises(UpstreamUnavailableError):
+                self.fetcher.fetch_proposicao_camara_details(2386490)
+
+    def test_erro_de_rede_levanta_erro_transitorio(self):
+        with patch.object(self.fetcher.http, 'fetch', side_effect=requests.exceptions.ConnectionError("reset")):
+            with self.assertRaises(UpstreamUnavailableError):
+                self.fetcher.fetch_proposicao_senado('PL', 1, 2023)
+
+
+class BatchSelectionTest(TestCase):
+    """Testes para a atualização de seleção agrupada por lote."""
+
+    def setUp(self):
+        eixo = Eixo.objects.create(id=35, nome="Eixo Lote Seleção")
+        self.tema_a = Tema.objects.create(eixo=eixo, nome="Tema A")
+        self.tema_b = Tema.objects.create(eixo=eixo, nome="Tema B")
+        for numero in range(1, 5):
+            Proposicao.objects.create(tema=self.tema_a, tipo='PL', numero=numero, ano=2023)
+        Proposicao.objects.create(tema=self.tema_b, tipo='PL', numero=5, ano=2023)
+        Proposicao.objects.create(tema=self.tema_b, tipo='PL', numero=6, ano=2023,
+                                  ultima_sincronizacao='2024-01-01T00:00Z')
+
+        self.orchestrator = SyncOrchestratorService()
+        fetcher = self.orchestrator.fetcher
+        patch.object(fetcher, 'fetch_proposicao_senado', return_value=None).start()
+        patch.object(fetcher, 'fetch_proposicao_camara_search', return_value=None).start()
+        patch.object(self.orchestrator.processor, 'process_proposicao_sync_data', return_value=True).start()
+        self.addCleanup(patch.stopall)
+
+    def test_lote_recalcula_temas_tocados_uma_vez(self):
+        """Testa que o lote não atualiza a seleção por proposição e recalcula cada tema uma vez."""
+        selection = self.orchestrator.selection
+        with patch.object(selection, 'atualizar_selecao_tema') as por_tema, \
+                patch.object(selection, 'atualizar_selecao_temas') as em_lote:
+            stats = self.orchestrator.sync_all_proposicoes(workers=2)
+
+        self.assertEqual(stats, {'total': 5, 'sucessos': 5, 'erros': 0})
+        por_tema.assert_not_called()
+        em_lote.assert_called_once_with({self.tema_a.pk, self.tema_b.pk})
+
+    def test_sincronizacao_individual_atualiza_imediatamente(self):
+        """Testa que a sincronização de uma proposição mantém a atualização imediata."""
+        proposicao = Proposicao.objects.get(numero=1)
+        with patch.object(self.orchestrator.selection, 'atualizar_selecao_tema') as por_tema:
+            self.assertTrue(self.orchestrator.sync_proposicao(proposicao))
+        por_tema.assert_called_once_with(proposicao.tema)
@@ -0,0 +1,90 @@
+from io import StringIO
+from datetime import date
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from ..synthetic_data import EIXO_ID_START, INT4_MAX, NUMERO_START, SENADO_COLUNAS, _copy
+
+
+class GenerateSyntheticDataTest(TestCase):
+    """Testes para o comando generate_synthetic_data."""
+
+    VOLUMES = ['--eixos', '3', '--temas', '7', '--proposicoes', '60', '--atividades', '500']
+
+    def _gerar(self, *args):
+        call_command('generate_synthetic_data', *self.VOLUMES, *args, stdout=StringIO())
+
+    def _retrato(self):
+        """Conteúdo gerado, sem ids de chave substituta nem timestamps"""
+        return (
+            list(Tema.objects.order_by('nome').values_list('eixo_id', 'nome')),
+            list(Proposicao.objects.order_by('tipo', 'ano', 'numero').values_list(
+                'tema__nome', 'tipo', 'numero', 'ano', 'autor', 'ementa', 'iniciadora', 'data_apresentacao', 'selected',
+            )),
+            list(CamaraActivityHistory.objects.order_by('proposicao__tipo', 'proposicao__ano', 'proposicao__numero', 'sequencia')
+                 .values_list('sequencia', 'data_hora', 'sigla_orgao', 'despacho')),
+            list(SenadoActivityHistory.objects.order_by('proposicao__tipo', 'proposicao__ano', 'proposicao__numero', 'id_informe')
+                 .values_list('id_informe', 'data', 'colegiado_sigla', 'descricao')),
+        )
+
+    def test_volumes_exatos(self):
+        """Testa que as quantidades pedidas são criadas, fora da faixa dos dados reais."""
+        self._gerar()
+        self.assertEqual(Eixo.objects.filter(id__gte=EIXO_ID_START).count(), 3)
+        self.assertEqual(Tema.objects.count(), 7)
+        self.assertEqual(Proposicao.objects.count(), 60)
+        self.assertEqual(SenadoActivityHistory.objects.count() + CamaraActivityHistory.objects.count(), 500)
+        self.assertFalse(Proposicao.objects.filter(numero__lt=NUMERO_START).exists())
+        self.assertFalse(Tema.objects.filter(proposicoes__isnull=True).exists())
+        # id_informe e ids externos cabem em int4 (PostgreSQL)
+        maior_informe = SenadoActivityHistory.objects.order_by('-id_informe').values_list('id_informe', flat=True).first()
+        self.assertLessEqual(maior_informe, 500)
+        self.assertFalse(Proposicao.objects.filter(sf_id__gt=INT4_MAX).exists())
+
+    def test_deterministico_por_semente(self):
+        """Testa que a mesma semente gera os mesmos dados, qualquer que seja o tamanho do bloco."""
+        self._gerar('--seed', '7')
+        primeiro = self._retrato()
+
+        self._gerar('--seed', '7', '--clear', '--chunk-size', '11')
+        self.assertEqual(self._retrato(), primeiro)
+
+        self._gerar('--seed', '8', '--clear')
+        self.assertNotEqual(self._retrato(), primeiro)
+
+    def test_escala_e_limpeza(self):
+        """Testa --scale, a recusa em duplicar dados e --clear-only."""
+        call_command('generate_synthetic_data', '--scale', '0.0001', stdout=StringIO())
+        self.assertEqual(Proposicao.objects.count(), 20)
+        self.assertEqual(Tema.objects.count(), 1)
+
+        with self.assertRaises(CommandError):
+            call_command('generate_synthetic_data', '--scale', '0.0001', stdout=StringIO())
+
+        call_command('generate_synthetic_data', '--clear-only', stdout=StringIO())
+        self.assertFalse(Eixo.objects.filter(id__gte=EIXO_ID_START).exists())
+        self.assertFalse(CamaraActivityHistory.objects.exists())
+
+
+class CopyTest(TestCase):
+    """Testes para a gravação via COPY (PostgreSQL), com cursor simulado."""
+
+    def test_formato_texto_escapado(self):
+        linha = (1, 7, date(2024, 3, 1), 'Leitura\tem\nPlenário \\ SF', 'SF', 'PLEN', None, 'SF', 'SLSF', 'x', 'AGUARDANDO')
+        with mock.patch('apps.pauta.synthetic_data.connection') as conn:
+            conn.ops.quote_name.side_effect = lambda nome: f'"{nome}"'
+            cursor = conn.cursor.return_value.__enter__.return_value
+            _copy(SenadoActivityHistory, SENADO_COLUNAS, [linha])
+
+        sql, buffer = cursor.copy_expert.call_args.args
+        self.assertTrue(sql.startswith(f'COPY "{SenadoActivityHistory._meta.db_table}" ("proposicao_id", "id_informe"'))
+        self.assertTrue(sql.endswith('"created_at", "updated_at") FROM STDIN'))
+        campos = buffer.getvalue().rstrip('\n').split('\t')
+        self.assertEqual(len(campos), len(SENADO_COLUNAS) + 2)
+        self.assertEqual(campos[2], '2024-03-01')
+        self.assertEqual(campos[3], 'Leitura\\tem\\nPlenário \\\\ SF')
+        self.assertEqual(campos[6], '\\N')
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     EixoViewSet, TemaViewSet, ProposicaoViewSet,
     EixoReadOnlyViewSet, TemaReadOnlyViewSet, ProposicaoReadOnlyViewSet,
-    SenadoActivityHistoryViewSet, CamaraActivityHistoryViewSet
+    SenadoActivityHistoryViewSet, CamaraActivityHistoryViewSet,
+    DeletedRecordViewSet, DatasetExportView, AutocompleteView
 )
 
 # Configuração do roteador para o ViewSet
@@ -17,6 +18,7 @@ bi_router = DefaultRouter()
 bi_router.register(r'eixos', EixoReadOnlyViewSet, basename='bi-eixo')
 bi_router.register(r'temas', TemaReadOnlyViewSet, basename='bi-tema')
 bi_router.register(r'proposicoes', ProposicaoReadOnlyViewSet, basename='bi-proposicao')
+bi_router.register(r'exclusoes', DeletedRecordViewSet, basename='bi-exclusao')
 
 # Router para endpoints de atividades (read-only)
 activity_router = DefaultRouter()
@@ -29,4 +31,6 @@ urlpatterns = [
     path('api/', include(router.urls)),
     path('api/bi/', include(bi_router.urls)),
     path('api/atividades/', include(activity_router.urls)),
+    path('api/export/<str:dataset>/<str:formato>/', DatasetExportView.as_view(), name='export-dataset'),
+    path('api/autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
 ]
\ No newline at end of file
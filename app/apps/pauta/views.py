@@ -1,5 +1,8 @@
+import hashlib
 import logging
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import ValidationError
@@ -7,12 +10,25 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
-from django.db.models import Prefetch
-from .models import Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory
+from django.db.models import Count, Prefetch
+from django.conf import settings
+from django.core.cache import caches
+from django.http import StreamingHttpResponse
+from .models import (
+    Eixo, Tema, Proposicao, SenadoActivityHistory, CamaraActivityHistory, DeletedRecord,
+    PROPOSICAO_SEARCH_FIELDS, SENADO_ACTIVITY_SEARCH_FIELDS, CAMARA_ACTIVITY_SEARCH_FIELDS,
+)
+from .filters import UpdatedRangeFilter
+from .search import FullTextSearchFilter
+from .pagination import KeysetPagination
+from .caching import CachedResponseMixin
+from .data_version import get_data_version
+from .streaming import StreamingListMixin
+from . import autocomplete, exports
 from .serializers import (
     EixoSerializer, TemaSerializer, ProposicaoSerializer,
     EixoReadOnlySerializer, TemaReadOnlySerializer, ProposicaoReadOnlySerializer,
-    SenadoActivityHistorySerializer, CamaraActivityHistorySerializer
+    SenadoActivityHistorySerializer, CamaraActivityHistorySerializer, DeletedRecordSerializer
 )
 from apps.core.logging_utils import log_database_operation, log_error, log_performance
 
@@ -327,22 +343,25 @@ class ProposicaoViewSet(viewsets.ModelViewSet):
         responses={200: EixoReadOnlySerializer},
     ),
 )
-class EixoReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+class EixoReadOnlyViewSet(CachedResponseMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet read-only para o modelo Eixo otimizado para Power BI.
     
     Fornece apenas operações de leitura:
     - list: GET /api/bi/eixos/
     - retrieve: GET /api/bi/eixos/{id}/
+    
+    A listagem aceita `?format=ndjson` ou `?format=jsonstream` para
+    resposta em streaming (ver `StreamingListMixin`).
     """
     
-    queryset = Eixo.objects.prefetch_related('temas').all()
+    queryset = Eixo.objects.annotate(temas_count=Count('temas'))
     serializer_class = EixoReadOnlySerializer
     permission_classes = [AllowAny]
     pagination_class = None
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [UpdatedRangeFilter, SearchFilter, OrderingFilter]
     search_fields = ['nome']
-    ordering_fields = ['id', 'nome', 'created_at']
+    ordering_fields = ['id', 'nome', 'created_at', 'updated_at']
     ordering = ['id']
 
 
@@ -360,25 +379,30 @@ class EixoReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: TemaReadOnlySerializer},
     ),
 )
-class TemaReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+class TemaReadOnlyViewSet(CachedResponseMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet read-only para o modelo Tema otimizado para Power BI.
     
     Fornece apenas operações de leitura:
     - list: GET /api/bi/temas/
     - retrieve: GET /api/bi/temas/{id}/
+    
+    A listagem aceita `?format=ndjson` ou `?format=jsonstream` para
+    resposta em streaming (ver `StreamingListMixin`).
     """
     
-    queryset = Tema.objects.select_related('eixo').prefetch_related(
+    queryset = Tema.objects.select_related('eixo').annotate(
+        proposicoes_count=Count('proposicoes')
+    ).prefetch_related(
         Prefetch('proposicoes', queryset=Proposicao.objects.filter(selected=True), to_attr='selected_list')
-    ).all()
+    )
     serializer_class = TemaReadOnlySerializer
     permission_classes = [AllowAny]
     pagination_class = None
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [UpdatedRangeFilter, DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['eixo__id', 'eixo__nome']
     search_fields = ['nome', 'eixo__nome']
-    ordering_fields = ['id', 'nome', 'eixo__id', 'created_at']
+    ordering_fields = ['id', 'nome', 'eixo__id', 'created_at', 'updated_at']
     ordering = ['eixo__id', 'nome']
 
 
@@ -396,23 +420,27 @@ class TemaReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: ProposicaoReadOnlySerializer},
     ),
 )
-class ProposicaoReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+class ProposicaoReadOnlyViewSet(CachedResponseMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet read-only para o modelo Proposicao otimizado para Power BI.
     
     Fornece apenas operações de leitura:
     - list: GET /api/bi/proposicoes/
     - retrieve: GET /api/bi/proposicoes/{id}/
+    
+    A listagem aceita `?format=ndjson` ou `?format=jsonstream` para
+    resposta em streaming (ver `StreamingListMixin`).
     """
     
     queryset = Proposicao.objects.select_related('tema__eixo').all()
     serializer_class = ProposicaoReadOnlySerializer
     permission_classes = [AllowAny]
     pagination_class = None
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [UpdatedRangeFilter, DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['tipo', 'ano', 'tema__id', 'tema__nome', 'tema__eixo__id', 'tema__eixo__nome']
-    search_fields = ['tipo', 'tema__nome', 'tema__eixo__nome']
-    ordering_fields = ['id', 'tipo', 'numero', 'ano', 'tema__nome', 'created_at']
+    search_fields = ['tipo', 'ementa', 'tema__nome', 'tema__eixo__nome']
+    search_vector_fields = PROPOSICAO_SEARCH_FIELDS
+    ordering_fields = ['id', 'tipo', 'numero', 'ano', 'tema__nome', 'created_at', 'updated_at']
     ordering = ['tema__nome', 'ano', 'numero']
 
 
@@ -450,23 +478,28 @@ class ProposicaoReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: SenadoActivityHistorySerializer},
     ),
 )
-class SenadoActivityHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class SenadoActivityHistoryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet read-only para o modelo SenadoActivityHistory.
     
     Fornece apenas operações de leitura:
     - list: GET /api/atividades/senado/
     - retrieve: GET /api/atividades/senado/{id}/
+    
+    Com `?pagination=cursor` a listagem é paginada por cursor (keyset),
+    sempre na ordem (-data, -id_informe, -id).
     """
     
     queryset = SenadoActivityHistory.objects.select_related('proposicao').all()
     serializer_class = SenadoActivityHistorySerializer
     permission_classes = [AllowAny]
-    pagination_class = None
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-data', '-id_informe', '-id')
+    filter_backends = [UpdatedRangeFilter, DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['proposicao', 'data', 'colegiado_sigla', 'ente_administrativo_sigla', 'sigla_situacao_iniciada']
     search_fields = ['descricao', 'colegiado_nome', 'ente_administrativo_nome']
-    ordering_fields = ['id', 'data', 'id_informe', 'created_at']
+    search_vector_fields = SENADO_ACTIVITY_SEARCH_FIELDS
+    ordering_fields = ['id', 'data', 'id_informe', 'created_at', 'updated_at']
     ordering = ['-data', '-id_informe']
 
 
@@ -510,21 +543,165 @@ class SenadoActivityHistoryViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: CamaraActivityHistorySerializer},
     ),
 )
-class CamaraActivityHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CamaraActivityHistoryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet read-only para o modelo CamaraActivityHistory.
     
     Fornece apenas operações de leitura:
     - list: GET /api/atividades/camara/
     - retrieve: GET /api/atividades/camara/{id}/
+    
+    Com `?pagination=cursor` a listagem é paginada por cursor (keyset),
+    sempre na ordem (-data_hora, -sequencia, -id).
     """
     
     queryset = CamaraActivityHistory.objects.select_related('proposicao').all()
     serializer_class = CamaraActivityHistorySerializer
     permission_classes = [AllowAny]
-    pagination_class = None
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-data_hora', '-sequencia', '-id')
+    filter_backends = [UpdatedRangeFilter, DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['proposicao', 'sigla_orgao', 'cod_tipo_tramitacao', 'ambito', 'apreciacao']
     search_fields = ['despacho', 'descricao_tramitacao', 'descricao_situacao']
-    ordering_fields = ['id', 'data_hora', 'sequencia', 'created_at']
+    search_vector_fields = CAMARA_ACTIVITY_SEARCH_FIELDS
+    ordering_fields = ['id', 'data_hora', 'sequencia', 'created_at', 'updated_at']
     ordering = ['-data_hora', '-sequencia']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Listar exclusões (Power BI)",
+        description=(
+            "Registros de exclusão (tombstones) de eixos, temas, proposições e atividades, "
+            "para a atualização incremental. Filtre com updated_since ou RangeStart/RangeEnd "
+            "(aplicados sobre deleted_at) e remova as linhas (model, object_id) do conjunto local."
+        ),
+        tags=["power-bi"],
+        responses={200: DeletedRecordSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        summary="Obter exclusão (Power BI)",
+        description="Retorna um registro de exclusão específico",
+        tags=["power-bi"],
+        responses={200: DeletedRecordSerializer},
+    ),
+)
+class DeletedRecordViewSet(CachedResponseMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet read-only para os registros de exclusão (tombstones).
+    
+    Fornece apenas operações de leitura:
+    - list: GET /api/bi/exclusoes/
+    - retrieve: GET /api/bi/exclusoes/{id}/
+    """
+    
+    queryset = DeletedRecord.objects.all()
+    serializer_class = DeletedRecordSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    updated_range_field = 'deleted_at'
+    filter_backends = [UpdatedRangeFilter, DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['model', 'object_id']
+    ordering_fields = ['id', 'deleted_at']
+    ordering = ['deleted_at', 'id']
+
+
+@extend_schema(
+    summary="Exportar tabela",
+    description=(
+        "Exporta uma tabela completa para o Power BI, em streaming. "
+        "Datasets: proposicoes (mesmas colunas do endpoint BI), atividades_senado, atividades_camara. "
+        "Formatos: csv (CSV comprimido com gzip) e parquet (zstd; requer pyarrow)."
+    ),
+    tags=["power-bi"],
+    responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+)
+class DatasetExportView(APIView):
+    """
+    Exportação de tabelas inteiras em CSV (gzip) ou Parquet.
+
+    - GET /api/export/{dataset}/{formato}/
+
+    As linhas vêm de `values_list` e são escritas à medida que são lidas do
+    banco (ver `apps.pauta.exports`).
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, dataset, formato):
+        if dataset not in exports.DATASETS:
+            return Response(
+                {'detail': f"Dataset desconhecido: {dataset}", 'datasets': list(exports.DATASETS)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        export = exports.get_dataset(dataset)
+        try:
+            content = exports.export_chunks(export, formato)
+        except exports.ExportError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(content, content_type=exports.FORMATS[formato][1])
+        response['Content-Disposition'] = f'attachment; filename="{exports.filename(export, formato)}"'
+        response['X-Accel-Buffering'] = 'no'
+        logger.info(f"Exportação iniciada: {dataset} ({formato})")
+        return response
+
+
+@extend_schema(
+    summary="Autocompletar",
+    description=(
+        "Sugestões rápidas para campos de busca: proposições pelo identificador (ex.: 'PL 4381/2023', "
+        "'pl 43'), autores e temas. Termos com menos de 2 caracteres retornam listas vazias."
+    ),
+    tags=["power-bi"],
+    parameters=[
+        OpenApiParameter(name='q', type=OpenApiTypes.STR, required=True, description='Texto digitado'),
+        OpenApiParameter(
+            name='tipo', type=OpenApiTypes.STR, required=False,
+            description=f"Tipos de sugestão separados por vírgula ({', '.join(autocomplete.KINDS)}); padrão: todos",
+        ),
+        OpenApiParameter(
+            name='limit', type=OpenApiTypes.INT, required=False,
+            description=f'Sugestões por tipo (padrão {autocomplete.DEFAULT_LIMIT}, máximo {autocomplete.MAX_LIMIT})',
+        ),
+    ],
+    responses={200: OpenApiTypes.OBJECT},
+)
+class AutocompleteView(APIView):
+    """
+    Autocompletar de proposições, autores e temas.
+
+    - GET /api/autocomplete/?q=...
+
+    As respostas ficam no cache por termo normalizado e versão dos dados, então
+    os prefixos mais digitados não chegam ao banco (além da leitura da versão).
+    """
+
+    permission_classes = [AllowAny]
+    cache_key_prefix = 'autocomplete'
+
+    def get(self, request):
+        term = request.query_params.get('q', '')
+        kinds = [kind for kind in request.query_params.get('tipo', '').split(',') if kind] or list(autocomplete.KINDS)
+        invalid = [kind for kind in kinds if kind not in autocomplete.KINDS]
+        if invalid:
+            raise ValidationError({'tipo': f"Tipos inválidos: {', '.join(invalid)}"})
+        try:
+            limit = int(request.query_params.get('limit', autocomplete.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Deve ser um número inteiro'})
+        limit = max(1, min(limit, autocomplete.MAX_LIMIT))
+
+        if not settings.API_RESPONSE_CACHE_ENABLED:
+            return Response(autocomplete.suggest(term, kinds, limit))
+
+        cache = caches[settings.API_RESPONSE_CACHE_ALIAS]
+        key = ':'.join([
+            self.cache_key_prefix, f'v{get_data_version().number}', ','.join(kinds), str(limit),
+            hashlib.sha256(autocomplete.normalize(term).encode()).hexdigest(),
+        ])
+        data = cache.get(key)
+        if data is None:
+            data = autocomplete.suggest(term, kinds, limit)
+            cache.set(key, data, settings.API_RESPONSE_CACHE_TIMEOUT)
+        return Response(data)
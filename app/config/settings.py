@@ -54,12 +54,15 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # Acima do CommonMiddleware: o tamanho da resposta vem do Content-Length
+    'apps.core.sql_instrumentation.sql_instrumentation_middleware',
+    'apps.core.metrics.metrics_middleware',
+    'apps.core.logging_utils.api_logging_middleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'apps.core.logging_utils.api_logging_middleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -110,6 +113,21 @@ if TESTING and config('USE_SQLITE_FOR_TESTS', default=True, cast=bool):
         }
     }
 
+# Cache (locmem por padrão; ex.: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# e CACHE_LOCATION=redis://localhost:6379/1 para compartilhar entre processos)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Cache de respostas dos endpoints read-only (/api/bi/, /api/atividades/).
+# Invalidado pela versão global dos dados; desativado nos testes por padrão.
+API_RESPONSE_CACHE_ENABLED = config('API_RESPONSE_CACHE_ENABLED', default=not TESTING, cast=bool)
+API_RESPONSE_CACHE_ALIAS = config('API_RESPONSE_CACHE_ALIAS', default='default')
+API_RESPONSE_CACHE_TIMEOUT = config('API_RESPONSE_CACHE_TIMEOUT', default=24 * 3600, cast=int)  # segundos
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -343,3 +361,27 @@ LOGGING = {
 
 # Initialize logging
 logging.config.dictConfig(LOGGING)
+
+# Handlers atrás de filas (QueueListener): a escrita em disco sai do caminho
+# da requisição (ver apps.core.apps.CoreConfig.ready)
+LOG_QUEUE_ENABLED = config('LOG_QUEUE_ENABLED', default=not TESTING, cast=bool)
+LOG_QUEUE_MAXSIZE = config('LOG_QUEUE_MAXSIZE', default=10000, cast=int)  # registros; excedentes são descartados
+
+# Fração das requisições 2xx/3xx registradas pelo api_logging_middleware (4xx/5xx sempre)
+API_LOG_SAMPLE_RATE = config('API_LOG_SAMPLE_RATE', default=1.0, cast=float)
+
+# Métricas (/metrics). Com vários processos (workers do gunicorn), cada um grava
+# seus valores neste diretório e o endpoint agrega todos; vazio = só o processo atual
+METRICS_MULTIPROC_DIR = config('METRICS_MULTIPROC_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5.0, cast=float)  # segundos
+# Acesso a /metrics: token Bearer e/ou IPs/redes (CIDR) do REMOTE_ADDR, separados por
+# vírgula. Sem nenhum dos dois configurado, o endpoint responde 403 a todos
+METRICS_BEARER_TOKEN = config('METRICS_BEARER_TOKEN', default='')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in config('METRICS_ALLOWED_IPS', default='').split(',') if ip.strip()]
+
+# Instrumentação de SQL por requisição (contagem, tempo, N+1; header Server-Timing).
+# No modo estrito, estourar os limites levanta QueryBudgetExceeded (falha o teste)
+SQL_INSTRUMENTATION_ENABLED = config('SQL_INSTRUMENTATION_ENABLED', default=DEBUG or TESTING, cast=bool)
+SQL_INSTRUMENTATION_STRICT = config('SQL_INSTRUMENTATION_STRICT', default=TESTING, cast=bool)
+SQL_N_PLUS_ONE_THRESHOLD = config('SQL_N_PLUS_ONE_THRESHOLD', default=5, cast=int)  # mesma consulta N vezes
+SQL_MAX_QUERIES_PER_REQUEST = config('SQL_MAX_QUERIES_PER_REQUEST', default=50, cast=int)  # 0 desativa
@@ -18,12 +18,13 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
-from apps.core.views import health_check
+from apps.core.views import health_check, metrics
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health_check'),
+    path('metrics', metrics, name='metrics'),
     path('', include('apps.pauta.urls')),
     path('', include('apps.authentication.urls')),
 
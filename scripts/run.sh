@@ -6,4 +6,10 @@ python manage.py wait_for_db
 python manage.py collectstatic --noinput
 python manage.py migrate
 
+# Métricas de workers anteriores não devem ser somadas às novas
+if [ -n "$METRICS_MULTIPROC_DIR" ]; then
+    rm -rf "$METRICS_MULTIPROC_DIR"
+    mkdir -p "$METRICS_MULTIPROC_DIR"
+fi
+
 gunicorn --bind 0.0.0.0:8000 config.wsgi:application 
\ No newline at end of file